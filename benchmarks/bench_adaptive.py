@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark 2PL calibration and compare adaptive quizzes with fixed-length ones.
+
+Simulates a bank with known discrimination and difficulty and learners
+with known ability, then:
+
+* fits the 2PL model to their answers with fit_2pl, reporting time per
+  iteration against the same update written as a per-answer Python loop,
+  and how well the true parameters were recovered;
+* runs simulated learners through AdaptiveTest with the fitted parameters
+  and through fixed random quizzes of 5/10/15/20 questions, reporting
+  questions asked and ability error (RMSE) for each.
+
+    python benchmarks/bench_adaptive.py --items 2000 --learners 5000 --answers 20
+"""
+
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:
+    import numpy as np
+except ImportError:
+    sys.exit("This benchmark needs NumPy: pip install numpy")
+
+from quiz_app import AdaptiveTest, Question, fit_2pl  # noqa: E402
+
+
+def python_loop_iteration(persons, items, y, theta, log_a, b):
+    """One fit_2pl iteration written answer by answer, for comparison."""
+    for params, index_of, prior_var in ((theta, persons, 1.0), (b, items, 4.0), (log_a, items, 0.25)):
+        grad = [0.0] * len(params)
+        hess = [0.0] * len(params)
+        for person, item, right in zip(persons, items, y):
+            a = math.exp(log_a[item])
+            z = a * (theta[person] - b[item])
+            p = 1 / (1 + math.exp(-z))
+            w = p * (1 - p)
+            k = person if index_of is persons else item
+            if params is theta:
+                grad[k] += a * (right - p)
+                hess[k] += a * a * w
+            elif params is b:
+                grad[k] -= a * (right - p)
+                hess[k] += a * a * w
+            else:
+                grad[k] += z * (right - p)
+                hess[k] += z * z * w
+        for k in range(len(params)):
+            params[k] += (grad[k] - params[k] / prior_var) / (hess[k] + 1 / prior_var)
+
+
+def simulate(rng, true_a, true_b, learners, answers):
+    persons, items, y, theta = [], [], [], rng.normal(0, 1, learners)
+    for person in range(learners):
+        for item in rng.choice(len(true_a), answers, replace=False):
+            p = 1 / (1 + math.exp(-true_a[item] * (theta[person] - true_b[item])))
+            persons.append(person)
+            items.append(int(item))
+            y.append(int(rng.random() < p))
+    return persons, items, y
+
+
+def run_test(test, rng, true_a, true_b, theta, pick=None):
+    while True:
+        if pick is None:
+            item = test.next_question()
+            if item is None:
+                break
+            j = test._last
+        else:
+            if test.answered >= pick:
+                break
+            j = int(rng.choice(np.flatnonzero(~test.asked)))
+            test.asked[j] = True
+            test._last = j
+        p = 1 / (1 + math.exp(-true_a[j] * (theta - true_b[j])))
+        test.record(rng.random() < p)
+    return test.answered, test.theta - theta
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--learners", type=int, default=5000)
+    parser.add_argument("--answers", type=int, default=20, help="answers per simulated learner")
+    parser.add_argument("--tests", type=int, default=300, help="simulated quizzes per mode")
+    parser.add_argument("--target-se", type=float, nargs="+", default=[0.4, 0.3],
+                        help="stopping precisions to try for the adaptive quiz")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(5)
+    true_a = np.exp(rng.normal(0, 0.3, args.items))
+    true_b = rng.normal(0, 1, args.items)
+    persons, items, y = simulate(rng, true_a, true_b, args.learners, args.answers)
+
+    start = time.perf_counter()
+    theta, a, b = fit_2pl(persons, items, y, iterations=50, tolerance=0)
+    vectorized = (time.perf_counter() - start) / 50
+    start = time.perf_counter()
+    python_loop_iteration(persons, items, y, [0.0] * args.learners, [0.0] * args.items, [0.0] * args.items)
+    looped = time.perf_counter() - start
+
+    start = time.perf_counter()
+    theta, a, b = fit_2pl(persons, items, y)
+    fit = time.perf_counter() - start
+    print(f"Calibration: {len(y)} answers, {args.items} items, {args.learners} learners")
+    print(f"  per iteration: {vectorized * 1000:.1f} ms vectorized vs {looped * 1000:.0f} ms per-answer loop "
+          f"({looped / vectorized:.0f}x)")
+    print(f"  full fit {fit:.2f}s; recovery corr(a) {np.corrcoef(a, true_a)[0, 1]:.2f}, "
+          f"corr(b) {np.corrcoef(b, true_b)[0, 1]:.2f}")
+
+    bank = [("synthetic", Question(f"Question {n}", ["yes", "no"], 0, "-", id=f"q{n}")) for n in range(args.items)]
+    params = {f"q{n}": (float(a[n]), float(b[n])) for n in range(args.items)}
+
+    print(f"\n{'mode':<18} {'questions':>9} {'theta RMSE':>11}")
+    modes = [(f"adaptive SE {se}", se, None) for se in args.target_se]
+    modes += [(f"fixed {k}", 0, k) for k in (5, 10, 15, 20)]
+    for name, se, pick in modes:
+        asked, errors = [], []
+        for _ in range(args.tests):
+            test = AdaptiveTest(bank, params, target_se=se, max_questions=30)
+            n, error = run_test(test, rng, true_a, true_b, rng.normal(0, 1), pick)
+            asked.append(n)
+            errors.append(error)
+        print(f"{name:<18} {np.mean(asked):>9.1f} {np.sqrt(np.mean(np.square(errors))):>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
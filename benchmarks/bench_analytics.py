@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark cohort analytics over a directory of learners' stats files.
+
+Writes one study_stats.json per synthetic learner (a few months of
+sessions each), then times:
+
+* the old way: json.load every file one after another;
+* a cold analytics run with 1 worker and with every CPU;
+* a warm re-run where nothing changed (all summaries cached);
+* a re-run after 1% of the learners studied again.
+
+    python benchmarks/bench_analytics.py --learners 5000 --weeks 26
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from quiz_app import StudyStats, cohort_analytics  # noqa: E402
+
+CATEGORIES = ["Data Structures", "Algorithms", "Python Programming", "Big O Notation", "Mixed Topics"]
+
+
+def write_learner(path: Path, rng: random.Random, weeks: int):
+    stats = StudyStats(str(path), journaled=False)
+    stats.data = stats.empty_stats()
+    skill = rng.uniform(0.3, 0.9)
+    per_week = rng.choice([0, 1, 1, 2, 3, 5, 8])
+    start = datetime.now() - timedelta(weeks=weeks)
+    for week in range(weeks):
+        for _ in range(rng.randint(0, per_week)):
+            total = rng.choice([5, 10, 15, 20])
+            # Learners improve a little every week
+            p = min(0.98, skill + week * 0.005)
+            session = stats.new_session(rng.choice(CATEGORIES), sum(rng.random() < p for _ in range(total)), total)
+            session["date"] = (start + timedelta(weeks=week, hours=rng.randrange(168))).isoformat()
+            stats._apply_session(session)
+    stats.save_stats()
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<36} {time.perf_counter() - start:>7.2f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--learners", type=int, default=2000)
+    parser.add_argument("--weeks", type=int, default=26)
+    args = parser.parse_args()
+
+    rng = random.Random(9)
+    cpus = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for n in range(args.learners):
+            (root / f"learner-{n}").mkdir()
+            write_learner(root / f"learner-{n}" / "study_stats.json", rng, args.weeks)
+        print(f"{args.learners} learners, {args.weeks} weeks of history, {cpus} CPUs")
+
+        def sequential():
+            for path in sorted(root.rglob("study_stats.json")):
+                with open(path) as f:
+                    json.load(f)
+        timed("sequential json.load (no analysis)", sequential)
+
+        cache = root / "cold-1.json"
+        timed("analytics cold, 1 worker", lambda: cohort_analytics(str(root), workers=1, cache_file=str(cache)))
+        cache.unlink()
+        report = timed(f"analytics cold, {cpus} workers", lambda: cohort_analytics(str(root), workers=cpus))
+        warm = timed("analytics warm, nothing changed", lambda: cohort_analytics(str(root)))
+        assert warm["reprocessed"] == 0 and warm["categories"] == report["categories"], warm
+
+        for n in rng.sample(range(args.learners), max(1, args.learners // 100)):
+            stats = StudyStats(str(root / f"learner-{n}" / "study_stats.json"))
+            stats.add_session("Algorithms", 8, 10)
+        changed = timed("analytics after 1% studied again", lambda: cohort_analytics(str(root)))
+        print(f"  re-read {changed['reprocessed']} stores; cohort trend {changed['trend']:+.2f} points/week")
+
+
+if __name__ == "__main__":
+    main()
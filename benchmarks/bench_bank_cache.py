@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold parsing of a question bank against loading its compiled cache.
+
+For each bank size a synthetic single-category bank is written to a temp
+directory, then timed two ways:
+
+* cold:   parse the JSON shard and validate every question
+* cached: load the category from the pickle cache written by compile
+
+    python benchmarks/bench_bank_cache.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from quiz_app import QuestionBank, validate_question  # noqa: E402
+
+
+def write_synthetic_bank(bank_dir: Path, size: int):
+    questions = [
+        {
+            "question": f"Synthetic question {i}: what is the complexity of operation {i % 97}?",
+            "options": ["O(1)", "O(log n)", "O(n)", "O(n²)"],
+            "correct": i % 4,
+            "explanation": f"Operation {i % 97} touches each element at most a constant number of times.",
+        }
+        for i in range(size)
+    ]
+    with open(bank_dir / "synthetic.json", "w", encoding="utf-8") as f:
+        json.dump({"name": "Synthetic", "questions": questions}, f, ensure_ascii=False)
+    QuestionBank(str(bank_dir)).build_manifest(write=True)
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'questions':>10} {'cold parse':>12} {'cached load':>12} {'speedup':>8}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            bank_dir = Path(tmp)
+            write_synthetic_bank(bank_dir, size)
+            QuestionBank(tmp).compile_category("synthetic")
+
+            def cold_parse():
+                _, questions = QuestionBank.read_shard(bank_dir / "synthetic.json")
+                assert not any(validate_question(q) for q in questions)
+
+            cold = best_of(args.repeat, cold_parse)
+            cached = best_of(args.repeat, lambda: QuestionBank(tmp).load_category("synthetic"))
+            print(f"{size:>10} {cold * 1000:>10.1f}ms {cached * 1000:>10.1f}ms {cold / cached:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
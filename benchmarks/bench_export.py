@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Measure peak memory of exporting a large study history.
+
+Writes study_stats.json snapshots with N sessions, then exports each to CSV
+in a fresh process two ways and reports time and peak RSS:
+
+* load: json.load the whole snapshot, then write its sessions (the old way);
+* stream: ``study-quiz export``, which parses the snapshot incrementally.
+
+Streaming peak RSS should stay flat as N grows.
+
+    python benchmarks/bench_export.py --sizes 100000 1000000
+"""
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+CATEGORIES = ["Data Structures", "Algorithms", "Python Programming", "Big O Notation", "Mixed Topics"]
+
+PROBE = """
+import csv, json, sys, time
+start = time.perf_counter()
+if sys.argv[1] == "load":
+    with open(sys.argv[2]) as f:
+        data = json.load(f)
+    with open(sys.argv[3], "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["date", "category", "score", "total", "percentage"])
+        for s in data["sessions"]:
+            writer.writerow([s["date"], s["category"], s["score"], s["total"], s["percentage"]])
+else:
+    import quiz_app
+    quiz_app.main(["--stats", sys.argv[2], "export", "-o", sys.argv[3]])
+elapsed = time.perf_counter() - start
+with open("/proc/self/status") as f:
+    peak = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+print(json.dumps({"seconds": elapsed, "peak_kb": peak}))
+"""
+
+
+def write_snapshot(path: Path, sessions: int):
+    """A snapshot shaped like StudyStats writes it, built without holding it in memory."""
+    rng = random.Random(1)
+    start = datetime(2020, 1, 1)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{\n  "total_questions": 0,\n  "correct_answers": 0,\n  "sessions": [')
+        for n in range(sessions):
+            total = rng.choice([5, 10, 15, 20])
+            score = rng.randint(0, total)
+            session = {
+                "date": (start + timedelta(minutes=17 * n)).isoformat(),
+                "category": rng.choice(CATEGORIES),
+                "score": score,
+                "total": total,
+                "percentage": round(score / total * 100, 1),
+            }
+            f.write(("," if n else "") + "\n    " + json.dumps(session))
+        f.write('\n  ],\n  "category_stats": {},\n  "session_count": %d,\n  "recent": [],\n'
+                '  "rollups": {"daily": {}, "weekly": {}},\n  "archive": []\n}\n' % sessions)
+
+
+def probe(mode: str, snapshot: Path, out: Path) -> dict:
+    result = subprocess.run([sys.executable, "-c", PROBE, mode, str(snapshot), str(out)], cwd=str(REPO_ROOT),
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"{'sessions':>10} {'file MB':>8} {'load s':>7} {'load MB':>8} {'stream s':>9} {'stream MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            snapshot = Path(tmp) / f"stats-{size}.json"
+            write_snapshot(snapshot, size)
+            loaded = probe("load", snapshot, Path(tmp) / "load.csv")
+            streamed = probe("stream", snapshot, Path(tmp) / "stream.csv")
+            assert (Path(tmp) / "load.csv").read_text().count("\n") == size + 1
+            assert (Path(tmp) / "stream.csv").read_text().count("\n") == size + 1
+            print(f"{size:>10} {snapshot.stat().st_size / 2 ** 20:>8.0f} "
+                  f"{loaded['seconds']:>7.2f} {loaded['peak_kb'] / 1024:>8.0f} "
+                  f"{streamed['seconds']:>9.2f} {streamed['peak_kb'] / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark batch grading of answer sheets across worker counts.
+
+Writes synthetic answer sheets for the bundled question bank (one JSONL
+file per 100 sheets), then runs grade_directory with 1, 2, 4, ... workers
+up to the CPU count and reports sheets per second and speedup.
+
+    python benchmarks/bench_grading.py --sheets 100000 --users 2000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from quiz_app import QuestionBank, grade_directory, question_id  # noqa: E402
+
+
+def write_sheets(answer_dir: Path, sheets: int, users: int, per_sheet: int):
+    rng = random.Random(7)
+    bank = QuestionBank()
+    questions = [question for key in bank.category_keys() for question in bank.load_category(key)]
+    per_file = 100
+    for start in range(0, sheets, per_file):
+        with open(answer_dir / f"sheets-{start // per_file:05d}.jsonl", "w", encoding="utf-8") as f:
+            for n in range(start, min(start + per_file, sheets)):
+                picked = rng.sample(questions, min(per_sheet, len(questions)))
+                f.write(json.dumps({
+                    "user": f"student-{n % users}",
+                    "label": "Classroom Quiz",
+                    "answers": [
+                        {"question_id": question_id(q), "choice": rng.randint(1, len(q["options"]))}
+                        for q in picked
+                    ],
+                }) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sheets", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--per-sheet", type=int, default=10)
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, cpus} | {2 ** n for n in range(cpus.bit_length()) if 2 ** n <= cpus})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        answer_dir = Path(tmp) / "answers"
+        answer_dir.mkdir()
+        write_sheets(answer_dir, args.sheets, args.users, args.per_sheet)
+
+        print(f"{args.sheets} sheets, {args.users} users, {args.per_sheet} answers each, backend={args.backend}")
+        print(f"{'workers':>8} {'seconds':>9} {'sheets/s':>10} {'speedup':>8}")
+        baseline = None
+        for workers in worker_counts:
+            stats_dir = Path(tmp) / f"stats-{workers}"
+            start = time.perf_counter()
+            summary = grade_directory(str(answer_dir), str(stats_dir), backend=args.backend, workers=workers)
+            elapsed = time.perf_counter() - start
+            assert summary["sessions"] == args.sheets, summary
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>9.2f} {args.sheets / elapsed:>10,.0f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
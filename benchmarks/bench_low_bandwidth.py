@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Measure terminal output size and time to first paint of each display mode.
+
+Runs the quiz in a fresh process per mode with scripted answers, colour
+forced on as over an SSH session, and reports:
+
+* time until the first byte of output, and until the main menu prompt;
+* bytes per question of a 10-question mixed quiz (results included);
+* bytes to show the help screen and come back to the menu.
+
+"full" is the original rich interface.
+
+    python benchmarks/bench_low_bandwidth.py --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+QUESTIONS = 10
+EXIT = "7\n"
+HELP = "6\n" + EXIT
+# Mixed quiz of QUESTIONS: every answer "1", Enter between questions
+QUIZ = f"2\n{QUESTIONS}\n" + "1\n\n" * (QUESTIONS - 1) + "1\n" + EXIT
+
+
+def run(mode: str, keys: str, stats_file: Path):
+    """Play ``keys`` into the quiz; return (first byte s, menu prompt s, total bytes)."""
+    env = dict(os.environ, FORCE_COLOR="1", COLUMNS="100", LINES="40")
+    env.pop("NO_COLOR", None)
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, str(REPO_ROOT / "quiz_app.py"), "--display", mode, "--stats", str(stats_file)],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env,
+    )
+    process.stdin.write(keys.encode())
+    process.stdin.close()
+    output = b""
+    first = menu = None
+    while True:
+        chunk = os.read(process.stdout.fileno(), 65536)
+        if not chunk:
+            break
+        now = time.perf_counter() - start
+        output += chunk
+        if first is None:
+            first = now
+        if menu is None and b"Choose an option" in output:
+            menu = now
+    process.wait()
+    return first, menu, len(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", default=["full", "compact", "plain"])
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} {'first byte':>11} {'menu':>9} {'startup B':>10} {'B/question':>11} {'help+menu B':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in args.modes:
+            stats_file = Path(tmp) / f"{mode}.json"
+            exits = [run(mode, EXIT, stats_file) for _ in range(args.runs)]
+            first = statistics.median(r[0] for r in exits)
+            menu = statistics.median(r[1] for r in exits)
+            startup = exits[0][2]
+            quiz = statistics.mean(run(mode, QUIZ, stats_file)[2] for _ in range(args.runs))
+            help_bytes = run(mode, HELP, stats_file)[2]
+            print(f"{mode:<8} {first * 1000:>9.0f}ms {menu * 1000:>7.0f}ms {startup:>10} "
+                  f"{(quiz - startup) / QUESTIONS:>11.0f} {help_bytes - startup:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Compare memory of the question bank held as dicts versus Question objects.
+
+Writes synthetic JSONL shards whose options repeat the way real ones do
+("O(1)", "O(n)", "Stack", ...), then loads them in a fresh process per
+layout: plain ``json.loads`` dicts, as the bank used to keep them, and
+``Question`` objects with interned options.  Reports the RSS the loaded
+questions add to the process.
+
+    python benchmarks/bench_question_memory.py --sizes 10000 100000
+"""
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+OPTIONS = [
+    "O(1)", "O(log n)", "O(n)", "O(n log n)", "O(n²)", "O(2^n)", "Stack", "Queue", "Array",
+    "Linked List", "Hash Table", "Binary Tree", "Heap", "Graph", "True", "False", "None",
+    "list", "tuple", "dict", "set", "Both are correct", "None of the above",
+]
+
+PROBE = """
+import gc, json, sys
+import quiz_app
+
+def rss_kb():
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+
+gc.collect()
+before = rss_kb()
+with open(sys.argv[2], encoding="utf-8") as f:
+    if sys.argv[1] == "dict":
+        questions = [json.loads(line) for line in f]
+    else:
+        questions = [quiz_app.Question.from_dict(json.loads(line)) for line in f]
+gc.collect()
+print(json.dumps({"count": len(questions), "rss_kb": rss_kb() - before}))
+"""
+
+
+def write_questions(path: Path, count: int):
+    rng = random.Random(3)
+    with open(path, "w", encoding="utf-8") as f:
+        for n in range(count):
+            f.write(json.dumps({
+                "question": f"Synthetic question {n}: which answer fits case {rng.randrange(10 ** 6)}?",
+                "options": rng.sample(OPTIONS, 4),
+                "correct": rng.randrange(4),
+                "explanation": f"Explanation for synthetic question {n}.",
+            }, ensure_ascii=False) + "\n")
+
+
+def probe(layout: str, path: Path) -> dict:
+    out = subprocess.run([sys.executable, "-c", PROBE, layout, str(path)], cwd=str(REPO_ROOT),
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'questions':>10} {'dict MB':>9} {'compact MB':>11} {'saved':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = Path(tmp) / f"questions-{size}.jsonl"
+            write_questions(path, size)
+            dicts = probe("dict", path)["rss_kb"]
+            compact = probe("compact", path)["rss_kb"]
+            print(f"{size:>10} {dicts / 1024:>9.1f} {compact / 1024:>11.1f} {1 - compact / dicts:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Measure the retention policy on a synthetic multi-year study history.
+
+Writes a history of several years of sessions, then compacts it with
+``--keep-days`` and compares load time and peak RSS of a fresh process
+that reads the store, before and after. Exits non-zero if compaction
+changed any aggregate (totals, category stats, session count, rollups).
+
+    python benchmarks/bench_retention.py --years 4 --per-day 8 --keep-days 90
+"""
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from quiz_app import StudyStats  # noqa: E402
+
+CATEGORIES = ["Data Structures", "Algorithms", "Python Programming", "Big O Notation", "Mixed Topics"]
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import quiz_app
+stats = quiz_app.StudyStats(sys.argv[1])
+stats.data
+elapsed = time.perf_counter() - start
+try:
+    # VmHWM is reset by exec; ru_maxrss can carry over the parent's peak on Linux
+    with open("/proc/self/status") as f:
+        peak = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+except OSError:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"seconds": elapsed, "maxrss_kb": peak}))
+"""
+
+
+def write_history(stats_file: Path, years: int, per_day: int):
+    rng = random.Random(42)
+    stats = StudyStats(str(stats_file))
+    stats.data = stats.empty_stats()
+    start = datetime.now() - timedelta(days=365 * years)
+    for day in range(365 * years):
+        for n in range(per_day):
+            total = rng.choice([5, 10, 15, 20])
+            score = rng.randint(0, total)
+            session = stats.new_session(rng.choice(CATEGORIES), score, total)
+            session["date"] = (start + timedelta(days=day, minutes=n * 7)).isoformat()
+            stats._apply_session(session)
+    stats.save_stats()
+
+
+def probe(stats_file: Path, runs: int) -> dict:
+    results = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", PROBE, str(stats_file)], cwd=str(REPO_ROOT),
+                             capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(out))
+    return {
+        "seconds": min(r["seconds"] for r in results),
+        "maxrss_kb": min(r["maxrss_kb"] for r in results),
+        "bytes": stats_file.stat().st_size,
+    }
+
+
+def aggregates(data: dict) -> dict:
+    return {key: data[key] for key in ("total_questions", "correct_answers", "category_stats",
+                                       "session_count", "recent", "rollups")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--years", type=int, default=4)
+    parser.add_argument("--per-day", type=int, default=8)
+    parser.add_argument("--keep-days", type=int, default=90)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stats_file = Path(tmp) / "study_stats.json"
+        write_history(stats_file, args.years, args.per_day)
+        before_data = StudyStats(str(stats_file)).data
+        before = probe(stats_file, args.runs)
+
+        stats = StudyStats(str(stats_file))
+        stats.compact(retention_days=args.keep_days)
+        after_data = StudyStats(str(stats_file)).data
+        after = probe(stats_file, args.runs)
+
+        print(f"{len(before_data['sessions'])} sessions over {args.years} years, keeping {args.keep_days} days raw")
+        print(f"{'':>8} {'sessions':>9} {'file':>10} {'load':>9} {'peak RSS':>10}")
+        for label, data, m in (("before", before_data, before), ("after", after_data, after)):
+            print(f"{label:>8} {len(data['sessions']):>9} {m['bytes'] / 1e6:>8.1f}MB "
+                  f"{m['seconds'] * 1000:>7.1f}ms {m['maxrss_kb'] / 1024:>8.1f}MB")
+
+        unchanged = aggregates(before_data) == aggregates(after_data)
+        archived = sum(r["sessions"] for r in after_data["archive"]) + len(after_data["sessions"])
+        unchanged = unchanged and archived == before_data["session_count"]
+        print("aggregates unchanged" if unchanged else "FAIL: compaction changed aggregates")
+        sys.exit(0 if unchanged else 1)
+
+
+if __name__ == "__main__":
+    main()
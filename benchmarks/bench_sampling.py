@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark drawing a mixed quiz from banks of growing size.
+
+Compares the old approach (copy every question dict, shuffle, slice) with
+QuestionBank.sample, uniform and weighted. The sampled cost should stay flat
+as the bank grows.
+
+    python benchmarks/bench_sampling.py --sizes 1000 10000 100000 1000000 --k 20
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from quiz_app import QuestionBank  # noqa: E402
+
+CATEGORIES = 10
+
+
+def synthetic_bank(size: int) -> QuestionBank:
+    """An in-memory bank of ``size`` questions split across CATEGORIES shards."""
+    bank = QuestionBank(tempfile.gettempdir())
+    per_category = size // CATEGORIES
+    bank._manifest = {}
+    for c in range(CATEGORIES):
+        key = f"category_{c}"
+        bank._manifest[key] = {"key": key, "name": f"Category {c}", "file": f"{key}.json", "count": per_category}
+        bank._shards[key] = [
+            {"question": f"Q{c}-{i}", "options": ["a", "b", "c", "d"], "correct": i % 4, "explanation": "-"}
+            for i in range(per_category)
+        ]
+    return bank
+
+
+def copy_and_shuffle(bank: QuestionBank, k: int):
+    all_questions = []
+    for key in bank.category_keys():
+        for question in bank.load_category(key):
+            question_copy = question.copy()
+            question_copy["category"] = bank.category_name(key)
+            all_questions.append(question_copy)
+    random.shuffle(all_questions)
+    return all_questions[:k]
+
+
+def per_call(fn, min_time: float = 0.2) -> float:
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--k", type=int, default=20)
+    args = parser.parse_args()
+
+    weights = {f"category_{c}": c + 1 for c in range(CATEGORIES)}
+    print(f"{'questions':>10} {'copy+shuffle':>14} {'sample':>10} {'weighted':>10}")
+    for size in args.sizes:
+        bank = synthetic_bank(size)
+        old = per_call(lambda: copy_and_shuffle(bank, args.k))
+        new = per_call(lambda: bank.sample(args.k))
+        weighted = per_call(lambda: bank.sample(args.k, weights=weights))
+        print(f"{size:>10} {old * 1e6:>12.0f}us {new * 1e6:>8.1f}us {weighted * 1e6:>8.1f}us")
+
+
+if __name__ == "__main__":
+    main()
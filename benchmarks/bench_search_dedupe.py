@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark question search and near-duplicate detection on large synthetic banks.
+
+Writes a bank of N questions in four JSONL shards, a few percent of them
+planted near-duplicates (one word changed, possibly in another category),
+then reports:
+
+* search index build time, cached load time, and query time against a
+  linear scan over every question's text;
+* dedupe time and how many of the planted pairs it found.
+
+    python benchmarks/bench_search_dedupe.py --sizes 10000 100000
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from quiz_app import QuestionBank, SearchIndex, find_near_duplicates, tokenize  # noqa: E402
+
+CATEGORIES = ["algorithms", "big_o", "data_structures", "python"]
+VOCABULARY = (
+    "array list stack queue heap tree graph hash table binary search sort merge quick insertion "
+    "bubble complexity time space worst average best case element index node edge vertex path "
+    "recursion iteration loop function class method object string integer dictionary tuple set "
+    "pointer memory cache key value insert delete lookup traverse balance rotate depth breadth"
+).split()
+OPTIONS = ["O(1)", "O(log n)", "O(n)", "O(n log n)", "O(n²)", "Stack", "Queue", "Heap", "True", "False"]
+QUERIES = ["binary search", "hash table lookup", "merge sort worst case", "graph traverse depth", "zzz"]
+
+
+def write_bank(bank_dir: Path, size: int, duplicate_rate: float) -> int:
+    rng = random.Random(11)
+    shards = {key: [] for key in CATEGORIES}
+    originals = []
+    planted = 0
+    for n in range(size):
+        key = rng.choice(CATEGORIES)
+        if originals and rng.random() < duplicate_rate:
+            original = rng.choice(originals)
+            words = original["question"].rstrip("?").split()
+            words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+            question = dict(original, question=" ".join(words) + "?")
+            planted += 1
+        else:
+            text = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(10, 16)))
+            question = {
+                "question": f"Which {text} (case {n})?",
+                "options": rng.sample(OPTIONS, 4),
+                "correct": rng.randrange(4),
+                "explanation": " ".join(rng.choice(VOCABULARY) for _ in range(12)) + ".",
+            }
+            originals.append(question)
+        shards[key].append(question)
+
+    for key, questions in shards.items():
+        with open(bank_dir / f"{key}.jsonl", "w", encoding="utf-8") as f:
+            for question in questions:
+                f.write(json.dumps(question, ensure_ascii=False) + "\n")
+    QuestionBank(str(bank_dir)).build_manifest(write=True)
+    return planted
+
+
+def linear_search(items, query):
+    words = set(tokenize(query))
+    return [
+        item for item in items
+        if words <= set(tokenize(" ".join([item[1]["question"], *item[1]["options"], item[1]["explanation"]])))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--duplicate-rate", type=float, default=0.02)
+    parser.add_argument("--threshold", type=float, default=0.6)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            bank_dir = Path(tmp)
+            planted = write_bank(bank_dir, size, args.duplicate_rate)
+            bank = QuestionBank(str(bank_dir))
+            items = [(key, q) for key in bank.category_keys() for q in bank.load_category(key)]
+
+            start = time.perf_counter()
+            SearchIndex.for_bank(bank)
+            build = time.perf_counter() - start
+            start = time.perf_counter()
+            index = SearchIndex.for_bank(QuestionBank(str(bank_dir)))
+            cached = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for query in QUERIES:
+                index.search(query)
+            indexed = (time.perf_counter() - start) / len(QUERIES)
+            start = time.perf_counter()
+            for query in QUERIES:
+                linear_search(items, query)
+            scanned = (time.perf_counter() - start) / len(QUERIES)
+
+            start = time.perf_counter()
+            groups = find_near_duplicates(items, threshold=args.threshold)
+            dedupe = time.perf_counter() - start
+            found = sum(len({i for pair in group for i in pair[:2]}) - 1 for group in groups)
+
+            print(f"{size} questions:")
+            print(f"  index build {build:.2f}s, cached load {cached:.2f}s")
+            print(f"  query {indexed * 1000:.2f} ms indexed vs {scanned * 1000:.1f} ms linear scan")
+            print(f"  dedupe {dedupe:.2f}s: {len(groups)} groups, {found} duplicates found, {planted} planted")
+
+
+if __name__ == "__main__":
+    main()
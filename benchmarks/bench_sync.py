@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Measure what syncing two devices costs as their histories grow.
+
+Gives a "laptop" and a "lab" store N sessions of history each, syncs them
+through a shared directory (the first sync sends each history once), then
+runs rounds in which each device studies a few sessions and both sync.
+Reports the bytes each round added to the shared directory and the time
+per sync, next to the size of a stats file that copying would send. It
+also checks that both devices end with exactly the same counters.
+
+    python benchmarks/bench_sync.py --sizes 1000 100000 --rounds 5 --per-round 3
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from quiz_app import StatsSync, StudyStats  # noqa: E402
+
+CATEGORIES = ["Data Structures", "Algorithms", "Python Programming", "Big O Notation", "Mixed Topics"]
+
+
+def write_history(path: Path, sessions: int, rng: random.Random):
+    stats = StudyStats(str(path), journaled=False)
+    stats.data = stats.empty_stats()
+    start = datetime.now() - timedelta(minutes=30 * sessions)
+    for n in range(sessions):
+        total = rng.choice([5, 10, 15, 20])
+        session = stats.new_session(rng.choice(CATEGORIES), rng.randint(0, total), total)
+        session["date"] = (start + timedelta(minutes=30 * n)).isoformat()
+        stats._apply_session(session)
+    stats.save_stats()
+
+
+def study(path: Path, sessions: int, rng: random.Random):
+    stats = StudyStats(str(path))
+    for _ in range(sessions):
+        total = rng.choice([5, 10])
+        stats.add_session(rng.choice(CATEGORIES), rng.randint(0, total), total)
+
+
+def shared_bytes(share: Path) -> int:
+    return sum(path.stat().st_size for path in share.rglob("*.jsonl"))
+
+
+def counters(path: Path):
+    data = StudyStats(str(path)).data
+    return data["total_questions"], data["correct_answers"], data["category_stats"], data["session_count"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--per-round", type=int, default=3, help="sessions each device studies per round")
+    args = parser.parse_args()
+
+    rng = random.Random(4)
+    print(f"{'history':>8} {'stats file':>11} {'first sync':>11} {'per round':>10} {'sync time':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            share = root / "share"
+            stores = []
+            for device in ("laptop", "lab"):
+                (root / device).mkdir()
+                path = root / device / "study_stats.json"
+                write_history(path, size, rng)
+                stores.append((path, StatsSync(StudyStats(str(path)))))
+            file_size = stores[0][0].stat().st_size
+
+            for path, sync in stores:
+                sync.enroll(str(share), path.parent.name)
+                sync.push()
+            for _, sync in stores:
+                sync.pull()
+            first = shared_bytes(share)
+
+            elapsed = []
+            for _ in range(args.rounds):
+                for path, _ in stores:
+                    study(path, args.per_round, rng)
+                for _, sync in stores:
+                    start = time.perf_counter()
+                    sync.sync()
+                    elapsed.append(time.perf_counter() - start)
+            # The second device's last pull is only picked up by the first on its next sync
+            stores[0][1].sync()
+            per_round = (shared_bytes(share) - first) / args.rounds
+
+            assert counters(stores[0][0]) == counters(stores[1][0]), "devices disagree"
+            print(f"{size:>8} {file_size / 1024:>9.0f}KB {first / 1024:>9.0f}KB {per_round / 1024:>8.1f}KB "
+                  f"{sum(elapsed) / len(elapsed) * 1000:>8.1f}ms")
+    print("counters identical on both devices")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Measure what the tracing instrumentation costs, with tracing off and on.
+
+Times a bare ``with tracer.span(...)`` block, then runs the headless quiz
+loop (start a session, answer every question, finish into a JSON stats
+store) with the tracer disabled and enabled, and reports the per-session
+difference.
+
+    python benchmarks/bench_trace_overhead.py --sessions 20000
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import quiz_app  # noqa: E402
+from quiz_app import QuestionBank, QuizEngine, StudyStats, tracer  # noqa: E402
+
+
+def play(engine, sessions):
+    rng = random.Random(0)
+    for _ in range(sessions):
+        session = engine.start_session(num_questions=10)
+        while engine.next_question(session) is not None:
+            engine.submit_answer(session, rng.randrange(4))
+        engine.finish(session)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=5000)
+    args = parser.parse_args()
+
+    def empty_span():
+        with tracer.span("x"):
+            pass
+
+    loops = 1000000
+    disabled = min(timeit.repeat(empty_span, number=loops, repeat=5)) / loops
+    baseline = min(timeit.repeat(lambda: None, number=loops, repeat=5)) / loops
+    print(f"disabled span: {(disabled - baseline) * 1e9:.0f} ns per with-block")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bank = QuestionBank()
+        results = {}
+        for mode in ("disabled", "enabled"):
+            if mode == "enabled":
+                tracer.enable(str(Path(tmp) / "trace.json"))
+            engine = QuizEngine(bank, StudyStats(str(Path(tmp) / f"{mode}.json")))
+            results[mode] = min(timeit.repeat(lambda: play(engine, args.sessions), number=1, repeat=3))
+            print(f"tracing {mode:<8}: {results[mode] / args.sessions * 1e6:8.1f} us per 10-question session")
+        print(f"enabled overhead: {(results['enabled'] / results['disabled'] - 1) * 100:+.1f}%, "
+              f"{len(quiz_app.tracer.events)} spans recorded")
+        tracer.path = None
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Load test `study-quiz serve` with many concurrent simulated users.
+
+Starts the server in a subprocess on a free port, then for each concurrency
+level runs that many asyncio clients at once.  Every client plays complete
+quizzes over one keep-alive connection (start, answer each question,
+finish) until the level's duration is up.  Reports finished sessions per
+second and p50/p99 request latency, and checks the server wrote results.
+
+    python benchmarks/load_test_server.py --levels 100 500 1000 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+async def request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: bench\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if not line.strip():
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    data = json.loads(await reader.readexactly(length))
+    if status >= 400:
+        raise RuntimeError(f"{method} {path} -> {status} {data}")
+    return data
+
+
+async def client(n, host, port, deadline, latencies, questions):
+    rng = random.Random(n)
+    reader, writer = await asyncio.open_connection(host, port)
+    finished = 0
+
+    async def timed(method, path, payload=None):
+        start = time.perf_counter()
+        data = await request(reader, writer, method, path, payload)
+        latencies.append(time.perf_counter() - start)
+        return data
+
+    try:
+        while time.perf_counter() < deadline:
+            session = await timed("POST", "/sessions", {"user": f"learner-{n}", "num_questions": questions})
+            question = session["question"]
+            while question is not None:
+                result = await timed("POST", f"/sessions/{session['session_id']}/answer",
+                                     {"choice": rng.randint(1, len(question["options"]))})
+                question = result["next"]
+            await timed("POST", f"/sessions/{session['session_id']}/finish")
+            finished += 1
+    finally:
+        writer.close()
+    return finished
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+async def run_level(host, port, clients, duration, questions):
+    latencies = []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    finished = await asyncio.gather(*(
+        client(n, host, port, deadline, latencies, questions) for n in range(clients)
+    ))
+    elapsed = time.perf_counter() - start
+    return sum(finished), elapsed, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--levels", type=int, nargs="+", default=[100, 500, 1000],
+                        help="concurrent clients per level")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per level")
+    parser.add_argument("--questions", type=int, default=5, help="questions per session")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = subprocess.Popen(
+            [sys.executable, str(ROOT / "quiz_app.py"), "serve", "--port", "0",
+             "--stats-dir", str(Path(tmp) / "stats")],
+            stdout=subprocess.PIPE, text=True,
+        )
+        try:
+            address = server.stdout.readline().split("http://")[1].split()[0]
+            host, port = address.rsplit(":", 1)
+
+            print(f"{'clients':>8} {'sessions':>9} {'sessions/s':>11} {'req p50 ms':>11} {'req p99 ms':>11}")
+            for clients in args.levels:
+                sessions, elapsed, latencies = asyncio.run(
+                    run_level(host, int(port), clients, args.duration, args.questions))
+                print(f"{clients:>8} {sessions:>9} {sessions / elapsed:>11,.0f} "
+                      f"{percentile(latencies, 0.50) * 1000:>11.2f} {percentile(latencies, 0.99) * 1000:>11.2f}")
+        finally:
+            server.terminate()
+            server.wait()
+        written = sum(1 for _ in (Path(tmp) / "stats").iterdir())
+        print(f"Stats written for {written} users")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Drive thousands of simulated learners through the headless QuizEngine.
+
+Each learner takes one mixed quiz, answering correctly with a probability
+set by their skill, and the result is recorded in a stats store. Reports
+sessions per second and p50/p99 latency of one answer (submit_answer plus
+fetching the next question), and of finishing a session.
+
+    python benchmarks/simulate_learners.py --learners 5000 --questions 10 --stats json
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from quiz_app import QuestionBank, QuizEngine, SQLiteStudyStats, StudyStats  # noqa: E402
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def open_store(kind: str, directory: Path, learner: int):
+    if kind == "json":
+        return StudyStats(str(directory / f"learner-{learner}.json"))
+    if kind == "sqlite":
+        return SQLiteStudyStats(str(directory / f"learner-{learner}.db"))
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--learners", type=int, default=2000)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--stats", choices=["none", "json", "sqlite"], default="json",
+                        help="where each learner's result is recorded")
+    parser.add_argument("--bank", metavar="DIR", help="question bank to draw from")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+    bank = QuestionBank(args.bank)
+    bank.sample(sum(bank.question_count(key) for key in bank.category_keys()))  # warm every shard
+
+    answer_latency = []
+    finish_latency = []
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        for learner in range(args.learners):
+            engine = QuizEngine(bank, open_store(args.stats, Path(tmp), learner))
+            skill = rng.random()
+            session = engine.start_session(num_questions=args.questions)
+            item = engine.next_question(session)
+            while item is not None:
+                _, question = item
+                if rng.random() < skill:
+                    choice = question["correct"]
+                else:
+                    choice = rng.randrange(len(question["options"]))
+                t0 = time.perf_counter()
+                engine.submit_answer(session, choice)
+                item = engine.next_question(session)
+                answer_latency.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            engine.finish(session)
+            finish_latency.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - started
+
+    print(f"{args.learners} learners x {args.questions} questions, stats={args.stats}")
+    print(f"  throughput:     {args.learners / elapsed:,.0f} sessions/s ({elapsed:.2f}s total)")
+    print(f"  answer latency: p50 {percentile(answer_latency, 50) * 1e6:.1f}us  "
+          f"p99 {percentile(answer_latency, 99) * 1e6:.1f}us  mean {statistics.mean(answer_latency) * 1e6:.1f}us")
+    print(f"  finish latency: p50 {percentile(finish_latency, 50) * 1e6:.1f}us  "
+          f"p99 {percentile(finish_latency, 99) * 1e6:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for the study-quiz entry point.
+
+Imports quiz_app in fresh interpreters under ``python -X importtime`` and
+fails if the median cumulative import time exceeds the budget, or if
+importing the module pulls in ``rich`` before a renderer is needed.
+
+Two cases are measured:
+
+* warm: quiz_app's bytecode is cached, as after ``pip install`` (which
+  compiles it) or any run from a checkout after the first;
+* cold: quiz_app is compiled from source on every run, as on the first
+  run after an edit.  Compiling the module costs about 60 ms on its own,
+  paid once per change, so cold has its own, looser budget.
+
+    python benchmarks/startup_importtime.py --runs 15
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Median cumulative import time of quiz_app we commit to, in milliseconds
+IMPORT_BUDGET_MS = 50.0
+COLD_IMPORT_BUDGET_MS = 120.0
+
+
+def measure_once(env: dict, cwd: Path = REPO_ROOT) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import quiz_app"],
+        cwd=str(cwd),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative) / 1000.0
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--cold-budget-ms", type=float, default=COLD_IMPORT_BUDGET_MS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pycache:
+        # Warm: bytecode cached (outside the repo), as after pip install
+        env = dict(os.environ, PYTHONPYCACHEPREFIX=pycache)
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        measure_once(env)
+        warm = [measure_once(env) for _ in range(args.runs)]
+    with tempfile.TemporaryDirectory() as source:
+        # Cold: a copy of the module that is never cached, so every run compiles it;
+        # the standard library and rich keep their usual bytecode
+        shutil.copy(REPO_ROOT / "quiz_app.py", source)
+        env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+        env.pop("PYTHONPYCACHEPREFIX", None)
+        cold = [measure_once(env, Path(source)) for _ in range(args.runs)]
+
+    failed = False
+    for label, runs, budget in (("warm", warm, args.budget_ms), ("cold", cold, args.cold_budget_ms)):
+        timings = [run["quiz_app"] for run in runs]
+        median = statistics.median(timings)
+        print(f"quiz_app import, {label}: median {median:.1f} ms, min {min(timings):.1f} ms, "
+              f"max {max(timings):.1f} ms over {args.runs} runs (budget {budget:.0f} ms)")
+        if median > budget:
+            print(f"FAIL: {label} import time over budget")
+            failed = True
+    eager = sorted({name for run in warm + cold for name in run if name.split(".")[0] == "rich"})
+    if eager:
+        print(f"FAIL: rich imported at startup: {', '.join(eager[:5])}")
+    sys.exit(1 if eager or failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Stress test for concurrent writers to the stats store.
+
+Starts several processes that all record sessions into the same
+study_stats.json at once, then checks that no session or counter was lost.
+
+    python benchmarks/stress_concurrent_writers.py --writers 8 --sessions 200
+"""
+
+import argparse
+import multiprocessing
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from quiz_app import StudyStats  # noqa: E402
+
+
+def writer(stats_file: str, writer_id: int, sessions: int, journaled: bool):
+    stats = StudyStats(stats_file, journaled=journaled)
+    stats.COMPACT_EVERY = 7  # compact often so snapshot swaps race with appends
+    for i in range(sessions):
+        stats.add_session(f"writer-{writer_id}", i % 5, 5)
+
+
+def run(writers: int, sessions: int, journaled: bool) -> bool:
+    with tempfile.TemporaryDirectory() as tmp:
+        stats_file = str(Path(tmp) / "study_stats.json")
+        procs = [
+            multiprocessing.Process(target=writer, args=(stats_file, w, sessions, journaled))
+            for w in range(writers)
+        ]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+
+        data = StudyStats(stats_file).data
+        expected_total = writers * sessions * 5
+        expected_correct = writers * sum(i % 5 for i in range(sessions))
+        ok = (
+            all(p.exitcode == 0 for p in procs)
+            and len(data["sessions"]) == writers * sessions
+            and data["total_questions"] == expected_total
+            and data["correct_answers"] == expected_correct
+            and all(
+                data["category_stats"][f"writer-{w}"]["total"] == sessions * 5
+                for w in range(writers)
+            )
+        )
+        mode = "journaled" if journaled else "snapshot"
+        print(f"{mode:>9}: {len(data['sessions'])}/{writers * sessions} sessions, "
+              f"{data['total_questions']}/{expected_total} questions -> {'OK' if ok else 'LOST DATA'}")
+        return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--sessions", type=int, default=100)
+    args = parser.parse_args()
+
+    results = [run(args.writers, args.sessions, journaled) for journaled in (True, False)]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Drawing the statistics screen and a question to an in-memory terminal."""
+
+import pytest
+from rich.prompt import Prompt
+
+from conftest import HISTORY_SIZES, open_stats
+from quiz_app import QuestionBank, QuizApp
+
+
+@pytest.mark.benchmark(group="show_statistics")
+@pytest.mark.parametrize("sessions", HISTORY_SIZES)
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def bench_show_statistics(benchmark, stats_copy, screen, tmp_path, backend, sessions):
+    # The synthetic history's question ids aren't in any bank; an empty one keeps lookups cheap
+    (tmp_path / "bank").mkdir()
+    app = QuizApp(QuestionBank(str(tmp_path / "bank")), open_stats(stats_copy(backend, sessions)))
+    app.stats.data
+
+    def show():
+        screen.seek(0)
+        screen.truncate()
+        app.show_statistics()
+    benchmark(show)
+    assert "Overall Statistics" in screen.getvalue()
+
+
+@pytest.mark.benchmark(group="ask_question")
+def bench_ask_question(benchmark, monkeypatch, screen, bank):
+    """One question: panel, options, answer feedback and the "continue" prompt."""
+    monkeypatch.setattr(Prompt, "ask", classmethod(lambda cls, *args, **kwargs: "1"))
+    app = QuizApp(bank)
+    items = bank.sample(2)
+
+    def setup():
+        screen.seek(0)
+        screen.truncate()
+        app.session = app.engine.start_session(items=items)
+        return (items[0][1], 1, 2), {}
+    benchmark.pedantic(app.ask_question, setup=setup, rounds=2000)
+    assert "💡" in screen.getvalue()
+
+
+@pytest.mark.benchmark(group="ask_question")
+def bench_render_question(benchmark, bank):
+    question = bank.sample(1)[0][1]
+    benchmark(QuizApp(bank).render_question, question)
@@ -0,0 +1,27 @@
+"""Drawing questions for a quiz from banks of growing size."""
+
+import pytest
+
+from quiz_app import QuizEngine
+
+
+@pytest.mark.benchmark(group="sample")
+def bench_sample_uniform(benchmark, bank):
+    benchmark(bank.sample, 20)
+
+
+@pytest.mark.benchmark(group="sample")
+def bench_sample_weighted(benchmark, bank):
+    weights = {key: n + 1 for n, key in enumerate(bank.category_keys())}
+    benchmark(bank.sample, 20, weights=weights)
+
+
+@pytest.mark.benchmark(group="sample")
+def bench_sample_category(benchmark, bank):
+    benchmark(bank.sample, 20, categories=[bank.category_keys()[0]])
+
+
+@pytest.mark.benchmark(group="sample")
+def bench_start_session(benchmark, bank):
+    engine = QuizEngine(bank)
+    benchmark(engine.start_session, num_questions=20)
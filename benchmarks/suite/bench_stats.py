@@ -0,0 +1,39 @@
+"""Loading and writing study history, for both stats backends."""
+
+import pytest
+
+from conftest import HISTORY_SIZES, open_stats
+
+BACKENDS = ["json", "sqlite"]
+
+
+@pytest.mark.benchmark(group="load_stats")
+@pytest.mark.parametrize("sessions", HISTORY_SIZES)
+@pytest.mark.parametrize("backend", BACKENDS)
+def bench_load_stats(benchmark, stats_copy, backend, sessions):
+    path = stats_copy(backend, sessions)
+    benchmark(lambda: open_stats(path).data)
+
+
+@pytest.mark.benchmark(group="add_session")
+@pytest.mark.parametrize("sessions", HISTORY_SIZES)
+@pytest.mark.parametrize("backend", BACKENDS)
+def bench_add_session(benchmark, stats_copy, backend, sessions):
+    """One finished 10-question quiz into a loaded store, compactions included."""
+    stats = open_stats(stats_copy(backend, sessions))
+    stats.data
+    answers = [{
+        "category": "category_0", "question_id": f"q{n}", "chosen": n % 4, "correct": n % 3 != 0,
+        "answered_at": "2024-01-01T12:00:00", "latency_ms": 4000,
+    } for n in range(10)]
+    # A fixed number of rounds, so the history grows by the same amount on every commit
+    benchmark.pedantic(stats.add_session, args=("Algorithms", 7, 10, answers), rounds=200)
+
+
+@pytest.mark.benchmark(group="save_stats")
+@pytest.mark.parametrize("sessions", HISTORY_SIZES)
+def bench_save_stats(benchmark, stats_copy, sessions):
+    """A full snapshot rewrite of the JSON store."""
+    stats = open_stats(stats_copy("json", sessions))
+    stats.data
+    benchmark(stats.save_stats)
@@ -0,0 +1,141 @@
+"""
+Synthetic question banks and study histories for the benchmark suite.
+
+Generated data is deterministic (fixed seeds) and built once per session,
+so timings from different commits measure the code, not the input.
+"""
+
+import io
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import quiz_app  # noqa: E402
+from quiz_app import QuestionBank, SQLiteStudyStats, StudyStats  # noqa: E402
+
+CATEGORIES = 10
+BANK_SIZES = [1000, 100000]
+HISTORY_SIZES = [1000, 50000]
+CATEGORY_NAMES = ["Data Structures", "Algorithms", "Python Programming", "Big O Notation", "Mixed Topics"]
+VOCABULARY = (
+    "array list stack queue heap tree graph hash table binary search sort merge quick insertion "
+    "complexity time space worst average best case element index node edge vertex path recursion"
+).split()
+OPTIONS = ["O(1)", "O(log n)", "O(n)", "O(n log n)", "O(n²)", "Stack", "Queue", "Heap", "True", "False"]
+
+
+def write_bank(bank_dir: Path, size: int) -> QuestionBank:
+    """A bank of ``size`` questions in CATEGORIES JSONL shards, with its manifest and cache built."""
+    rng = random.Random(3)
+    bank_dir.mkdir(parents=True, exist_ok=True)
+    for c in range(CATEGORIES):
+        with open(bank_dir / f"category_{c}.jsonl", "w", encoding="utf-8") as f:
+            for n in range(size // CATEGORIES):
+                f.write(json.dumps({
+                    "question": " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(8, 16))) + f" ({n})?",
+                    "options": rng.sample(OPTIONS, 4),
+                    "correct": rng.randrange(4),
+                    "explanation": " ".join(rng.choice(VOCABULARY) for _ in range(12)) + ".",
+                }, ensure_ascii=False) + "\n")
+    bank = QuestionBank(str(bank_dir))
+    bank.build_manifest(write=True)
+    for key in bank.category_keys():
+        bank.load_category(key)
+    return bank
+
+
+def history(sessions: int):
+    """``sessions`` finished quizzes, with answers, spread over the last few years."""
+    rng = random.Random(7)
+    start = datetime.now() - timedelta(minutes=37 * sessions)
+    for n in range(sessions):
+        total = rng.choice([5, 10, 15, 20])
+        answers = [{
+            "category": f"category_{rng.randrange(CATEGORIES)}",
+            "question_id": f"q{rng.randrange(5000)}",
+            "chosen": rng.randrange(4),
+            "correct": rng.random() < 0.7,
+            "answered_at": (start + timedelta(minutes=37 * n)).isoformat(),
+            "latency_ms": rng.randint(1500, 30000),
+        } for _ in range(total)]
+        session = StudyStats.new_session(rng.choice(CATEGORY_NAMES), sum(a["correct"] for a in answers), total, answers)
+        session["date"] = (start + timedelta(minutes=37 * n)).isoformat()
+        yield session, answers
+
+
+def write_history(stats_file: Path, sessions: int, backend: str):
+    if backend == "sqlite":
+        stats = SQLiteStudyStats(str(stats_file))
+        rows = list(history(sessions))
+        stats.add_sessions([s for s, _ in rows], [a for _, a in rows])
+        stats.db.close()
+        return
+    stats = StudyStats(str(stats_file), journaled=False)
+    stats.data = stats.empty_stats()
+    for session, _ in history(sessions):
+        stats._apply_session(session)
+    stats.save_stats()
+
+
+@pytest.fixture(scope="session", params=BANK_SIZES, ids=lambda size: f"{size}q")
+def bank_dir(request, tmp_path_factory) -> Path:
+    path = tmp_path_factory.mktemp(f"bank-{request.param}")
+    write_bank(path, request.param)
+    return path
+
+
+@pytest.fixture
+def bank(bank_dir) -> QuestionBank:
+    """A fresh QuestionBank over a synthetic bank, shards loaded from the warm cache."""
+    bank = QuestionBank(str(bank_dir))
+    for key in bank.category_keys():
+        bank.load_category(key)
+    return bank
+
+
+@pytest.fixture(scope="session")
+def history_files(tmp_path_factory):
+    """Pristine stats files, one per backend and size, written on first use."""
+    root = tmp_path_factory.mktemp("histories")
+    written = {}
+
+    def get(backend: str, sessions: int) -> Path:
+        if (backend, sessions) not in written:
+            path = root / f"{backend}-{sessions}" / ("study_stats.db" if backend == "sqlite" else "study_stats.json")
+            path.parent.mkdir()
+            write_history(path, sessions, backend)
+            written[backend, sessions] = path
+        return written[backend, sessions]
+    return get
+
+
+@pytest.fixture
+def stats_copy(history_files, tmp_path):
+    """A writable copy of a pristine history, so one benchmark's writes don't leak into the next."""
+    def get(backend: str, sessions: int) -> Path:
+        source = history_files(backend, sessions)
+        target = tmp_path / source.name
+        target.write_bytes(source.read_bytes())
+        return target
+    return get
+
+
+def open_stats(path: Path) -> StudyStats:
+    return SQLiteStudyStats(str(path)) if path.suffix == ".db" else StudyStats(str(path))
+
+
+@pytest.fixture
+def screen(monkeypatch) -> io.StringIO:
+    """Point the app's console at an in-memory terminal and return its buffer."""
+    from rich.console import Console
+
+    buffer = io.StringIO()
+    monkeypatch.setattr(quiz_app.console, "_console",
+                        Console(file=buffer, width=100, force_terminal=True, color_system="truecolor"))
+    return buffer
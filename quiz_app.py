@@ -4,335 +4,2955 @@ Prework Study Guide - Interactive CLI Quiz Tool
 A beautiful command-line quiz application for programming concepts
 """
 
+import bisect
+import functools
+import heapq
+import itertools
 import json
+import os
 import random
+import re
+import sys
+import threading
 import time
-from datetime import datetime
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 try:
-    from rich.console import Console
-    from rich.panel import Panel
-    from rich.progress import Progress, SpinnerColumn, TextColumn
-    from rich.prompt import Prompt, Confirm
-    from rich.table import Table
-    from rich.text import Text
-    from rich import box
-    from rich.align import Align
-except ImportError:
-    print("Installing required dependencies...")
-    import subprocess
-    import sys
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "rich"])
-    from rich.console import Console
-    from rich.panel import Panel
-    from rich.progress import Progress, SpinnerColumn, TextColumn
-    from rich.prompt import Prompt, Confirm
-    from rich.table import Table
-    from rich.text import Text
-    from rich import box
-    from rich.align import Align
-
-console = Console()
-
-# Quiz questions database
-QUIZ_DATA = {
-    "data_structures": {
-        "name": "Data Structures",
-        "questions": [
-            {
-                "question": "What is the time complexity of accessing an element in an array by index?",
-                "options": ["O(1)", "O(log n)", "O(n)", "O(n²)"],
-                "correct": 0,
-                "explanation": "Array access by index is constant time O(1) because arrays store elements contiguously in memory."
-            },
-            {
-                "question": "Which data structure follows LIFO (Last In, First Out) principle?",
-                "options": ["Queue", "Stack", "Array", "Linked List"],
-                "correct": 1,
-                "explanation": "A stack follows LIFO - the last element added is the first one to be removed."
-            },
-            {
-                "question": "What is the space complexity of a binary tree with n nodes?",
-                "options": ["O(1)", "O(log n)", "O(n)", "O(n²)"],
-                "correct": 2,
-                "explanation": "A binary tree with n nodes requires O(n) space to store all nodes."
-            },
-            {
-                "question": "In a hash table, what happens when two keys hash to the same index?",
-                "options": ["Error occurs", "Collision occurs", "Data is lost", "Array resizes"],
-                "correct": 1,
-                "explanation": "When two keys hash to the same index, it's called a collision and needs to be resolved."
-            },
-            {
-                "question": "What is the average time complexity for searching in a balanced BST?",
-                "options": ["O(1)", "O(log n)", "O(n)", "O(n log n)"],
-                "correct": 1,
-                "explanation": "In a balanced Binary Search Tree, search operations take O(log n) time on average."
-            }
-        ]
-    },
-    "algorithms": {
-        "name": "Algorithms",
-        "questions": [
-            {
-                "question": "What is the time complexity of the quicksort algorithm in the average case?",
-                "options": ["O(n)", "O(n log n)", "O(n²)", "O(log n)"],
-                "correct": 1,
-                "explanation": "Quicksort has O(n log n) average time complexity, though worst case is O(n²)."
-            },
-            {
-                "question": "Which algorithm technique does binary search use?",
-                "options": ["Greedy", "Dynamic Programming", "Divide and Conquer", "Backtracking"],
-                "correct": 2,
-                "explanation": "Binary search uses divide and conquer by repeatedly splitting the search space in half."
-            },
-            {
-                "question": "What is the space complexity of merge sort?",
-                "options": ["O(1)", "O(log n)", "O(n)", "O(n²)"],
-                "correct": 2,
-                "explanation": "Merge sort requires O(n) additional space for the temporary arrays during merging."
-            },
-            {
-                "question": "Which sorting algorithm is stable and has O(n log n) worst-case time complexity?",
-                "options": ["Quick Sort", "Heap Sort", "Merge Sort", "Selection Sort"],
-                "correct": 2,
-                "explanation": "Merge sort is stable (maintains relative order) and has O(n log n) worst-case complexity."
-            },
-            {
-                "question": "What is dynamic programming primarily used for?",
-                "options": ["Sorting arrays", "Graph traversal", "Optimization problems", "Memory management"],
-                "correct": 2,
-                "explanation": "Dynamic programming is used to solve optimization problems by breaking them into overlapping subproblems."
-            }
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Start of the "startup" trace span, which ends once the banner is on screen
+STARTED_NS = time.perf_counter_ns()
+
+class _LazyConsole:
+    """Stands in for rich's Console so ``rich`` is only imported on first use."""
+
+    def __init__(self):
+        self._console = None
+        self.settings = {}
+
+    def configure(self, **settings):
+        """Keyword arguments for the Console, e.g. ``color_system``; applies from the next use."""
+        self.settings = settings
+        self._console = None
+
+    def resolve(self):
+        """Return the real Console, e.g. for rich objects that take ``console=``."""
+        if self._console is None:
+            with tracer.span("import rich"):
+                from rich.console import Console
+                self._console = Console(**self.settings)
+        return self._console
+
+    def __getattr__(self, name):
+        return getattr(self.resolve(), name)
+
+console = _LazyConsole()
+
+class Tracer:
+    """Opt-in timing spans, written as Chrome trace JSON.
+
+    Enabled by ``--trace FILE`` or ``$STUDY_QUIZ_TRACE``; the file opens in
+    chrome://tracing or ui.perfetto.dev, one row per thread.  While
+    disabled, ``span`` hands back one shared no-op context manager, so an
+    instrumented block costs a method call and an empty ``with``.
+    """
+
+    def __init__(self):
+        self.path = None
+        self.events = []
+        self.thread_names = {}
+        self._disabled = nullcontext()
+    
+    def enable(self, path: str):
+        import atexit
+        
+        self.path = Path(path)
+        atexit.register(self.write)
+    
+    def span(self, name: str, **args):
+        if self.path is None:
+            return self._disabled
+        return self._span(name, args)
+    
+    @contextmanager
+    def _span(self, name: str, args: Dict):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter_ns(), **args)
+    
+    def add(self, name: str, start_ns: int, end_ns: int, **args):
+        """Record a span that has already ended, e.g. one timed by the caller."""
+        if self.path is None:
+            return
+        thread = threading.current_thread()
+        self.thread_names[thread.ident] = thread.name
+        self.events.append({
+            "name": name, "ph": "X", "pid": os.getpid(), "tid": thread.ident,
+            "ts": start_ns / 1000, "dur": (end_ns - start_ns) / 1000, "args": args
+        })
+    
+    def write(self):
+        if self.path is None:
+            return
+        names = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+            for tid, name in self.thread_names.items()
         ]
-    },
-    "python": {
-        "name": "Python Programming",
-        "questions": [
-            {
-                "question": "What is the result of: 3 ** 2?",
-                "options": ["6", "9", "5", "8"],
-                "correct": 1,
-                "explanation": "The ** operator is exponentiation in Python, so 3 ** 2 = 3² = 9."
-            },
-            {
-                "question": "Which Python data type is mutable?",
-                "options": ["tuple", "string", "list", "int"],
-                "correct": 2,
-                "explanation": "Lists are mutable in Python, meaning you can change their contents after creation."
-            },
-            {
-                "question": "What does 'self' represent in Python class methods?",
-                "options": ["The class itself", "A global variable", "The instance of the class", "Nothing special"],
-                "correct": 2,
-                "explanation": "'self' refers to the instance of the class that the method is being called on."
-            },
-            {
-                "question": "What is the correct way to create a dictionary in Python?",
-                "options": ["dict = []", "dict = {}", "dict = ()", "dict = <>"],
-                "correct": 1,
-                "explanation": "Dictionaries in Python are created using curly braces {} or the dict() constructor."
-            },
-            {
-                "question": "What is the difference between '==' and 'is' in Python?",
-                "options": ["No difference", "'==' compares values, 'is' compares identity", "'is' compares values, '==' compares identity", "Both compare identity"],
-                "correct": 1,
-                "explanation": "'==' compares values for equality, while 'is' compares object identity (whether they're the same object)."
-            }
+        atomic_write_json(self.path, {"traceEvents": names + self.events, "displayTimeUnit": "ms"})
+
+tracer = Tracer()
+
+def traced(name: str):
+    """Decorator that runs the function inside ``tracer.span(name)``."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with tracer.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+DEFAULT_BANK_DIR = Path(__file__).resolve().parent / "question_bank"
+
+class QuestionBankError(ValueError):
+    pass
+
+def validate_question(question) -> List[str]:
+    """Return a list of problems with one question; empty if it is usable."""
+    if not isinstance(question, dict):
+        return ["is not an object"]
+    
+    problems = []
+    if not isinstance(question.get("question"), str) or not question["question"].strip():
+        problems.append("missing question text")
+    options = question.get("options")
+    if not isinstance(options, list) or len(options) < 2 or not all(isinstance(o, str) for o in options):
+        problems.append("options must be a list of at least two strings")
+    correct = question.get("correct")
+    if not isinstance(correct, int) or isinstance(correct, bool):
+        problems.append("correct must be an integer index")
+    elif isinstance(options, list) and not 0 <= correct < len(options):
+        problems.append(f"correct index {correct} is out of range for {len(options)} options")
+    if not isinstance(question.get("explanation"), str) or not question["explanation"].strip():
+        problems.append("missing explanation")
+    return problems
+
+def file_sha256(path: Path) -> str:
+    import hashlib
+    
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def question_id(question) -> str:
+    """A stable id for a question: its ``id`` field, else a hash of its text."""
+    if question.get("id"):
+        return str(question["id"])
+    import hashlib
+    
+    return hashlib.sha1(question["question"].encode("utf-8")).hexdigest()[:12]
+
+class Question:
+    """One question, stored with ``__slots__`` instead of a dict.
+
+    Reads like the dict it was parsed from (``question["options"]``,
+    ``question.get("id")``) so call sites need not care.  Options are a
+    tuple of interned strings: answers like "O(1)" or "O(n)" repeat across
+    thousands of questions and are kept once.  Fields other than the
+    standard ones are kept in ``extra``.
+    """
+
+    __slots__ = ("question", "options", "correct", "explanation", "id", "extra")
+    FIELDS = ("question", "options", "correct", "explanation", "id")
+
+    def __init__(self, question: str, options, correct: int, explanation: str,
+                 id: Optional[str] = None, extra: Optional[Dict] = None):
+        self.question = question
+        self.options = tuple(sys.intern(option) for option in options)
+        self.correct = correct
+        self.explanation = explanation
+        self.id = id
+        self.extra = extra or None
+    
+    @classmethod
+    def from_dict(cls, question: Dict) -> "Question":
+        extra = {field: value for field, value in question.items() if field not in cls.FIELDS}
+        return cls(question["question"], question["options"], question["correct"],
+                   question["explanation"], question.get("id"), extra)
+    
+    def to_dict(self) -> Dict:
+        question = {field: getattr(self, field) for field in self.FIELDS if getattr(self, field) is not None}
+        question["options"] = list(self.options)
+        question.update(self.extra or {})
+        return question
+    
+    def __getitem__(self, field: str):
+        if field in self.FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                return value
+        elif self.extra and field in self.extra:
+            return self.extra[field]
+        raise KeyError(field)
+    
+    def get(self, field: str, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+    
+    def __contains__(self, field: str) -> bool:
+        return self.get(field) is not None
+    
+    def fields(self) -> Tuple:
+        """Plain tuple of the constructor arguments, as stored in the bank cache."""
+        return self.question, self.options, self.correct, self.explanation, self.id, self.extra
+    
+    def __repr__(self):
+        return f"Question({self.question!r})"
+
+class QuestionBank:
+    """Questions stored as one shard file per category.
+
+    ``manifest.json`` lists each category's key, display name, shard file and
+    question count, so menus can be drawn without opening any shard.  A shard
+    is either a JSON file (``{"name": ..., "questions": [...]}`` or a bare list)
+    or a JSONL file with one question per line, and is only read the first
+    time its category is needed.
+
+    Validated shards are cached as pickles under ``__bankcache__/``, keyed by
+    the source file's mtime, size and SHA-256.  A launch whose sources are
+    unchanged unpickles the cache instead of re-parsing and re-validating;
+    an edited shard is rebuilt transparently.  Loaded questions are
+    ``Question`` objects, not dicts.
+    """
+
+    MANIFEST = "manifest.json"
+    CALIBRATION = "calibration.json"
+    SHARD_SUFFIXES = (".json", ".jsonl")
+    CACHE_VERSION = 3
+
+    def __init__(self, bank_dir: Optional[str] = None, cache_dir: Optional[str] = None):
+        self.bank_dir = Path(bank_dir or os.environ.get("STUDY_QUIZ_BANK") or DEFAULT_BANK_DIR)
+        self.cache_dir = Path(cache_dir) if cache_dir else self.bank_dir / "__bankcache__"
+        self._manifest = None
+        self._shards = {}
+        self._flat_index = None
+        self._id_maps = {}
+        # Shards may be preloaded on a background thread while the menu is up
+        self._load_lock = threading.Lock()
+    
+    @property
+    def manifest(self) -> Dict[str, Dict]:
+        """Category key -> manifest entry, in menu order."""
+        if self._manifest is None:
+            manifest_path = self.bank_dir / self.MANIFEST
+            if manifest_path.exists():
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)["categories"]
+            else:
+                entries = self.build_manifest()
+            for entry in entries:
+                entry["key"] = sys.intern(entry["key"])
+                entry["name"] = sys.intern(entry["name"])
+            self._manifest = {entry["key"]: entry for entry in entries}
+            self._flat_index = None
+        return self._manifest
+    
+    def category_keys(self) -> List[str]:
+        return list(self.manifest)
+    
+    def category_name(self, key: str) -> str:
+        return self.manifest[key]["name"]
+    
+    def question_count(self, key: str) -> int:
+        return self.manifest[key]["count"]
+    
+    def load_category(self, key: str) -> List[Question]:
+        if key not in self._shards:
+            with self._load_lock, tracer.span("load_category", category=key):
+                if key not in self._shards:
+                    questions = self._load_cached(key)
+                    if len(questions) != self.manifest[key]["count"]:
+                        # Stale manifest; trust the shard from now on
+                        self.manifest[key]["count"] = len(questions)
+                        self._flat_index = None
+                    self._shards[key] = questions
+        return self._shards[key]
+    
+    def question_index(self) -> Dict[str, Tuple[str, Question]]:
+        """Every question in the bank by ``question_id``, as ``(category_key, question)``."""
+        return {
+            question_id(question): (key, question)
+            for key in self.category_keys()
+            for question in self.load_category(key)
+        }
+    
+    def find_question(self, key: str, qid: str) -> Optional[Question]:
+        """Look a question up by ``question_id`` within one category."""
+        if key not in self.manifest:
+            return None
+        if key not in self._id_maps:
+            self._id_maps[key] = {question_id(q): q for q in self.load_category(key)}
+        return self._id_maps[key].get(qid)
+    
+    @property
+    def flat_index(self) -> Tuple[List[str], List[int]]:
+        """Category keys and the running question count after each one.
+
+        Question ``n`` of the whole bank lives in the first category whose
+        running count exceeds ``n``, so positions map to ``(key, index)``
+        references with a bisect and no shard has to be opened to draw them.
+        """
+        if self._flat_index is None:
+            keys = self.category_keys()
+            self._flat_index = (keys, list(itertools.accumulate(self.question_count(key) for key in keys)))
+        return self._flat_index
+    
+    def sample(self, k: int, categories: Optional[List[str]] = None,
+               weights: Optional[Dict[str, float]] = None) -> List[Tuple[str, Question]]:
+        """Draw up to ``k`` distinct questions as ``(category_key, question)`` pairs.
+
+        Cost is proportional to ``k``, not to the size of the bank, and the
+        questions are returned as-is rather than copied.  Only the shards
+        that were actually drawn from are loaded.
+
+        ``weights`` maps category keys to relative weights (default 1.0); a
+        weight scales how likely each question in that category is to be drawn.
+        """
+        while True:
+            if weights:
+                picks = self._sample_weighted(k, categories or self.category_keys(), weights)
+            else:
+                picks = self._sample_uniform(k, categories)
+            
+            drawn = []
+            for key, index in picks:
+                questions = self.load_category(key)
+                if index >= len(questions):
+                    break
+                drawn.append((key, questions[index]))
+            else:
+                return drawn
+    
+    def _sample_uniform(self, k: int, categories: Optional[List[str]]) -> List[Tuple[str, int]]:
+        if categories is None:
+            keys, offsets = self.flat_index
+        else:
+            keys = list(categories)
+            offsets = list(itertools.accumulate(self.question_count(key) for key in keys))
+        total = offsets[-1] if offsets else 0
+        
+        picks = []
+        for position in random.sample(range(total), min(k, total)):
+            i = bisect.bisect_right(offsets, position)
+            picks.append((keys[i], position - (offsets[i - 1] if i else 0)))
+        return picks
+    
+    def _sample_weighted(self, k: int, keys: List[str], weights: Dict[str, float]) -> List[Tuple[str, int]]:
+        remaining = {key: self.question_count(key) for key in keys if weights.get(key, 1.0) > 0}
+        # Sparse Fisher-Yates state per category: only swapped slots are stored
+        swapped = {key: {} for key in remaining}
+        
+        picks = []
+        while len(picks) < k:
+            live = [key for key in remaining if remaining[key]]
+            if not live:
+                break
+            key = random.choices(live, weights=[weights.get(key, 1.0) * remaining[key] for key in live])[0]
+            
+            n = remaining[key]
+            slot = random.randrange(n)
+            slots = swapped[key]
+            picks.append((key, slots.get(slot, slot)))
+            slots[slot] = slots.pop(n - 1, n - 1)
+            remaining[key] = n - 1
+        return picks
+    
+    def _cache_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pickle"
+    
+    def _load_cached(self, key: str) -> List[Question]:
+        import pickle
+        
+        source = self.bank_dir / self.manifest[key]["file"]
+        st = source.stat()
+        try:
+            with open(self._cache_path(key), 'rb') as f:
+                # The header is a separate pickle so a stale cache is rejected
+                # without unpickling its questions
+                header = pickle.load(f)
+                if header["version"] == self.CACHE_VERSION:
+                    fresh = (header["mtime_ns"], header["size"]) == (st.st_mtime_ns, st.st_size)
+                    if fresh or header["sha256"] == file_sha256(source):
+                        # Plain tuples, so a cache written by ``python quiz_app.py`` (where
+                        # the class lives in __main__) loads under ``import quiz_app`` too
+                        cached = pickle.load(f)
+                        if not fresh:
+                            # Same content, new stat (a checkout or copy): record the
+                            # new stat so the next load skips hashing again
+                            self._write_cache(key, dict(header, mtime_ns=st.st_mtime_ns, size=st.st_size), cached)
+                        return [Question(*fields) for fields in cached]
+        except (OSError, EOFError, KeyError, TypeError, pickle.UnpicklingError):
+            pass
+        return self.compile_category(key)
+    
+    def compile_category(self, key: str) -> List[Question]:
+        """Parse and validate one shard, then refresh its cache."""
+        import pickle
+        
+        source = self.bank_dir / self.manifest[key]["file"]
+        st = source.stat()
+        name, questions = self.read_shard(source)
+        
+        problems = [
+            f"{source.name}: question {i}: {problem}"
+            for i, question in enumerate(questions, 1)
+            for problem in validate_question(question)
         ]
-    },
-    "big_o": {
-        "name": "Big O Notation",
-        "questions": [
-            {
-                "question": "Which complexity grows the fastest?",
-                "options": ["O(n)", "O(log n)", "O(n²)", "O(1)"],
-                "correct": 2,
-                "explanation": "O(n²) quadratic complexity grows much faster than linear O(n) or logarithmic O(log n)."
-            },
-            {
-                "question": "What is the time complexity of a nested loop where both loops run n times?",
-                "options": ["O(n)", "O(log n)", "O(n²)", "O(2n)"],
-                "correct": 2,
-                "explanation": "Two nested loops, each running n times, results in n × n = O(n²) time complexity."
-            },
-            {
-                "question": "Which operation on a sorted array has O(log n) complexity?",
-                "options": ["Linear search", "Binary search", "Insertion", "Deletion"],
-                "correct": 1,
-                "explanation": "Binary search on a sorted array has O(log n) complexity by eliminating half the search space each step."
-            },
-            {
-                "question": "What is the space complexity of an algorithm that uses a fixed amount of extra space?",
-                "options": ["O(n)", "O(log n)", "O(1)", "O(n²)"],
-                "correct": 2,
-                "explanation": "If an algorithm uses a constant amount of extra space regardless of input size, it's O(1) space."
-            },
-            {
-                "question": "In Big O notation, what do we focus on?",
-                "options": ["Best case", "Average case", "Worst case", "All cases equally"],
-                "correct": 2,
-                "explanation": "Big O notation typically describes the worst-case time or space complexity of an algorithm."
-            }
+        if problems:
+            raise QuestionBankError("\n".join(problems))
+        questions = [Question.from_dict(question) for question in questions]
+        
+        header = {
+            "version": self.CACHE_VERSION,
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha256": file_sha256(source),
+        }
+        self._write_cache(key, header, [question.fields() for question in questions])
+        return questions
+    
+    def _write_cache(self, key: str, header: Dict, cached: List[tuple]):
+        import pickle
+        
+        payload = pickle.dumps(header, pickle.HIGHEST_PROTOCOL) + pickle.dumps(cached, pickle.HIGHEST_PROTOCOL)
+        try:
+            self.cache_dir.mkdir(exist_ok=True)
+            atomic_write_bytes(self._cache_path(key), payload)
+        except OSError:
+            # A read-only bank still works, it just isn't cached
+            pass
+    
+    @staticmethod
+    def read_shard(path: Path):
+        """Return ``(name, questions)`` from a shard; name is None if the shard has none."""
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.suffix == ".jsonl":
+                return None, [json.loads(line) for line in f if line.strip()]
+            shard = json.load(f)
+        if isinstance(shard, list):
+            return None, shard
+        if not isinstance(shard, dict) or not isinstance(shard.get("questions"), list):
+            raise QuestionBankError(f"{path}: expected a list of questions or an object with 'questions'")
+        return shard.get("name"), shard["questions"]
+    
+    def calibration(self) -> Dict[str, Tuple[float, float]]:
+        """Fitted 2PL ``(discrimination, difficulty)`` by ``question_id``; empty if never calibrated."""
+        path = self.bank_dir / self.CALIBRATION
+        if not path.exists():
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            items = json.load(f)["items"]
+        return {qid: (item["a"], item["b"]) for qid, item in items.items()}
+    
+    def shard_paths(self) -> List[Path]:
+        return sorted(
+            path for path in self.bank_dir.iterdir()
+            if path.suffix in self.SHARD_SUFFIXES and path.name not in (self.MANIFEST, self.CALIBRATION)
+        )
+    
+    def build_manifest(self, write: bool = False) -> List[Dict]:
+        """Scan every shard in the bank directory and describe it in a manifest."""
+        entries = []
+        for path in self.shard_paths():
+            name, questions = self.read_shard(path)
+            entries.append({
+                "key": path.stem,
+                "name": name or path.stem.replace("_", " ").title(),
+                "file": path.name,
+                "count": len(questions),
+            })
+        
+        if write:
+            previous = self.bank_dir / self.MANIFEST
+            if previous.exists():
+                # Keep the existing menu order for categories already listed
+                with open(previous, 'r', encoding='utf-8') as f:
+                    order = [entry["key"] for entry in json.load(f)["categories"]]
+                entries.sort(key=lambda entry: order.index(entry["key"]) if entry["key"] in order else len(order))
+            atomic_write_json(previous, {"categories": entries}, indent=2, ensure_ascii=False)
+            self._manifest = None
+        return entries
+
+WORD = re.compile(r"\w+")
+
+def tokenize(text: str) -> List[str]:
+    return WORD.findall(text.casefold())
+
+class SearchIndex:
+    """Inverted index over question, option and explanation text.
+
+    Every question in the bank gets an integer document id (its position in
+    ``docs``, which holds ``(category_key, index)`` references) and each
+    word maps to the sorted ids of the questions containing it, so a query
+    only touches the postings of its own words.  The index is pickled next
+    to the shard caches and rebuilt when any shard changes.
+    """
+
+    VERSION = 1
+    CACHE_FILE = "search-index.pickle"
+
+    def __init__(self, docs: List[Tuple[str, int]], postings: Dict[str, List[int]],
+                 title_postings: Dict[str, List[int]]):
+        self.docs = docs
+        self.postings = postings
+        self.title_postings = title_postings
+    
+    @classmethod
+    def build(cls, bank: QuestionBank) -> "SearchIndex":
+        docs, postings, title_postings = [], {}, {}
+        for key in bank.category_keys():
+            for index, question in enumerate(bank.load_category(key)):
+                doc = len(docs)
+                docs.append((key, index))
+                title_words = set(tokenize(question["question"]))
+                words = title_words.union(
+                    tokenize(" ".join(question["options"])), tokenize(question["explanation"]))
+                for word in words:
+                    postings.setdefault(sys.intern(word), []).append(doc)
+                for word in title_words:
+                    title_postings.setdefault(sys.intern(word), []).append(doc)
+        return cls(docs, postings, title_postings)
+    
+    @staticmethod
+    def bank_signature(bank: QuestionBank) -> List[Tuple]:
+        signature = []
+        for key in bank.category_keys():
+            st = (bank.bank_dir / bank.manifest[key]["file"]).stat()
+            signature.append((key, st.st_mtime_ns, st.st_size))
+        return signature
+    
+    @classmethod
+    def for_bank(cls, bank: QuestionBank) -> "SearchIndex":
+        """The bank's index, from the cache when no shard has changed since it was built."""
+        import pickle
+        
+        path = bank.cache_dir / cls.CACHE_FILE
+        signature = cls.bank_signature(bank)
+        try:
+            with open(path, 'rb') as f:
+                header = pickle.load(f)
+                if header == {"version": cls.VERSION, "shards": signature}:
+                    return cls(*pickle.load(f))
+        except (OSError, EOFError, TypeError, pickle.UnpicklingError):
+            pass
+        
+        index = cls.build(bank)
+        header = {"version": cls.VERSION, "shards": signature}
+        payload = (pickle.dumps(header, pickle.HIGHEST_PROTOCOL)
+                   + pickle.dumps((index.docs, index.postings, index.title_postings), pickle.HIGHEST_PROTOCOL))
+        try:
+            bank.cache_dir.mkdir(exist_ok=True)
+            atomic_write_bytes(path, payload)
+        except OSError:
+            pass
+        return index
+    
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, int, float]]:
+        """Questions containing every word of ``query``, best first, as ``(key, index, score)``.
+
+        Rarer words count for more, and a word in the question text itself
+        counts double.
+        """
+        import math
+        
+        words = set(tokenize(query))
+        if not words or any(word not in self.postings for word in words):
+            return []
+        lists = sorted((self.postings[word] for word in words), key=len)
+        matches = set(lists[0]).intersection(*lists[1:])
+        
+        n = len(self.docs)
+        scores = dict.fromkeys(matches, 0.0)
+        for word in words:
+            idf = math.log(1 + n / len(self.postings[word]))
+            in_title = set(self.title_postings.get(word, ()))
+            for doc in matches:
+                scores[doc] += idf * (2 if doc in in_title else 1)
+        
+        best = sorted(matches, key=lambda doc: (-scores[doc], doc))[:limit]
+        return [self.docs[doc] + (round(scores[doc], 2),) for doc in best]
+
+def shingles(question) -> set:
+    """Word pairs of a question's text and correct answer, for near-duplicate checks."""
+    words = tokenize(question["question"]) + tokenize(question["options"][question["correct"]])
+    if len(words) < 2:
+        return set(words)
+    return {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+def informative_shingles(questions, max_df: float = 0.01, min_count: int = 10) -> List[set]:
+    """Each question's shingles, less those too common to tell questions apart.
+
+    A shingle in more than ``max_df`` of the questions (and more than
+    ``min_count`` of them, so small banks keep everything) is template
+    wording such as "time complexity of" and is dropped.  A question made
+    only of such wording keeps its full set, so copies of it still match.
+    """
+    sets = [shingles(question) for question in questions]
+    counts = {}
+    for words in sets:
+        for word in words:
+            counts[word] = counts.get(word, 0) + 1
+    limit = max(min_count, int(max_df * len(sets)))
+    common = {word for word, count in counts.items() if count > limit}
+    if not common:
+        return sets
+    return [(words - common) or words for words in sets]
+
+def lsh_parameters(threshold: float, hashes: int = 64, recall: float = 0.99) -> Tuple[int, int]:
+    """``(bands, rows)`` for MinHash LSH over at most ``hashes`` values.
+
+    A pair with Jaccard similarity ``s`` shares a bucket with probability
+    ``1 - (1 - s**rows)**bands``.  This picks the most rows per band (the
+    fewest false candidates) that still catch a pair right at
+    ``threshold`` with probability ``recall``; more similar pairs are
+    caught more often.
+    """
+    for rows in range(hashes, 0, -1):
+        bands = hashes // rows
+        if 1 - (1 - threshold ** rows) ** bands >= recall:
+            return bands, rows
+    return hashes, 1
+
+def find_near_duplicates(items: List[Tuple[str, Question]], threshold: float = 0.6,
+                         bands: Optional[int] = None, rows: Optional[int] = None,
+                         max_df: float = 0.01) -> List[List[Tuple[int, int, float]]]:
+    """Group questions whose shingle sets have Jaccard similarity >= ``threshold``.
+
+    Sets come from ``informative_shingles``, so wording shared by more than
+    ``max_df`` of the bank counts for neither the buckets nor the
+    similarity; otherwise every templated question would share buckets
+    with every other.  Each question gets a MinHash signature of
+    ``bands * rows`` values, and questions whose signatures agree on every
+    row of some band land in the same bucket.  Only pairs sharing a bucket
+    are compared exactly, each once, in the first band they share, so the
+    cost grows with the bank plus the number of likely duplicates rather
+    than with every pair.  ``bands`` and ``rows`` default to what
+    ``lsh_parameters`` derives from ``threshold``.  Returns groups of
+    ``(i, j, similarity)`` pairs, ``i`` and ``j`` being positions in ``items``.
+    """
+    import hashlib
+    import struct
+    
+    if bands is None or rows is None:
+        bands, rows = lsh_parameters(threshold)
+    # One SHAKE-128 digest per shingle, read out as bands * rows independent 16-bit hashes
+    width = bands * rows
+    unpack = struct.Struct(f"<{width}H").unpack
+    
+    sets = informative_shingles([question for _, question in items], max_df)
+    buckets = {}
+    keys = [None] * len(items)
+    for i, words in enumerate(sets):
+        if not words:
+            continue
+        signature = list(map(min, zip(*(
+            unpack(hashlib.shake_128(word.encode("utf-8")).digest(2 * width)) for word in words
+        ))))
+        keys[i] = [tuple(signature[band * rows:(band + 1) * rows]) for band in range(bands)]
+        for band, key in enumerate(keys[i]):
+            buckets.setdefault((band, key), []).append(i)
+    
+    parent = list(range(len(items)))
+    
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    pairs = []
+    for (band, _), members in buckets.items():
+        for a, b in itertools.combinations(members, 2):
+            # Compared already if an earlier band put them together
+            if any(x == y for x, y in zip(keys[a][:band], keys[b][:band])):
+                continue
+            similarity = len(sets[a] & sets[b]) / len(sets[a] | sets[b])
+            if similarity >= threshold:
+                pairs.append((a, b, round(similarity, 2)))
+                parent[root(b)] = root(a)
+    
+    groups = {}
+    for pair in pairs:
+        groups.setdefault(root(pair[0]), []).append(pair)
+    return sorted(groups.values(), key=lambda group: min(group)[:2])
+
+@contextmanager
+def file_lock(lock_path: Path):
+    """Hold an exclusive lock on ``lock_path`` across processes."""
+    with open(lock_path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def atomic_write_bytes(path: Path, payload: bytes):
+    """Write to a temp file in the same directory, then rename it over ``path``.
+
+    Readers see either the old file or the new one, never a truncated mix.
+    The new file keeps the old one's permissions, or gets the umask's
+    defaults like a plain ``open`` would; mkstemp alone would leave it 0600.
+    """
+    import stat
+    import tempfile
+    
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, str(path))
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def atomic_write_json(path: Path, data, **dump_kwargs):
+    atomic_write_bytes(path, json.dumps(data, **dump_kwargs).encode("utf-8"))
+
+def append_lines(path: Path, payload: bytes) -> int:
+    """Append newline-terminated ``payload`` to ``path`` and fsync; return the new file size."""
+    with open(path, 'a+b') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                # Terminate a torn line so this entry stays parseable
+                payload = b"\n" + payload
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+def iter_json_members(f, streamed=(), chunk_size: int = 1 << 16):
+    """Yield ``(key, value)`` for each member of the JSON object read from text file ``f``.
+
+    The document is parsed incrementally with ``raw_decode``.  Members named
+    in ``streamed`` must be arrays; they yield ``(key, element)`` once per
+    element instead, so memory holds one element and one read chunk, not
+    the array.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+    
+    def fill(size):
+        nonlocal buf, pos, eof
+        more = f.read(size)
+        eof = not more
+        buf, pos = buf[pos:] + more, 0
+    
+    def peek() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if eof:
+                raise ValueError("unexpected end of JSON document")
+            fill(chunk_size)
+    
+    def expect(char: str):
+        nonlocal pos
+        if peek() != char:
+            raise ValueError(f"expected {char!r} in JSON document, found {buf[pos]!r}")
+        pos += 1
+    
+    def value():
+        nonlocal pos
+        peek()
+        while True:
+            try:
+                decoded, end = decoder.raw_decode(buf, pos)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(buf) or eof:
+                    pos = end
+                    return decoded
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            # Grow geometrically so a large member is not re-scanned once per chunk
+            fill(max(chunk_size, len(buf) - pos))
+    
+    expect("{")
+    if peek() == "}":
+        return
+    while True:
+        key = value()
+        expect(":")
+        if key in streamed:
+            expect("[")
+            while peek() != "]":
+                yield key, value()
+                if peek() == ",":
+                    expect(",")
+            expect("]")
+        else:
+            yield key, value()
+        if peek() != ",":
+            expect("}")
+            return
+        expect(",")
+
+# First bytes of a journal's header line, ``{"journal":"<random id>"}``
+JOURNAL_HEADER = b'{"journal":'
+
+class StudyStats:
+    """Study history stored as a JSON snapshot plus an append-only journal.
+
+    In journaled mode each new session is appended as one JSON line to
+    ``study_stats.journal`` so recording a quiz costs the same no matter how
+    much history exists.  Every ``COMPACT_EVERY`` sessions the journal is
+    folded back into ``study_stats.json`` and truncated.  A journal starts
+    with a header line naming it, and the snapshot records which journal it
+    has folded and up to which byte, so a crash between writing the
+    snapshot and removing the journal never replays the journal twice.
+
+    Several processes may share the same files.  Every write happens under
+    ``study_stats.lock`` after first catching up on what other processes
+    wrote, so concurrent sessions are merged rather than overwritten.
+
+    History is read lazily on first access to ``data``; recording a session
+    before then only appends to the journal.  With ``retention_days`` set,
+    each snapshot write folds raw sessions older than that into per-day,
+    per-category records under ``archive``; totals, category stats and
+    rollups are counters and are unaffected.
+
+    Sessions from the learner's other devices (see ``StatsSync``) carry
+    ``origin`` and ``seq``; each is applied at most once.
+    """
+
+    COMPACT_EVERY = 50
+    RECENT_SESSIONS = 20  # size of the ring buffer behind "Recent Sessions"
+    DAILY_ROLLUP_DAYS = 90  # daily buckets older than this are dropped
+
+    def __init__(self, stats_file: str = "study_stats.json", journaled: bool = True,
+                 retention_days: Optional[int] = None):
+        self.stats_file = Path(stats_file)
+        self.journal_file = self.stats_file.with_suffix(".journal")
+        self.lock_file = self.stats_file.with_suffix(".lock")
+        # Present once the store syncs with other devices (see StatsSync)
+        self.sync_file = self.stats_file.with_suffix(".sync.json")
+        self.outbox_file = self.stats_file.with_suffix(".outbox")
+        self.journaled = journaled
+        if retention_days is None and os.environ.get("STUDY_QUIZ_RETENTION_DAYS"):
+            retention_days = int(os.environ["STUDY_QUIZ_RETENTION_DAYS"])
+        self.retention_days = retention_days
+        self._data = None
+        self._snapshot_sig = None
+        self._journal_offset = 0
+        self.journal_entries = 0
+    
+    @property
+    def data(self) -> Dict:
+        if self._data is None:
+            with tracer.span("load_stats", file=str(self.stats_file)):
+                self.load_stats()
+        return self._data
+    
+    @data.setter
+    def data(self, value: Dict):
+        self._data = value
+    
+    @staticmethod
+    def empty_stats() -> Dict:
+        return {
+            "total_questions": 0,
+            "correct_answers": 0,
+            "sessions": [],
+            "category_stats": {},
+            "session_count": 0,
+            "recent": [],
+            "rollups": {"daily": {}, "weekly": {}},
+            "archive": [],
+            "synced": {}
+        }
+    
+    @staticmethod
+    def week_key(day) -> str:
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    
+    def load_stats(self):
+        with file_lock(self.lock_file):
+            self._read_from_disk()
+    
+    def read_unlocked(self) -> Dict:
+        """Load ``data`` without taking the lock or creating any file.
+
+        For readers that never write, such as cohort analytics over a
+        read-only collection.  A journal the snapshot has already folded in
+        is replayed only past the snapshot's record of it, like on a locked
+        load.  A compaction that swaps the snapshot after it was opened
+        makes the read start over, so a journal unlinked meanwhile is not
+        missed either.
+        """
+        while True:
+            try:
+                snapshot = open(self.stats_file, 'rb')
+            except FileNotFoundError:
+                snapshot = None
+            with snapshot or nullcontext():
+                try:
+                    with open(self.journal_file, 'rb') as f:
+                        journal = f.read()
+                except FileNotFoundError:
+                    journal = b""
+                current = self._snapshot_signature()
+                if snapshot is None:
+                    if current is not None:
+                        continue
+                    self.data = self.empty_stats()
+                    folded = None
+                else:
+                    if current is None or os.fstat(snapshot.fileno()).st_ino != os.stat(self.stats_file).st_ino:
+                        continue
+                    self.data = json.loads(snapshot.read().decode("utf-8"))
+                    folded = self.data.pop("journal", None)
+                    self._upgrade()
+            self.journal_entries = 0
+            self._replay_journal(journal[self.folded_offset(folded, self.parse_journal_id(journal)):])
+            return self.data
+    
+    def save_stats(self):
+        """Write the full snapshot and clear the journal it now contains."""
+        with file_lock(self.lock_file):
+            self._refresh()
+            self._write_snapshot()
+    
+    def compact(self, retention_days: Optional[int] = None):
+        """Fold the journal into the snapshot, applying the retention policy."""
+        if retention_days is not None:
+            self.retention_days = retention_days
+        self.save_stats()
+    
+    def fold_sessions_before(self, cutoff: str) -> int:
+        """Replace sessions dated before ``cutoff`` (ISO) with per-day, per-category records.
+
+        Returns how many sessions were folded.
+        """
+        sessions = self.data["sessions"]
+        keep = [session for session in sessions if session["date"] >= cutoff]
+        if len(keep) == len(sessions):
+            return 0
+        
+        archive = self.data["archive"]
+        index = {(record["date"], record["category"]): record for record in archive}
+        for session in sessions:
+            if session["date"] >= cutoff:
+                continue
+            key = (session["date"][:10], session["category"])
+            if key not in index:
+                index[key] = {"date": key[0], "category": key[1], "sessions": 0, "score": 0, "total": 0}
+                archive.append(index[key])
+            index[key]["sessions"] += 1
+            index[key]["score"] += session["score"]
+            index[key]["total"] += session["total"]
+        
+        archive.sort(key=lambda record: (record["date"], record["category"]))
+        self.data["sessions"] = keep
+        return len(sessions) - len(keep)
+    
+    def _snapshot_signature(self):
+        try:
+            st = self.stats_file.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+    
+    def _read_from_disk(self):
+        self._snapshot_sig = self._snapshot_signature()
+        if self._snapshot_sig is not None:
+            with open(self.stats_file, 'r') as f:
+                self.data = json.load(f)
+            folded = self.data.pop("journal", None)
+            self._upgrade()
+        else:
+            self.data = self.empty_stats()
+            folded = None
+        
+        self.journal_entries = 0
+        self._journal_offset = self.folded_offset(folded, self._journal_id())
+        self._read_journal()
+    
+    @staticmethod
+    def folded_offset(folded: Optional[Dict], journal_id: Optional[str]) -> int:
+        """Where to start replaying a journal, given the snapshot's record of what it folded."""
+        if folded is not None and journal_id is not None and folded["id"] == journal_id:
+            return folded["offset"]
+        return 0
+    
+    @staticmethod
+    def parse_journal_id(head: bytes) -> Optional[str]:
+        """The id in a journal's header line, given its first bytes; None if it has none."""
+        if not head.startswith(JOURNAL_HEADER):
+            return None
+        try:
+            return json.loads(head.split(b"\n", 1)[0].decode("utf-8"))["journal"]
+        except (ValueError, KeyError):
+            return None
+    
+    def _journal_id(self) -> Optional[str]:
+        try:
+            with open(self.journal_file, 'rb') as f:
+                return self.parse_journal_id(f.readline())
+        except FileNotFoundError:
+            return None
+    
+    def _upgrade(self):
+        """Bring a snapshot written by an older version up to the current shape."""
+        if "rollups" not in self.data:
+            self._rebuild_rollups()
+        # Keys added since older snapshots were written
+        for key, value in self.empty_stats().items():
+            self.data.setdefault(key, value)
+    
+    def _read_journal(self):
+        """Replay journal lines written since ``_journal_offset``."""
+        try:
+            with open(self.journal_file, 'rb') as f:
+                f.seek(self._journal_offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            return
+        
+        self._journal_offset += len(chunk)
+        self._replay_journal(chunk)
+    
+    def _replay_journal(self, chunk: bytes):
+        for line in chunk.split(b"\n"):
+            if not line.strip() or line.startswith(JOURNAL_HEADER):
+                continue
+            try:
+                session = json.loads(line.decode("utf-8"))
+            except ValueError:
+                # A torn line left behind by a process killed mid-write
+                continue
+            self._apply_session(session)
+            self.journal_entries += 1
+    
+    def _refresh(self):
+        """Catch up with writes made by other processes.  Caller holds the lock."""
+        if self._data is None or self._snapshot_signature() != self._snapshot_sig:
+            # Nothing read yet; ``data`` would try to take the lock we hold
+            self._read_from_disk()
+            return
+        
+        try:
+            journal_size = self.journal_file.stat().st_size
+        except FileNotFoundError:
+            journal_size = 0
+        if journal_size < self._journal_offset:
+            self._read_from_disk()
+        else:
+            self._read_journal()
+    
+    def _write_snapshot(self):
+        if self.retention_days is not None:
+            cutoff = (datetime.now() - timedelta(days=self.retention_days)).isoformat()
+            self.fold_sessions_before(cutoff)
+        snapshot = self.data
+        folded = self._journal_id()
+        if folded is not None:
+            # Everything read from this journal is in the snapshot; if we die
+            # before unlinking it, loading resumes after this offset
+            snapshot = dict(self.data, journal={"id": folded, "offset": self._journal_offset})
+        atomic_write_json(self.stats_file, snapshot, indent=2)
+        if self.journal_file.exists():
+            self.journal_file.unlink()
+        self._snapshot_sig = self._snapshot_signature()
+        self._journal_offset = 0
+        self.journal_entries = 0
+    
+    def recent_weeks(self, weeks: int = 4) -> List[Tuple[str, Dict]]:
+        """``(week_key, {category: counts})`` for the last ``weeks`` weeks, oldest first."""
+        today = datetime.now()
+        keys = [self.week_key(today - timedelta(weeks=offset)) for offset in range(weeks - 1, -1, -1)]
+        weekly = self.data["rollups"]["weekly"]
+        return [(key, weekly.get(key, {})) for key in keys]
+    
+    def iter_sessions(self, since: Optional[str] = None, until: Optional[str] = None,
+                      categories: Optional[List[str]] = None):
+        """Stream session rows straight from disk, without loading the history.
+
+        Rows look like sessions plus a ``sessions`` count: 1 for a session,
+        more for a day folded into the archive by the retention policy.
+        ``since`` and ``until`` are inclusive ``YYYY-MM-DD`` dates.  Rows
+        come in file order: snapshot sessions, archived days, then the journal,
+        whose synced records are deduplicated and shaped as on a full load.
+        """
+        def wanted(row):
+            day = row["date"][:10]
+            return ((since is None or day >= since) and (until is None or day <= until)
+                    and (categories is None or row["category"] in categories))
+        
+        def archived(record):
+            row = {key: record[key] for key in ("date", "category", "sessions", "score", "total")}
+            row["percentage"] = round(row["score"] / row["total"] * 100, 1) if row["total"] else 0.0
+            return row
+        
+        # Open both files together so a concurrent compaction can't make us
+        # miss the journal or read its sessions twice
+        with file_lock(self.lock_file):
+            snapshot = open(self.stats_file, 'r', encoding='utf-8') if self.stats_file.exists() else None
+            journal = open(self.journal_file, 'rb') if self.journal_file.exists() else None
+        try:
+            folded, synced = None, {}
+            if snapshot is not None:
+                for key, record in iter_json_members(snapshot, streamed=("sessions", "archive")):
+                    if key == "sessions" and wanted(record):
+                        yield dict(record, sessions=1)
+                    elif key == "archive" and wanted(record):
+                        yield archived(record)
+                    elif key == "journal":
+                        folded = record
+                    elif key == "synced":
+                        synced = dict(record)
+            if journal is not None:
+                journal.seek(self.folded_offset(folded, self.parse_journal_id(journal.readline())))
+                for line in journal:
+                    if line.startswith(JOURNAL_HEADER):
+                        continue
+                    try:
+                        session = json.loads(line.decode("utf-8"))
+                    except ValueError:
+                        continue
+                    if "origin" in session:
+                        # The same (origin, seq) watermark _apply_session keeps
+                        if session["seq"] <= synced.get(session["origin"], 0):
+                            continue
+                        synced[session["origin"]] = session["seq"]
+                        if "sessions" in session:
+                            if wanted(session):
+                                yield archived(session)
+                            continue
+                    if wanted(session):
+                        yield dict(session, sessions=1)
+        finally:
+            for f in (snapshot, journal):
+                if f is not None:
+                    f.close()
+    
+    def _rebuild_rollups(self):
+        """Derive rollups for a snapshot written before they existed.
+
+        Only the session count, recent list and rollups are rebuilt; the
+        stored totals and category stats are already right and left alone.
+        """
+        fresh = self.empty_stats()
+        self.data.update(session_count=0, recent=fresh["recent"], rollups=fresh["rollups"])
+        for session in self.data["sessions"]:
+            self._apply_rollups(session)
+    
+    def _apply_session(self, session: Dict):
+        if "origin" in session:
+            # From another device: apply each (origin, seq) once, however often it arrives
+            synced = self.data["synced"]
+            if session["seq"] <= synced.get(session["origin"], 0):
+                return
+            synced[session["origin"]] = session["seq"]
+            if "sessions" in session:
+                self._apply_archived(session)
+                return
+        
+        category = session["category"]
+        self.data["sessions"].append(session)
+        self.data["total_questions"] += session["total"]
+        self.data["correct_answers"] += session["score"]
+        
+        if category not in self.data["category_stats"]:
+            self.data["category_stats"][category] = {"correct": 0, "total": 0}
+        
+        self.data["category_stats"][category]["correct"] += session["score"]
+        self.data["category_stats"][category]["total"] += session["total"]
+        self._apply_rollups(session)
+    
+    def _apply_archived(self, record: Dict):
+        """Count a day that was folded into an archive elsewhere: on another device, or in a migrated store."""
+        self.data["archive"].append({key: record[key] for key in ("date", "category", "sessions", "score", "total")})
+        self.data["total_questions"] += record["total"]
+        self.data["correct_answers"] += record["score"]
+        self.data["session_count"] += record["sessions"]
+        counts = self.data["category_stats"].setdefault(record["category"], {"correct": 0, "total": 0})
+        counts["correct"] += record["score"]
+        counts["total"] += record["total"]
+        self._count_in_rollups(datetime.fromisoformat(record["date"]), record["category"],
+                               record["score"], record["total"], record["sessions"])
+    
+    def _apply_rollups(self, session: Dict):
+        """Fold one session into the counters the statistics screen reads.
+
+        Everything here is bounded work per session, so the statistics
+        screen and trend views never need to walk the session list.
+        """
+        when = datetime.fromisoformat(session["date"])
+        self.data["session_count"] += 1
+        
+        recent = self.data["recent"]
+        recent.append({
+            "date": when.strftime("%Y-%m-%d %H:%M"),
+            "category": session["category"],
+            "score": session["score"],
+            "total": session["total"],
+            "percentage": session["percentage"]
+        })
+        if len(recent) > 1 and recent[-2]["date"] > recent[-1]["date"]:
+            # An older session synced from another device
+            recent.sort(key=lambda entry: entry["date"])
+        if len(recent) > self.RECENT_SESSIONS:
+            del recent[0]
+        
+        self._count_in_rollups(when, session["category"], session["score"], session["total"])
+    
+    def _count_in_rollups(self, when: datetime, category: str, score: int, total: int, sessions: int = 1):
+        daily = self.data["rollups"]["daily"]
+        day = when.strftime("%Y-%m-%d")
+        if day not in daily:
+            # ISO dates sort as strings; this runs once per new day, over at most DAILY_ROLLUP_DAYS keys
+            newest = max(max(daily, default=day), day)
+            cutoff = (datetime.strptime(newest, "%Y-%m-%d") - timedelta(days=self.DAILY_ROLLUP_DAYS)).strftime("%Y-%m-%d")
+            for old in [d for d in daily if d < cutoff]:
+                del daily[old]
+            if day >= cutoff:
+                daily[day] = {}
+        
+        for bucket in (daily.get(day), self.data["rollups"]["weekly"].setdefault(self.week_key(when), {})):
+            if bucket is None:
+                # Older than the daily window; only the weekly bucket keeps it
+                continue
+            counts = bucket.setdefault(category, {"correct": 0, "total": 0, "sessions": 0})
+            counts["correct"] += score
+            counts["total"] += total
+            counts["sessions"] += sessions
+    
+    def _journal_line_count(self) -> int:
+        # Bounded by COMPACT_EVERY lines, since reaching it triggers compaction
+        with open(self.journal_file, 'rb') as f:
+            chunk = f.read()
+        return chunk.count(b"\n") - chunk.startswith(JOURNAL_HEADER)
+    
+    def _append_journal(self, sessions: List[Dict]):
+        line = "".join(json.dumps(session, separators=(",", ":")) + "\n" for session in sessions).encode("utf-8")
+        if not self.journal_file.exists():
+            line = JOURNAL_HEADER + json.dumps(os.urandom(8).hex()).encode("utf-8") + b"}\n" + line
+        self._journal_offset = append_lines(self.journal_file, line)
+        self.journal_entries += len(sessions)
+    
+    @staticmethod
+    def new_session(category: str, score: int, total: int, answers: Optional[List[Dict]] = None) -> Dict:
+        session = {
+            "date": datetime.now().isoformat(),
+            "category": category,
+            "score": score,
+            "total": total,
+            "percentage": round((score / total) * 100, 1)
+        }
+        if answers and any(a.get("latency_ms") is not None for a in answers):
+            # Response time per question, in answer order; None where it wasn't measured
+            session["latency_ms"] = [a.get("latency_ms") for a in answers]
+        return session
+    
+    def add_session(self, category: str, score: int, total: int, answers: Optional[List[Dict]] = None):
+        """Record a finished quiz.
+
+        ``answers`` holds per-question records (see ``QuizEngine.submit_answer``);
+        the JSON store keeps only their response times, on the session.
+        """
+        self.add_sessions([self.new_session(category, score, total, answers)], [answers])
+    
+    def add_sessions(self, sessions: List[Dict], answers: Optional[List[Optional[List[Dict]]]] = None):
+        """Record many finished sessions (dicts shaped like ``new_session``) in one write."""
+        if not sessions:
+            return
+        
+        with file_lock(self.lock_file):
+            self._store_sessions(sessions)
+            if self.sync_file.exists():
+                # Queue this device's sessions for the others; ones imported from them aren't sent back
+                self._queue_for_sync([session for session in sessions if "origin" not in session])
+    
+    def _store_sessions(self, sessions: List[Dict]):
+        """Caller holds the lock."""
+        if self._data is None and self.journaled:
+            # Nothing has read the history yet, so don't load it just to append
+            self._append_journal(sessions)
+            if self._journal_line_count() >= self.COMPACT_EVERY:
+                self._read_from_disk()
+                self._write_snapshot()
+            return
+        
+        self._refresh()
+        for session in sessions:
+            self._apply_session(session)
+        
+        if not self.journaled:
+            self._write_snapshot()
+            return
+        
+        self._append_journal(sessions)
+        if self.journal_entries >= self.COMPACT_EVERY:
+            self._write_snapshot()
+    
+    def _queue_for_sync(self, sessions: List[Dict]):
+        """Append sessions to the outbox, numbered on from the last one queued or sent."""
+        if not sessions:
+            return
+        with open(self.sync_file, 'r', encoding='utf-8') as f:
+            seq = max(json.load(f)["sent"], self._last_queued_seq())
+        payload = "".join(
+            json.dumps(dict(session, seq=seq + n), separators=(",", ":")) + "\n"
+            for n, session in enumerate(sessions, 1)
+        ).encode("utf-8")
+        append_lines(self.outbox_file, payload)
+    
+    def _last_queued_seq(self) -> int:
+        try:
+            with open(self.outbox_file, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - (1 << 16)))
+                tail = f.read()
+        except FileNotFoundError:
+            return 0
+        for line in reversed(tail.split(b"\n")):
+            try:
+                return json.loads(line.decode("utf-8"))["seq"]
+            except (ValueError, KeyError, TypeError):
+                # Blank, torn, or cut off by the start of the tail
+                continue
+        return 0
+
+class SQLiteStudyStats(StudyStats):
+    """StudyStats backed by SQLite, with every individual answer on record.
+
+    Sessions and answers live in indexed tables, so per-question questions
+    such as "my weakest 20 questions" or "accuracy over the last 30 days"
+    are answered by the database instead of by walking the session list.
+    ``data`` is rebuilt from the sessions table and has the same shape as
+    the JSON store's, so the rest of the app does not care which is in use.
+    Days a JSON store had already folded into its archive are migrated to
+    the archive table as they are: one aggregate row per day and category.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id INTEGER PRIMARY KEY,
+            date TEXT NOT NULL,
+            category TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            total INTEGER NOT NULL,
+            percentage REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS answers (
+            id INTEGER PRIMARY KEY,
+            session_id INTEGER NOT NULL REFERENCES sessions(id),
+            category TEXT NOT NULL,
+            question_id TEXT NOT NULL,
+            chosen INTEGER NOT NULL,
+            correct INTEGER NOT NULL,
+            answered_at TEXT NOT NULL,
+            latency_ms INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS archive (
+            date TEXT NOT NULL,
+            category TEXT NOT NULL,
+            sessions INTEGER NOT NULL,
+            score INTEGER NOT NULL,
+            total INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_sessions_category ON sessions(category);
+        CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions(date);
+        CREATE INDEX IF NOT EXISTS idx_answers_question ON answers(question_id, category, correct);
+        CREATE INDEX IF NOT EXISTS idx_answers_category ON answers(category, answered_at);
+        CREATE INDEX IF NOT EXISTS idx_answers_time ON answers(answered_at);
+    """
+
+    def __init__(self, stats_file: str = "study_stats.db"):
+        import sqlite3
+        
+        self.stats_file = Path(stats_file)
+        # QuizApp may load the history on its preload thread
+        self.db = sqlite3.connect(str(self.stats_file), timeout=30, check_same_thread=False)
+        self.db.executescript(self.SCHEMA)
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(answers)")}
+        if "latency_ms" not in columns:
+            # Stores created before response times were recorded
+            with self.db:
+                self.db.execute("ALTER TABLE answers ADD COLUMN latency_ms INTEGER")
+        self._data = None
+    
+    def load_stats(self):
+        self.data = self.empty_stats()
+        archived = self.db.execute("SELECT date, category, sessions, score, total FROM archive ORDER BY rowid")
+        for date, category, sessions, score, total in archived:
+            self._apply_archived({"date": date, "category": category, "sessions": sessions,
+                                  "score": score, "total": total})
+        rows = self.db.execute("SELECT date, category, score, total, percentage FROM sessions ORDER BY id")
+        for date, category, score, total, percentage in rows:
+            self._apply_session({
+                "date": date,
+                "category": category,
+                "score": score,
+                "total": total,
+                "percentage": percentage
+            })
+    
+    def save_stats(self):
+        self.db.commit()
+    
+    def compact(self, retention_days: Optional[int] = None):
+        # Raw rows are what the indexes serve, so nothing is folded here
+        self.db.execute("VACUUM")
+    
+    def _insert_session(self, session: Dict, answers: Optional[List[Dict]] = None):
+        cursor = self.db.execute(
+            "INSERT INTO sessions (date, category, score, total, percentage) VALUES (?, ?, ?, ?, ?)",
+            (session["date"], session["category"], session["score"], session["total"], session["percentage"])
+        )
+        if answers:
+            self.db.executemany(
+                "INSERT INTO answers (session_id, category, question_id, chosen, correct, answered_at, latency_ms) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (cursor.lastrowid, a["category"], a["question_id"], a["chosen"], int(a["correct"]),
+                     a["answered_at"], a.get("latency_ms"))
+                    for a in answers
+                ]
+            )
+    
+    def add_sessions(self, sessions: List[Dict], answers: Optional[List[Optional[List[Dict]]]] = None):
+        answers = answers or [None] * len(sessions)
+        with self.db:
+            for session, session_answers in zip(sessions, answers):
+                self._insert_session(session, session_answers)
+        if self._data is not None:
+            for session in sessions:
+                self._apply_session(session)
+    
+    def weakest_questions(self, limit: int = 20, min_attempts: int = 1) -> List[Dict]:
+        """Questions with the lowest accuracy, most-attempted first among ties."""
+        rows = self.db.execute(
+            """
+            SELECT question_id, category, COUNT(*) AS attempts, SUM(correct) AS right
+            FROM answers
+            GROUP BY question_id, category
+            HAVING attempts >= ?
+            ORDER BY CAST(right AS REAL) / attempts, attempts DESC
+            LIMIT ?
+            """,
+            (min_attempts, limit)
+        )
+        return [
+            {"question_id": qid, "category": category, "attempts": attempts, "correct": right,
+             "accuracy": round(right / attempts * 100, 1)}
+            for qid, category, attempts, right in rows
         ]
+    
+    def accuracy_since(self, days: int = 30, category: Optional[str] = None) -> Optional[float]:
+        """Percentage of answers correct in the last ``days`` days, or None if there were none."""
+        since = (datetime.now() - timedelta(days=days)).isoformat()
+        if category is None:
+            row = self.db.execute(
+                "SELECT COUNT(*), SUM(correct) FROM answers WHERE answered_at >= ?", (since,)
+            ).fetchone()
+        else:
+            row = self.db.execute(
+                "SELECT COUNT(*), SUM(correct) FROM answers WHERE category = ? AND answered_at >= ?",
+                (category, since)
+            ).fetchone()
+        answered, right = row
+        return round(right / answered * 100, 1) if answered else None
+    
+    def iter_sessions(self, since: Optional[str] = None, until: Optional[str] = None,
+                      categories: Optional[List[str]] = None):
+        where = " WHERE 1 = 1"
+        params = []
+        if since is not None:
+            where += " AND date >= ?"
+            params.append(since)
+        if until is not None:
+            # Dates are ISO timestamps; anything on the ``until`` day sorts below its next character
+            where += " AND date < ?"
+            params.append(until + "~")
+        if categories is not None:
+            where += f" AND category IN ({', '.join('?' * len(categories))})"
+            params.extend(categories)
+        archived = self.db.execute(
+            "SELECT date, category, sessions, score, total FROM archive" + where + " ORDER BY rowid", params)
+        for date, category, sessions, score, total in archived:
+            yield {"date": date, "category": category, "score": score, "total": total,
+                   "percentage": round(score / total * 100, 1) if total else 0.0, "sessions": sessions}
+        rows = self.db.execute(
+            "SELECT date, category, score, total, percentage FROM sessions" + where + " ORDER BY id", params)
+        for date, category, score, total, percentage in rows:
+            yield {"date": date, "category": category, "score": score, "total": total,
+                   "percentage": percentage, "sessions": 1}
+    
+    def answer_rows(self):
+        """Every recorded answer as ``(session_id, question_id, correct)``."""
+        return self.db.execute("SELECT session_id, question_id, correct FROM answers")
+    
+    def migrate_from_json(self, json_file: str) -> Tuple[int, int]:
+        """One-shot import of a JSON store's sessions and archived days.
+
+        Returns how many sessions and how many archive rows were imported.
+        """
+        if self.data["sessions"] or self.data["archive"]:
+            raise ValueError(f"{self.stats_file} already has sessions; refusing to migrate twice")
+        
+        source = StudyStats(json_file).data
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO archive (date, category, sessions, score, total) VALUES (?, ?, ?, ?, ?)",
+                [(r["date"], r["category"], r["sessions"], r["score"], r["total"]) for r in source["archive"]]
+            )
+            for session in source["sessions"]:
+                self._insert_session(session)
+        self.load_stats()
+        return len(source["sessions"]), len(source["archive"])
+
+def open_stats(backend: Optional[str] = None, stats_file: Optional[str] = None) -> StudyStats:
+    """Open the stats store for ``backend`` ("json" or "sqlite")."""
+    backend = backend or os.environ.get("STUDY_QUIZ_BACKEND") or "json"
+    if backend == "sqlite":
+        return SQLiteStudyStats(stats_file or "study_stats.db")
+    if backend == "json":
+        return StudyStats(stats_file or "study_stats.json")
+    raise ValueError(f"Unknown stats backend: {backend}")
+
+class StatsSync:
+    """Exchange new sessions between one learner's devices through a shared directory.
+
+    A session is an increment to every counter (totals, category stats,
+    rollups), so a device that applies each other device's sessions exactly
+    once ends up with the same counters as they do, whatever order they
+    sync in.  Each device numbers the sessions it records (``seq``); its
+    store keeps, under ``synced``, the highest number it has applied from
+    every other device and skips anything at or below it.
+
+    ``study_stats.sync.json`` holds this device's name, the directory, how
+    many sessions it has sent and how far it has read every other device;
+    sessions recorded since the last push wait in ``study_stats.outbox``.
+    ``push`` writes them as one delta file,
+    ``<sync_dir>/<device>/<first>-<last>.jsonl``, and ``pull`` reads only
+    other devices' files past its watermark, so a sync moves what was
+    studied since the last one, not the whole history.  The first sync
+    sends the existing history once.
+    """
+
+    DELTA = re.compile(r"(\d+)-(\d+)\.jsonl")
+
+    def __init__(self, stats: StudyStats):
+        if isinstance(stats, SQLiteStudyStats):
+            raise ValueError("Sync works with the JSON stats store")
+        self.stats = stats
+    
+    @property
+    def enrolled(self) -> bool:
+        return self.stats.sync_file.exists()
+    
+    @property
+    def state(self) -> Dict:
+        with open(self.stats.sync_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    @property
+    def device(self) -> str:
+        return self.state["device"]
+    
+    def enroll(self, sync_dir: str, device: Optional[str] = None) -> int:
+        """Start syncing this store, queueing its history so far; return how many records were queued."""
+        import socket
+        
+        device = re.sub(r"[^\w.-]+", "_", device or f"{socket.gethostname()}-{os.urandom(3).hex()}")
+        stats = self.stats
+        with file_lock(stats.lock_file):
+            stats._read_from_disk()
+            history = [session for session in stats.data["sessions"] if "origin" not in session]
+            # Days already folded away travel as they are
+            history += [dict(record) for record in stats.data["archive"]]
+            atomic_write_bytes(stats.outbox_file, "".join(
+                json.dumps(dict(record, seq=seq), separators=(",", ":")) + "\n"
+                for seq, record in enumerate(history, 1)
+            ).encode("utf-8"))
+            atomic_write_json(stats.sync_file, {"device": device, "sync_dir": str(sync_dir), "sent": 0}, indent=2)
+        return len(history)
+    
+    def move(self, sync_dir: str):
+        """Use ``sync_dir`` from now on, e.g. after the shared folder was moved."""
+        with file_lock(self.stats.lock_file):
+            atomic_write_json(self.stats.sync_file, dict(self.state, sync_dir=str(sync_dir)), indent=2)
+    
+    def push(self) -> int:
+        """Write queued sessions to this device's folder as one delta; return how many."""
+        stats = self.stats
+        with file_lock(stats.lock_file):
+            state = self.state
+            queued = []
+            if stats.outbox_file.exists():
+                with open(stats.outbox_file, 'rb') as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line.decode("utf-8"))
+                        except ValueError:
+                            continue
+                        # A crash after the last push may have left sent ones behind
+                        if record["seq"] > state["sent"]:
+                            queued.append(dict(record, origin=state["device"]))
+            if queued:
+                folder = Path(state["sync_dir"]) / state["device"]
+                folder.mkdir(parents=True, exist_ok=True)
+                first, last = state["sent"] + 1, queued[-1]["seq"]
+                atomic_write_bytes(folder / f"{first:010d}-{last:010d}.jsonl", "".join(
+                    json.dumps(record, separators=(",", ":")) + "\n" for record in queued
+                ).encode("utf-8"))
+                atomic_write_json(stats.sync_file, dict(state, sent=last), indent=2)
+            if stats.outbox_file.exists():
+                stats.outbox_file.unlink()
+        return len(queued)
+    
+    def deltas(self, folder: Path) -> List[Tuple[int, int, Path]]:
+        """``(first, last, path)`` for each delta file in one device's folder, in order."""
+        found = []
+        for path in folder.iterdir():
+            match = self.DELTA.fullmatch(path.name)
+            if match:
+                found.append((int(match.group(1)), int(match.group(2)), path))
+        return sorted(found)
+    
+    def pull(self) -> Dict[str, int]:
+        """Apply other devices' sessions not seen yet; return how many came from each."""
+        stats = self.stats
+        state = self.state
+        sync_dir = Path(state["sync_dir"])
+        # How far each device has been read.  This is written after the store,
+        # so it can only lag what the store has applied, and the store skips
+        # anything it already has; the history itself is never loaded
+        read_up_to = dict(state.get("received", {}))
+        incoming, received = [], {}
+        folders = sorted(sync_dir.iterdir()) if sync_dir.is_dir() else []
+        for folder in folders:
+            if not folder.is_dir() or folder.name == state["device"]:
+                continue
+            seen = read_up_to.get(folder.name, 0)
+            for first, last, path in self.deltas(folder):
+                if last <= seen:
+                    continue
+                if first > seen + 1:
+                    # An earlier delta hasn't arrived yet (a folder still copying);
+                    # applying past the gap would skip it for good
+                    break
+                with open(path, 'rb') as f:
+                    for line in f:
+                        record = json.loads(line.decode("utf-8"))
+                        if record["seq"] > seen:
+                            incoming.append(record)
+                            seen = record["seq"]
+                            received[folder.name] = received.get(folder.name, 0) + 1
+            read_up_to[folder.name] = seen
+        if incoming:
+            stats.add_sessions(incoming)
+            with file_lock(stats.lock_file):
+                latest = self.state
+                merged = dict(latest.get("received", {}))
+                for device, seq in read_up_to.items():
+                    merged[device] = max(merged.get(device, 0), seq)
+                atomic_write_json(stats.sync_file, dict(latest, received=merged), indent=2)
+        return received
+    
+    def sync(self) -> Tuple[int, Dict[str, int]]:
+        """Push, then pull."""
+        return self.push(), self.pull()
+
+SESSION_COLUMNS = ("date", "category", "score", "total", "percentage", "sessions")
+CATEGORY_COLUMNS = ("category", "sessions", "correct", "total", "accuracy")
+EXPORT_FORMATS = ("csv", "jsonl", "parquet", "arrow")
+
+def category_rows(session_rows) -> List[Dict]:
+    """Per-category totals over a stream of session rows."""
+    totals = {}
+    for row in session_rows:
+        counts = totals.setdefault(row["category"], [0, 0, 0])
+        counts[0] += row["sessions"]
+        counts[1] += row["score"]
+        counts[2] += row["total"]
+    return [
+        {"category": category, "sessions": sessions, "correct": correct, "total": total,
+         "accuracy": round(correct / total * 100, 1) if total else 0.0}
+        for category, (sessions, correct, total) in sorted(totals.items())
+    ]
+
+def write_rows(rows, columns: Tuple[str, ...], fmt: str, out, batch_size: int = 10000) -> int:
+    """Write dict rows to ``out`` (a path, or a text stream for csv/jsonl) as they arrive.
+
+    Parquet and Arrow need pyarrow and are written in record batches of
+    ``batch_size`` rows, so only one batch is ever held in memory.
+    Returns the number of rows written.
+    """
+    written = 0
+    if fmt in ("csv", "jsonl"):
+        f = open(out, 'w', encoding='utf-8', newline='') if isinstance(out, (str, Path)) else out
+        try:
+            if fmt == "csv":
+                import csv
+                
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                for row in rows:
+                    writer.writerow([row.get(column) for column in columns])
+                    written += 1
+            else:
+                for row in rows:
+                    f.write(json.dumps({column: row.get(column) for column in columns}, ensure_ascii=False) + "\n")
+                    written += 1
+        finally:
+            if f is not out:
+                f.close()
+        return written
+    
+    import pyarrow as pa
+    
+    types = {"date": pa.string(), "category": pa.string(), "percentage": pa.float64(), "accuracy": pa.float64()}
+    schema = pa.schema([(column, types.get(column, pa.int64())) for column in columns])
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        
+        writer = pq.ParquetWriter(str(out), schema)
+    else:
+        writer = pa.ipc.new_file(str(out), schema)
+    try:
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            written += len(batch)
+    finally:
+        writer.close()
+    return written
+
+class ReviewScheduler:
+    """SM-2 spaced-repetition state for individual questions.
+
+    Each reviewed question keeps an easiness factor, a repetition count, an
+    interval in days and the time it is next due.  Due times sit in a heap,
+    so fetching the next due question is O(log n) however many questions
+    have been reviewed.  Updated items are pushed again and their old heap
+    entries are skipped when they surface.
+
+    A forgotten question leaves a tombstone with the time it was forgotten,
+    so ``save`` does not bring it back from another process's copy of the
+    file; reviewing the question again later outranks the tombstone.
+    """
+
+    DAY = 24 * 60 * 60
+    LAPSE_DELAY = 10 * 60  # a missed question comes back after ten minutes
+
+    def __init__(self, state_file: str = "study_review.json"):
+        self.state_file = Path(state_file)
+        self.lock_file = self.state_file.with_suffix(".lock")
+        self.items, self.forgotten = self._read_state()
+        self._heap = [(item["due"], qid) for qid, item in self.items.items()]
+        heapq.heapify(self._heap)
+    
+    def _read_state(self) -> Tuple[Dict[str, Dict], Dict[str, float]]:
+        if not self.state_file.exists():
+            return {}, {}
+        with open(self.state_file, 'r') as f:
+            state = json.load(f)
+        return state["items"], state.get("forgotten", {})
+    
+    def save(self):
+        with file_lock(self.lock_file):
+            # Keep whichever review of each question happened last, and the latest forget
+            merged, forgotten = self._read_state()
+            for qid, item in self.items.items():
+                if qid not in merged or merged[qid]["reviewed"] <= item["reviewed"]:
+                    merged[qid] = item
+            for qid, when in self.forgotten.items():
+                forgotten[qid] = max(when, forgotten.get(qid, when))
+            for qid, when in list(forgotten.items()):
+                if qid in merged and merged[qid]["reviewed"] > when:
+                    # Reviewed again since; the tombstone has done its job
+                    del forgotten[qid]
+                else:
+                    merged.pop(qid, None)
+            atomic_write_json(self.state_file, {"items": merged, "forgotten": forgotten})
+    
+    def pop_due(self, now: Optional[float] = None) -> Optional[Tuple[str, str]]:
+        """Remove and return ``(question_id, category_key)`` of the most overdue question."""
+        now = time.time() if now is None else now
+        while self._heap:
+            due, qid = self._heap[0]
+            item = self.items.get(qid)
+            if item is None or item["due"] != due:
+                heapq.heappop(self._heap)
+                continue
+            if due > now:
+                return None
+            heapq.heappop(self._heap)
+            return qid, item["category"]
+        return None
+    
+    def forget(self, qid: str, now: Optional[float] = None):
+        """Stop scheduling ``qid``, here and, from the next ``save``, in the file."""
+        self.items.pop(qid, None)
+        self.forgotten[qid] = time.time() if now is None else now
+    
+    def record(self, qid: str, category_key: str, correct: bool, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        item = self.items.get(qid) or {"category": category_key, "ef": 2.5, "reps": 0, "interval": 0}
+        
+        # SM-2 with a pass/fail grade: 4 for a correct answer, 1 for a miss
+        quality = 4 if correct else 1
+        if correct:
+            if item["reps"] == 0:
+                item["interval"] = 1
+            elif item["reps"] == 1:
+                item["interval"] = 6
+            else:
+                item["interval"] = round(item["interval"] * item["ef"])
+            item["reps"] += 1
+            item["due"] = now + item["interval"] * self.DAY
+        else:
+            item["reps"] = 0
+            item["interval"] = 0
+            item["due"] = now + self.LAPSE_DELAY
+        item["ef"] = max(1.3, item["ef"] + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+        item["category"] = category_key
+        item["reviewed"] = now
+        
+        self.items[qid] = item
+        heapq.heappush(self._heap, (item["due"], qid))
+
+NUMPY_MISSING = "This feature needs NumPy. Install it with: pip install numpy"
+
+def fit_2pl(persons, items, correct, iterations: int = 200, tolerance: float = 1e-4):
+    """Fit a two-parameter logistic IRT model to a set of answers.
+
+    ``persons``, ``items`` and ``correct`` are parallel sequences: answer
+    ``k`` was given by person ``persons[k]`` (a small int) to item
+    ``items[k]`` and was right if ``correct[k]``.  Returns NumPy arrays
+    ``(theta, a, b)``: ability per person, and discrimination and difficulty
+    per item, where ``P(correct) = 1 / (1 + exp(-a * (theta - b)))``.
+
+    Each iteration takes one diagonal Newton step for every ability, then
+    every difficulty, then every log-discrimination, with all answers
+    handled at once through ``bincount``.  Weak normal priors keep
+    parameters of sparsely answered items finite.
+    """
+    import numpy as np
+    
+    persons = np.asarray(persons, dtype=np.intp)
+    items = np.asarray(items, dtype=np.intp)
+    y = np.asarray(correct, dtype=float)
+    n_persons, n_items = persons.max() + 1, items.max() + 1
+    theta = np.zeros(n_persons)
+    b = np.zeros(n_items)
+    log_a = np.zeros(n_items)
+    
+    def residuals():
+        a = np.exp(log_a)[items]
+        z = a * (theta[persons] - b[items])
+        p = 1 / (1 + np.exp(-z))
+        return a, z, y - p, p * (1 - p)
+    
+    for _ in range(iterations):
+        # Priors: theta ~ N(0, 1), b ~ N(0, 2^2), log a ~ N(0, 0.5^2)
+        a, z, r, w = residuals()
+        step_theta = ((np.bincount(persons, a * r, n_persons) - theta)
+                      / (np.bincount(persons, a * a * w, n_persons) + 1))
+        theta += step_theta
+        
+        a, z, r, w = residuals()
+        step_b = ((np.bincount(items, -a * r, n_items) - b / 4)
+                  / (np.bincount(items, a * a * w, n_items) + 1 / 4))
+        b += step_b
+        
+        a, z, r, w = residuals()
+        step_a = np.clip((np.bincount(items, z * r, n_items) - log_a * 4)
+                         / (np.bincount(items, z * z * w, n_items) + 4), -0.5, 0.5)
+        log_a += step_a
+        
+        if max(abs(step_theta).max(), abs(step_b).max(), abs(step_a).max()) < tolerance:
+            break
+    
+    # Abilities are only defined up to a linear transform; pin them to mean 0, SD 1
+    # once the fit has converged.  Rescaling every iteration would undo the
+    # priors' shrinkage each time and let the fit drift to extreme parameters
+    mean, sd = theta.mean(), theta.std() or 1.0
+    theta = (theta - mean) / sd
+    b = (b - mean) / sd
+    log_a += np.log(sd)
+    return theta, np.exp(log_a), b
+
+def calibrate_bank(bank: QuestionBank, stores: List[str]) -> Dict:
+    """Fit 2PL parameters from the answers in SQLite ``stores`` and save them with the bank.
+
+    Every quiz session counts as one person, so a single learner's history
+    calibrates too.  Returns a summary of what was fitted.
+    """
+    sessions, qids, persons, items, correct = {}, {}, [], [], []
+    for store in stores:
+        for session_id, qid, right in SQLiteStudyStats(store).answer_rows():
+            persons.append(sessions.setdefault((store, session_id), len(sessions)))
+            items.append(qids.setdefault(qid, len(qids)))
+            correct.append(right)
+    if not correct:
+        raise ValueError("no recorded answers to calibrate from")
+    
+    import numpy as np
+    
+    theta, a, b = fit_2pl(persons, items, correct)
+    counts = np.bincount(items)
+    atomic_write_json(bank.bank_dir / bank.CALIBRATION, {
+        "model": "2pl",
+        "fitted": datetime.now().isoformat(),
+        "answers": len(correct),
+        "sessions": len(sessions),
+        "items": {
+            qid: {"a": round(float(a[i]), 4), "b": round(float(b[i]), 4), "answers": int(counts[i])}
+            for qid, i in qids.items()
+        }
+    }, indent=1)
+    return {"answers": len(correct), "sessions": len(sessions), "items": len(qids)}
+
+class AdaptiveTest:
+    """Pick each next question where it tells the most about the learner.
+
+    Ability is tracked as a posterior over a grid of values, starting from a
+    standard normal prior.  The next question is the unasked one with the
+    highest 2PL Fisher information ``a^2 p (1 - p)`` at the current ability
+    estimate, and the test stops once the estimate is precise enough
+    (standard error ``target_se``) or ``max_questions`` have been asked.
+    Questions missing from ``params`` use ``a = 1, b = 0``.
+    """
+
+    def __init__(self, items: List[Tuple[str, Question]], params: Dict[str, Tuple[float, float]],
+                 min_questions: int = 5, max_questions: int = 20, target_se: float = 0.3):
+        import numpy as np
+        
+        self.items = items
+        self.min_questions = min_questions
+        self.max_questions = max_questions
+        self.target_se = target_se
+        fitted = [params.get(question_id(question), (1.0, 0.0)) for _, question in items]
+        self.a = np.array([a for a, _ in fitted])
+        self.b = np.array([b for _, b in fitted])
+        # A tiny random offset breaks ties between uncalibrated questions
+        self.b += np.random.uniform(-1e-6, 1e-6, len(items))
+        self.asked = np.zeros(len(items), dtype=bool)
+        self.grid = np.linspace(-4, 4, 81)
+        self.log_posterior = -self.grid ** 2 / 2
+        self.answered = 0
+        self._last = None
+    
+    def _posterior(self):
+        import numpy as np
+        
+        weights = np.exp(self.log_posterior - self.log_posterior.max())
+        return weights / weights.sum()
+    
+    @property
+    def theta(self) -> float:
+        return float(self._posterior() @ self.grid)
+    
+    @property
+    def se(self) -> float:
+        posterior = self._posterior()
+        mean = posterior @ self.grid
+        return float((posterior @ (self.grid - mean) ** 2) ** 0.5)
+    
+    @property
+    def done(self) -> bool:
+        if self.answered >= self.max_questions or self.asked.all():
+            return True
+        return self.answered >= self.min_questions and self.se <= self.target_se
+    
+    def next_question(self) -> Optional[Tuple[str, Question]]:
+        import numpy as np
+        
+        if self.done:
+            return None
+        p = 1 / (1 + np.exp(-self.a * (self.theta - self.b)))
+        information = self.a ** 2 * p * (1 - p)
+        information[self.asked] = -1
+        self._last = int(information.argmax())
+        self.asked[self._last] = True
+        return self.items[self._last]
+    
+    def record(self, correct: bool):
+        """Update the ability posterior with the answer to the last question asked."""
+        import numpy as np
+        
+        z = self.a[self._last] * (self.grid - self.b[self._last])
+        # log p and log(1 - p) as log-sigmoids, finite where p rounds to 0 or 1
+        self.log_posterior -= np.logaddexp(0, -z if correct else z)
+        self.answered += 1
+    
+    def expected_score(self) -> float:
+        """Percentage of the whole bank the learner would be expected to get right."""
+        import numpy as np
+        
+        p = 1 / (1 + np.exp(-self.a * (self.theta - self.b)))
+        return round(float(p.mean()) * 100, 1)
+
+def grade_answer(question, choice: int) -> bool:
+    """The grading rule every mode shares: ``choice`` is a 0-based option index."""
+    return choice == question["correct"]
+
+class AnswerResult(NamedTuple):
+    correct: bool
+    correct_option: str
+    explanation: str
+
+class QuizSession:
+    """One quiz in progress: the questions drawn for it and the answers so far."""
+
+    def __init__(self, label: str, items: List[Tuple[str, Question]]):
+        self.label = label
+        self.items = items
+        self.position = 0
+        self.score = 0
+        self.answers = []
+        self.finished = False
+        self.presented_at = None
+    
+    @property
+    def total(self) -> int:
+        return len(self.items)
+    
+    @property
+    def current(self) -> Optional[Tuple[str, Question]]:
+        """The ``(category_key, question)`` awaiting an answer, if any."""
+        return self.items[self.position] if self.position < len(self.items) else None
+    
+    @property
+    def percentage(self) -> float:
+        return round((self.score / self.total) * 100, 1) if self.total else 0.0
+
+class QuizEngine:
+    """Quiz flow with no user interface attached.
+
+    ``start_session`` draws the questions, ``next_question`` returns the one
+    awaiting an answer, ``submit_answer`` grades it and moves on, and
+    ``finish`` records the result.  The rich UI in ``QuizApp`` drives one
+    session at a time through this; scripts and servers can drive many.
+    """
+
+    def __init__(self, bank: QuestionBank, stats: Optional[StudyStats] = None):
+        self.bank = bank
+        self.stats = stats
+    
+    def start_session(self, category: Optional[str] = None, num_questions: Optional[int] = None,
+                      label: Optional[str] = None, items: Optional[List[Tuple[str, Question]]] = None) -> QuizSession:
+        """Start a quiz over one category, the whole bank, or an explicit list of items."""
+        if items is None:
+            if category is not None:
+                k = num_questions or self.bank.question_count(category)
+                items = self.bank.sample(k, categories=[category])
+            else:
+                items = self.bank.sample(num_questions or 10)
+        if label is None:
+            label = self.bank.category_name(category) if category is not None else "Mixed Topics"
+        return QuizSession(label, items)
+    
+    def next_question(self, session: QuizSession) -> Optional[Tuple[str, Question]]:
+        """The question awaiting an answer; its response time is measured from the first call."""
+        if session.presented_at is None and session.current is not None:
+            session.presented_at = time.perf_counter()
+        return session.current
+    
+    def submit_answer(self, session: QuizSession, choice: int, latency_ms: Optional[int] = None) -> AnswerResult:
+        """Grade ``choice`` (0-based) for the current question and advance.
+
+        ``latency_ms`` is how long the learner took; by default, the time
+        since ``next_question`` first returned this question.
+        """
+        category_key, question = session.current
+        if latency_ms is None and session.presented_at is not None:
+            latency_ms = round((time.perf_counter() - session.presented_at) * 1000)
+        correct = grade_answer(question, choice)
+        if correct:
+            session.score += 1
+        session.answers.append({
+            "category": category_key,
+            "question_id": question_id(question),
+            "chosen": choice,
+            "correct": correct,
+            "answered_at": datetime.now().isoformat(),
+            "latency_ms": latency_ms
+        })
+        session.position += 1
+        session.presented_at = None
+        return AnswerResult(correct, question["options"][question["correct"]], question["explanation"])
+    
+    def finish(self, session: QuizSession) -> Dict:
+        """Record the session in the stats store (once) and return its summary."""
+        if not session.finished and session.total and self.stats is not None:
+            with tracer.span("save_stats", backend=type(self.stats).__name__):
+                self.stats.add_session(session.label, session.score, session.total, session.answers)
+        session.finished = True
+        return {
+            "category": session.label,
+            "score": session.score,
+            "total": session.total,
+            "percentage": session.percentage
+        }
+
+def read_answer_sheets(path: Path) -> List[Dict]:
+    """Answer sheets in one file: a JSON sheet, a JSON list of sheets, or JSONL.
+
+    A sheet looks like ``{"user": "ada", "label": "Week 3 quiz", "date": "...",
+    "answers": [{"question_id": "...", "choice": 2}, ...]}`` where ``choice``
+    is the 1-based option number, as typed at the quiz prompt.  ``label``
+    and ``date`` are optional.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix == ".jsonl":
+            return [json.loads(line) for line in f if line.strip()]
+        sheets = json.load(f)
+    return sheets if isinstance(sheets, list) else [sheets]
+
+_grading_index = None
+
+def _init_grader(bank_dir: Optional[str]):
+    global _grading_index
+    _grading_index = QuestionBank(bank_dir).question_index()
+
+def grade_sheet(sheet: Dict) -> Tuple[Optional[Dict], int]:
+    """Grade one sheet against the worker's question index.
+
+    Returns ``(result, unknown)``: the user, a session dict and its
+    per-answer records (None if no answer could be graded), plus how many
+    answers named a question id that is not in the bank.  Raises KeyError,
+    TypeError, ValueError or AttributeError for a malformed sheet.
+    """
+    score = 0
+    answers = []
+    unknown = 0
+    answered_at = sheet.get("date") or datetime.now().isoformat()
+    for answer in sheet["answers"]:
+        found = _grading_index.get(str(answer["question_id"]))
+        if found is None:
+            unknown += 1
+            continue
+        category_key, question = found
+        chosen = int(answer["choice"]) - 1
+        correct = grade_answer(question, chosen)
+        score += correct
+        answers.append({
+            "category": category_key,
+            "question_id": str(answer["question_id"]),
+            "chosen": chosen,
+            "correct": correct,
+            "answered_at": answered_at
+        })
+    if not answers:
+        return None, unknown
+    
+    session = StudyStats.new_session(sheet.get("label") or "Graded Sheet", score, len(answers))
+    session["date"] = answered_at
+    return {"user": str(sheet["user"]), "session": session, "answers": answers}, unknown
+
+def grade_sheet_file(path: str) -> Tuple[List[Dict], int, List[str]]:
+    """Grade every sheet in one file against the worker's question index.
+
+    Returns ``(results, unknown, problems)``: one result per graded sheet,
+    how many answers named a question id that is not in the bank (those are
+    skipped), and a message for each sheet (or unreadable file) skipped.
+    """
+    try:
+        sheets = read_answer_sheets(Path(path))
+    except (OSError, ValueError) as e:
+        return [], 0, [f"{path}: {e}"]
+    
+    results = []
+    unknown = 0
+    problems = []
+    for n, sheet in enumerate(sheets, 1):
+        try:
+            result, sheet_unknown = grade_sheet(sheet)
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            problems.append(f"{path}: sheet {n}: {type(e).__name__}: {e}")
+            continue
+        unknown += sheet_unknown
+        if result is not None:
+            results.append(result)
+    return results, unknown, problems
+
+def open_user_stats(stats_dir: str, user: str, backend: Optional[str] = None) -> StudyStats:
+    """Open ``user``'s own stats store under ``stats_dir``, creating its directory."""
+    # User ids come from outside; keep them from escaping stats_dir
+    user_dir = Path(stats_dir) / (re.sub(r"[^A-Za-z0-9_.@-]", "_", user).lstrip(".") or "_")
+    user_dir.mkdir(parents=True, exist_ok=True)
+    backend = backend or os.environ.get("STUDY_QUIZ_BACKEND") or "json"
+    filename = "study_stats.db" if backend == "sqlite" else "study_stats.json"
+    return open_stats(backend, str(user_dir / filename))
+
+def _write_user_results(job: Tuple[str, Optional[str], str, List[Dict]]) -> int:
+    stats_dir, backend, user, results = job
+    stats = open_user_stats(stats_dir, user, backend)
+    stats.add_sessions([r["session"] for r in results], [r["answers"] for r in results])
+    return len(results)
+
+def grade_directory(answer_dir: str, stats_dir: str, bank_dir: Optional[str] = None,
+                    backend: Optional[str] = None, workers: Optional[int] = None) -> Dict:
+    """Grade every answer file under ``answer_dir`` in a process pool.
+
+    Each user's sessions are written to ``stats_dir/<user>/`` in a single
+    bulk ``add_sessions`` call, with users spread across the same pool.
+    Malformed sheets and unreadable files are skipped and listed in the
+    summary's ``problems``; the rest are still graded.
+    """
+    import multiprocessing
+    
+    paths = sorted(
+        str(path) for path in Path(answer_dir).rglob("*")
+        if path.suffix in (".json", ".jsonl") and path.is_file()
+    )
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, min(256, len(paths) // (workers * 8) or 1))
+    
+    by_user = {}
+    unknown = 0
+    problems = []
+    with multiprocessing.Pool(workers, initializer=_init_grader, initargs=(bank_dir,)) as pool:
+        for results, file_unknown, file_problems in pool.imap_unordered(grade_sheet_file, paths, chunksize):
+            unknown += file_unknown
+            problems += file_problems
+            for result in results:
+                by_user.setdefault(result["user"], []).append(result)
+        
+        jobs = [(stats_dir, backend, user, results) for user, results in by_user.items()]
+        sessions = sum(pool.imap_unordered(_write_user_results, jobs, max(1, len(jobs) // (workers * 8) or 1)))
+    
+    return {
+        "files": len(paths),
+        "sessions": sessions,
+        "users": len(by_user),
+        "answers": sum(len(r["answers"]) for results in by_user.values() for r in results),
+        "unknown": unknown,
+        "problems": sorted(problems)
     }
-}
 
-class StudyStats:
-    def __init__(self):
-        self.stats_file = Path("study_stats.json")
-        self.load_stats()
+def summarize_stats_file(path: str) -> Optional[Dict]:
+    """Reduce one learner's JSON stats store to what cohort analytics needs.
+
+    Returns None if ``path`` is not a stats store.  Weekly counts come from
+    the store's rollups, which are kept for its whole history.  The store
+    is read without its lock, so a read-only collection can be analysed.
+    """
+    try:
+        data = StudyStats(path).read_unlocked()
+        weekly = data["rollups"]["weekly"]
+        categories = {category: [counts["correct"], counts["total"]]
+                      for category, counts in data["category_stats"].items()}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
     
-    def load_stats(self):
-        if self.stats_file.exists():
-            with open(self.stats_file, 'r') as f:
-                self.data = json.load(f)
+    weeks = sorted(weekly)
+    if weeks:
+        first, last = (datetime.strptime(week + "-1", "%G-W%V-%u") for week in (weeks[0], weeks[-1]))
+        active_weeks = (last - first).days // 7 + 1
+    else:
+        active_weeks = 1
+    return {
+        "categories": categories,
+        "weekly": {week: {category: [c["correct"], c["total"], c["sessions"]] for category, c in counts.items()}
+                   for week, counts in weekly.items()},
+        "sessions_per_week": data["session_count"] / active_weeks
+    }
+
+def stats_file_signature(path: Path) -> List[int]:
+    signature = []
+    for part in (path, path.with_suffix(".journal")):
+        try:
+            st = part.stat()
+            signature += [st.st_mtime_ns, st.st_size]
+        except OSError:
+            signature += [0, 0]
+    return signature
+
+def cohort_analytics(stats_dir: str, workers: Optional[int] = None, cache_file: Optional[str] = None,
+                     trend_weeks: int = 12) -> Dict:
+    """Ingest every JSON stats store under ``stats_dir`` and aggregate the cohort.
+
+    Stores are summarized in a process pool.  Summaries are cached in
+    ``cache_file`` (default ``stats_dir/.analytics_cache.json``) by each
+    store's mtime and size, journal included, so a re-run only re-reads
+    stores that changed.  The summaries are then combined with NumPy into
+    per-category accuracy distributions across learners, a histogram of
+    sessions per week, and weekly accuracy with a least-squares trend over
+    the last ``trend_weeks`` weeks, overall and per category.  Weeks run
+    without gaps from the first active week to the last; a week nobody
+    studied has accuracy None and is left out of the fit, not closed up.
+    """
+    import multiprocessing
+    import numpy as np
+    
+    root = Path(stats_dir)
+    cache_path = Path(cache_file) if cache_file else root / ".analytics_cache.json"
+    # A store may be a snapshot, a journal not yet compacted, or both
+    stores = sorted({
+        path.with_suffix(".json") for path in root.rglob("*")
+        if path.suffix in (".json", ".journal") and not path.name.startswith(".")
+        and path.name != "study_review.json" and path.with_suffix(".json") != cache_path and path.is_file()
+    })
+    
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    
+    entries, stale = {}, []
+    for path in stores:
+        key = str(path.relative_to(root))
+        signature = stats_file_signature(path)
+        if cache.get(key, {}).get("signature") == signature:
+            entries[key] = cache[key]
         else:
-            self.data = {
-                "total_questions": 0,
-                "correct_answers": 0,
-                "sessions": [],
-                "category_stats": {}
-            }
+            stale.append((key, signature, str(path)))
     
-    def save_stats(self):
-        with open(self.stats_file, 'w') as f:
-            json.dump(self.data, f, indent=2)
+    if stale:
+        workers = min(workers or os.cpu_count() or 1, len(stale))
+        chunksize = max(1, len(stale) // (workers * 8))
+        with multiprocessing.Pool(workers) as pool:
+            summaries = pool.map(summarize_stats_file, [path for _, _, path in stale], chunksize)
+        for (key, signature, _), summary in zip(stale, summaries):
+            entries[key] = {"signature": signature, "summary": summary}
+        try:
+            atomic_write_json(cache_path, entries)
+        except OSError:
+            pass
     
-    def add_session(self, category: str, score: int, total: int):
-        session = {
-            "date": datetime.now().isoformat(),
-            "category": category,
-            "score": score,
-            "total": total,
-            "percentage": round((score / total) * 100, 1)
+    learners = [entry["summary"] for entry in entries.values() if entry["summary"] is not None]
+    categories = sorted({category for learner in learners for category in learner["categories"]})
+    active_weeks = sorted({week for learner in learners for week in learner["weekly"]})
+    weeks = []
+    if active_weeks:
+        day, last = (datetime.strptime(week + "-1", "%G-W%V-%u") for week in (active_weeks[0], active_weeks[-1]))
+        while day <= last:
+            weeks.append(StudyStats.week_key(day))
+            day += timedelta(weeks=1)
+    category_index = {category: i for i, category in enumerate(categories)}
+    week_index = {week: i for i, week in enumerate(weeks)}
+    
+    # Learner x category accuracy, NaN where a learner never tried the category
+    counts = np.zeros((len(learners), len(categories), 2))
+    for row, learner in enumerate(learners):
+        for category, pair in learner["categories"].items():
+            counts[row, category_index[category]] = pair
+    with np.errstate(invalid="ignore", divide="ignore"):
+        accuracy = np.where(counts[:, :, 1] > 0, counts[:, :, 0] / counts[:, :, 1] * 100, np.nan)
+    
+    distributions = {}
+    for i, category in enumerate(categories):
+        column = accuracy[:, i][~np.isnan(accuracy[:, i])]
+        p10, p25, p50, p75, p90 = np.percentile(column, [10, 25, 50, 75, 90])
+        distributions[category] = {
+            "learners": int(column.size), "mean": round(float(column.mean()), 1),
+            "p10": round(p10, 1), "p25": round(p25, 1), "p50": round(p50, 1),
+            "p75": round(p75, 1), "p90": round(p90, 1)
         }
-        self.data["sessions"].append(session)
-        self.data["total_questions"] += total
-        self.data["correct_answers"] += score
+    
+    edges = [0, 1, 2, 3, 5, 8, 13]
+    frequency = np.array([learner["sessions_per_week"] for learner in learners])
+    histogram, _ = np.histogram(frequency, bins=edges + [max(frequency.max(initial=0), edges[-1]) + 1])
+    labels = [f"{low}-{high}" for low, high in zip(edges, edges[1:])] + [f"{edges[-1]}+"]
+    
+    # Week x category totals, summed across learners in one scatter-add
+    rows = [(week_index[week], category_index[category], *triple)
+            for learner in learners for week, by_category in learner["weekly"].items()
+            for category, triple in by_category.items() if category in category_index]
+    weekly = np.zeros((len(weeks), len(categories), 3))
+    if rows:
+        table = np.array(rows)
+        np.add.at(weekly, (table[:, 0].astype(int), table[:, 1].astype(int)), table[:, 2:])
+    
+    def trend(correct, total):
+        """Weekly accuracy and its slope in percentage points per week over the recent window."""
+        correct, total = correct[-trend_weeks:], total[-trend_weeks:]
+        active = total > 0
+        if active.sum() < 2:
+            return None
+        x = np.flatnonzero(active)
+        y = correct[active] / total[active] * 100
+        return round(float(np.polyfit(x, y, 1, w=np.sqrt(total[active]))[0]), 2)
+    
+    overall = weekly.sum(axis=1)
+    return {
+        "stores": len(stores),
+        "reprocessed": len(stale),
+        "learners": len(learners),
+        "skipped": len(entries) - len(learners),
+        "categories": distributions,
+        "sessions_per_week": list(zip(labels, histogram.tolist())),
+        "weekly": [
+            {"week": week, "correct": int(c), "total": int(t), "sessions": int(s),
+             "accuracy": round(c / t * 100, 1) if t else None}
+            for week, (c, t, s) in zip(weeks, overall)
+        ],
+        "trend": trend(overall[:, 0], overall[:, 1]),
+        "category_trends": {category: trend(weekly[:, i, 0], weekly[:, i, 1]) for i, category in enumerate(categories)}
+    }
+
+class QuizServer:
+    """Many concurrent quiz sessions over HTTP+JSON, sharing one question bank.
+
+    The bank is loaded once and only read.  Each request is a few
+    microseconds of ``QuizEngine`` work, so everything runs on one asyncio
+    loop.  Finished sessions are queued per user and written to that user's
+    own stats store every ``flush_interval`` seconds, one ``add_sessions``
+    call per user, on a worker thread so slow disks never stall the loop.
+    A user whose store can't be written keeps their sessions queued for
+    the next flush; everyone else's are still written.
+
+    Routes (``choice`` is the 1-based option number)::
+
+        GET  /categories
+        POST /sessions                  {"user", "category"?, "num_questions"?}
+        GET  /sessions/<id>
+        POST /sessions/<id>/answer      {"choice"}
+        POST /sessions/<id>/finish
+
+    A session nobody has touched for ``session_ttl`` seconds is dropped
+    unrecorded, and at most ``MAX_SESSIONS`` can be open at once.
+    """
+
+    MAX_BODY = 64 * 1024
+    MAX_SESSIONS = 100000
+    MAX_USER = 128
+    REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 413: "Payload Too Large", 503: "Service Unavailable"}
+
+    def __init__(self, bank: QuestionBank, stats_dir: str, backend: Optional[str] = None,
+                 flush_interval: float = 1.0, session_ttl: float = 3600.0):
+        self.bank = bank
+        self.engine = QuizEngine(bank)
+        self.stats_dir = stats_dir
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.session_ttl = session_ttl
+        # id -> (user, session, last used); kept in least recently used order
+        self.sessions = {}
+        self.pending = {}
+        self.stores = {}
+        self.finished_sessions = 0
+    
+    def question_payload(self, session: QuizSession) -> Optional[Dict]:
+        item = self.engine.next_question(session)
+        if item is None:
+            return None
+        category_key, question = item
+        return {
+            "position": session.position + 1,
+            "total": session.total,
+            "category": category_key,
+            "question": question["question"],
+            "options": question["options"]
+        }
+    
+    def expire_sessions(self, now: Optional[float] = None) -> int:
+        """Drop sessions idle for longer than ``session_ttl``; returns how many."""
+        cutoff = (time.monotonic() if now is None else now) - self.session_ttl
+        expired = []
+        for session_id, (_, _, last_used) in self.sessions.items():
+            if last_used >= cutoff:
+                break
+            expired.append(session_id)
+        for session_id in expired:
+            del self.sessions[session_id]
+        return len(expired)
+    
+    def dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Dict]:
+        parts = [part for part in path.split("?")[0].split("/") if part]
+        try:
+            request = json.loads(body) if body else {}
+        except ValueError:
+            return 400, {"error": "body is not valid JSON"}
+        if not isinstance(request, dict):
+            return 400, {"error": "body must be a JSON object"}
         
-        if category not in self.data["category_stats"]:
-            self.data["category_stats"][category] = {"correct": 0, "total": 0}
+        if parts == ["categories"] and method == "GET":
+            return 200, {"categories": [
+                {"key": key, "name": self.bank.category_name(key), "count": self.bank.question_count(key)}
+                for key in self.bank.category_keys()
+            ]}
         
-        self.data["category_stats"][category]["correct"] += score
-        self.data["category_stats"][category]["total"] += total
-        self.save_stats()
+        if parts == ["sessions"] and method == "POST":
+            user = request.get("user")
+            if not isinstance(user, str) or not user:
+                return 400, {"error": "user is required and must be a string"}
+            if len(user) > self.MAX_USER:
+                return 400, {"error": f"user must be at most {self.MAX_USER} characters"}
+            category = request.get("category")
+            if category is not None and not isinstance(category, str):
+                return 400, {"error": "category must be a string"}
+            if category is not None and category not in self.bank.manifest:
+                return 404, {"error": f"unknown category {category}"}
+            num_questions = request.get("num_questions")
+            if num_questions is not None and (type(num_questions) is not int or num_questions < 1):
+                return 400, {"error": "num_questions must be a positive integer"}
+            self.expire_sessions()
+            if len(self.sessions) >= self.MAX_SESSIONS:
+                return 503, {"error": "too many open sessions, try again later"}
+            session = self.engine.start_session(category=category, num_questions=num_questions)
+            import secrets
+            
+            session_id = secrets.token_hex(8)
+            self.sessions[session_id] = (user, session, time.monotonic())
+            return 201, {"session_id": session_id, "label": session.label, "total": session.total,
+                         "question": self.question_payload(session)}
+        
+        if len(parts) < 2 or parts[0] != "sessions":
+            return 404, {"error": "not found"}
+        if parts[1] not in self.sessions:
+            return 404, {"error": "unknown session"}
+        user, session, _ = self.sessions.pop(parts[1])
+        self.sessions[parts[1]] = (user, session, time.monotonic())
+        
+        if len(parts) == 2 and method == "GET":
+            return 200, {"question": self.question_payload(session), "score": session.score}
+        
+        if parts[2:] == ["answer"] and method == "POST":
+            if session.current is None:
+                return 400, {"error": "no question is waiting for an answer"}
+            options = session.current[1]["options"]
+            choice = request.get("choice")
+            if type(choice) is not int or not 1 <= choice <= len(options):
+                return 400, {"error": f"choice must be 1-{len(options)}"}
+            result = self.engine.submit_answer(session, choice - 1)
+            return 200, {"correct": result.correct, "correct_option": result.correct_option,
+                         "explanation": result.explanation, "next": self.question_payload(session)}
+        
+        if parts[2:] == ["finish"] and method == "POST":
+            del self.sessions[parts[1]]
+            summary = self.engine.finish(session)
+            if session.total:
+                record = StudyStats.new_session(session.label, session.score, session.total, session.answers)
+                self.pending.setdefault(user, []).append((record, session.answers))
+            self.finished_sessions += 1
+            return 200, summary
+        
+        return 405, {"error": "method not allowed"}
+    
+    def flush(self, pending: Optional[Dict] = None) -> int:
+        """Write queued sessions to each user's store; returns how many were written.
+
+        A user whose write fails has their sessions put back at the front
+        of the queue, ahead of any finished since.
+        """
+        if pending is None:
+            pending, self.pending = self.pending, {}
+        written = 0
+        for user, records in pending.items():
+            try:
+                if user not in self.stores:
+                    self.stores[user] = open_user_stats(self.stats_dir, user, self.backend)
+                self.stores[user].add_sessions([r for r, _ in records], [a for _, a in records])
+            except Exception as e:
+                print(f"Could not save {len(records)} sessions for {user!r}, will retry: {e}", file=sys.stderr)
+                self.pending.setdefault(user, [])[:0] = records
+                continue
+            written += len(records)
+        return written
+    
+    async def _flush_periodically(self):
+        import asyncio
+        
+        loop = asyncio.get_event_loop()
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.expire_sessions()
+            if self.pending:
+                pending, self.pending = self.pending, {}
+                await loop.run_in_executor(None, self.flush, pending)
+    
+    async def handle_connection(self, reader, writer):
+        import asyncio
+        
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                
+                length = int(headers.get("content-length") or 0)
+                if length > self.MAX_BODY:
+                    status, payload = 413, {"error": "request body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = self.dispatch(method, target, body)
+                    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                
+                data = json.dumps(payload).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {self.REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+    
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765, ready=None):
+        import asyncio
+        
+        server = await asyncio.start_server(self.handle_connection, host, port, backlog=1024)
+        flusher = asyncio.ensure_future(self._flush_periodically())
+        if ready is not None:
+            ready(server.sockets[0].getsockname())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            flusher.cancel()
+            self.flush()
+
+DISPLAY_MODES = ("full", "compact", "plain")
+# Console settings per display mode.  compact keeps the 8 basic colours
+# (the shortest escape codes) and plain sends no escape codes at all
+DISPLAY_CONSOLE = {
+    "full": {},
+    "compact": {"color_system": "standard", "highlight": False, "emoji": False},
+    "plain": {"color_system": None, "highlight": False, "emoji": False},
+}
 
 class QuizApp:
-    def __init__(self):
-        self.stats = StudyStats()
-        self.current_score = 0
-        self.current_total = 0
+    """The interactive quiz.
+
+    ``display`` is ``"full"`` (panels, tables and emoji), or ``"compact"`` or
+    ``"plain"`` for slow links: questions, menus and results as short lines
+    with no box drawing or emoji, the menu listed in full only once, and a
+    question's category shown only when it changes.  Static screens (banner,
+    menu, category list, help) are rendered once and their output replayed.
+    """
+
+    MENU = [
+        ("1", "📚", "Start Quiz by Category", "Category"),
+        ("2", "🎯", "Random Mixed Quiz", "Mixed"),
+        ("3", "🧭", "Adaptive Quiz", "Adaptive"),
+        ("4", "🧠", "Spaced Repetition Review", "Review"),
+        ("5", "📊", "View Study Statistics", "Stats"),
+        ("6", "❓", "Help", "Help"),
+        ("7", "👋", "Exit", "Exit"),
+    ]
+    
+    def __init__(self, bank: Optional[QuestionBank] = None, stats: Optional[StudyStats] = None,
+                 display: str = "full"):
+        self.bank = bank or QuestionBank()
+        self.stats = stats or StudyStats()
+        self.engine = QuizEngine(self.bank, self.stats)
+        self.session = None
+        self.reviews = None
+        self._loader = None
+        self._stats_ready = None
+        self.display = display
+        self._painted = {}
+        self._menu_shown = False
+        self._shown_category = None
+    
+    @property
+    def compact(self) -> bool:
+        return self.display != "full"
+    
+    def paint(self, key, build):
+        """Print a static renderable, laying it out only once per terminal width.
+
+        ``build`` returns the renderable; the terminal output it produced is
+        kept under ``key`` and written straight out on later calls.
+        """
+        key = (key, console.width)
+        output = self._painted.get(key)
+        if output is None:
+            with console.capture() as capture:
+                console.print(build())
+            output = self._painted[key] = capture.get()
+        console.file.write(output)
+        console.file.flush()
+    
+    def show_category(self, category_key: str):
+        """Say which category a mixed quiz's question is from; compact modes skip repeats."""
+        if self.compact and category_key == self._shown_category:
+            return
+        self._shown_category = category_key
+        console.print(f"[dim]Category: {self.bank.category_name(category_key)}[/dim]")
+    
+    def preload(self, fn, *args, **kwargs):
+        """Run ``fn`` on a background thread and return its Future."""
+        if self._loader is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._loader = ThreadPoolExecutor(max_workers=2, thread_name_prefix="preload")
+        return self._loader.submit(fn, *args, **kwargs)
+    
+    def wait_for(self, future, description: str = "Loading..."):
+        """Return ``future``'s result, showing a spinner only if it is still pending."""
+        if not future.done():
+            from rich.progress import Progress, SpinnerColumn, TextColumn
+            
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                console=console.resolve(),
+                transient=True,
+            ) as progress:
+                progress.add_task(description, total=None)
+                return future.result()
+        return future.result()
+    
+    def stats_ready(self) -> StudyStats:
+        """The stats store, once any background load of it has finished."""
+        if self._stats_ready is not None:
+            self.wait_for(self._stats_ready, "Loading your stats...")
+        return self.stats
+    
+    def preload_category(self, key: str):
+        return self.preload(self.bank.load_category, key)
+    
+    @property
+    def current_score(self) -> int:
+        return self.session.score if self.session else 0
+    
+    @property
+    def current_total(self) -> int:
+        return self.session.total if self.session else 0
+    
+    def play_session(self, show_category: bool = False) -> List[bool]:
+        """Ask every question in ``self.session``; return whether each was answered correctly."""
+        results = []
+        upcoming = None
+        while True:
+            item = self.engine.next_question(self.session)
+            if item is None:
+                return results
+            category_key, question = item
+            # Build the following question's panels while this one is on screen
+            rendered = upcoming.result() if upcoming is not None else self.render_question(question)
+            position = self.session.position
+            if position + 1 < self.session.total:
+                upcoming = self.preload(self.render_question, self.session.items[position + 1][1])
+            else:
+                upcoming = None
+            
+            if show_category:
+                self.show_category(category_key)
+            results.append(self.ask_question(question, position + 1, self.session.total, rendered))
     
     def display_banner(self):
-        banner = Text("🎓 PREWORK STUDY GUIDE 🎓", style="bold blue")
-        subtitle = Text("Interactive Programming Quiz", style="italic cyan")
+        if self.compact:
+            self.paint("banner", lambda: "[bold blue]PREWORK STUDY GUIDE[/bold blue] - Interactive Programming Quiz")
+            return
+        
+        def build():
+            from rich import box
+            from rich.align import Align
+            from rich.panel import Panel
+            from rich.text import Text
+            
+            banner = Text("🎓 PREWORK STUDY GUIDE 🎓", style="bold blue")
+            subtitle = Text("Interactive Programming Quiz", style="italic cyan")
+            return Align.center(Panel(
+                Align.center(f"{banner}\n{subtitle}"),
+                box=box.DOUBLE,
+                style="bright_blue"
+            ))
         
         console.print()
-        console.print(Align.center(Panel(
-            Align.center(f"{banner}\n{subtitle}"),
-            box=box.DOUBLE,
-            style="bright_blue"
-        )))
+        self.paint("banner", build)
         console.print()
     
     def show_main_menu(self):
-        table = Table(show_header=False, box=box.ROUNDED, style="cyan")
-        table.add_column("Option", style="bold yellow", width=4)
-        table.add_column("Description", style="white")
+        from rich.prompt import Prompt
         
-        table.add_row("1", "📚 Start Quiz by Category")
-        table.add_row("2", "🎯 Random Mixed Quiz")
-        table.add_row("3", "📊 View Study Statistics")
-        table.add_row("4", "❓ Help")
-        table.add_row("5", "👋 Exit")
-        
-        console.print(Panel(table, title="[bold green]Main Menu[/bold green]", border_style="green"))
-        return Prompt.ask("\n[bold cyan]Choose an option[/bold cyan]", choices=["1", "2", "3", "4", "5"])
+        if not self.compact:
+            def build():
+                from rich import box
+                from rich.panel import Panel
+                from rich.table import Table
+                
+                table = Table(show_header=False, box=box.ROUNDED, style="cyan")
+                table.add_column("Option", style="bold yellow", width=4)
+                table.add_column("Description", style="white")
+                for key, icon, label, _ in self.MENU:
+                    table.add_row(key, f"{icon} {label}")
+                return Panel(table, title="[bold green]Main Menu[/bold green]", border_style="green")
+            self.paint("menu", build)
+        elif not self._menu_shown:
+            self.paint("menu", lambda: "\n".join(f"[bold]{key}[/bold] {label}" for key, _, label, _ in self.MENU))
+        else:
+            # The full list is still on screen a little way up
+            self.paint("menu-short", lambda: " ".join(f"{key} {short}" for key, _, _, short in self.MENU))
+        self._menu_shown = True
+        return Prompt.ask("\n[bold cyan]Choose an option[/bold cyan]", choices=[key for key, *_ in self.MENU])
     
     def show_categories(self):
-        table = Table(show_header=False, box=box.ROUNDED, style="magenta")
-        table.add_column("Option", style="bold yellow", width=4)
-        table.add_column("Category", style="white")
-        table.add_column("Questions", style="dim white")
+        from rich.prompt import Prompt
+        
+        categories = self.bank.category_keys()
+        rows = [
+            (str(i), self.bank.category_name(key), f"{self.bank.question_count(key)} questions")
+            for i, key in enumerate(categories, 1)
+        ]
         
-        categories = list(QUIZ_DATA.keys())
-        for i, (key, data) in enumerate(QUIZ_DATA.items(), 1):
-            question_count = len(data["questions"])
-            table.add_row(str(i), data["name"], f"{question_count} questions")
+        def build():
+            from rich import box
+            from rich.panel import Panel
+            from rich.table import Table
+            
+            if self.compact:
+                return "\n".join(f"[bold]{n}[/bold] {name} [dim]({count})[/dim]" for n, name, count in rows)
+            table = Table(show_header=False, box=box.ROUNDED, style="magenta")
+            table.add_column("Option", style="bold yellow", width=4)
+            table.add_column("Category", style="white")
+            table.add_column("Questions", style="dim white")
+            for row in rows:
+                table.add_row(*row)
+            return Panel(table, title="[bold magenta]Study Categories[/bold magenta]", border_style="magenta")
         
-        console.print(Panel(table, title="[bold magenta]Study Categories[/bold magenta]", border_style="magenta"))
+        # Counts can change once a stale manifest meets its shard
+        self.paint(("categories", tuple(rows)), build)
         
         choices = [str(i) for i in range(1, len(categories) + 1)]
         choice = Prompt.ask("\n[bold magenta]Select a category[/bold magenta]", choices=choices)
         return categories[int(choice) - 1]
     
     def run_quiz(self, category_key: str, num_questions: Optional[int] = None):
-        category = QUIZ_DATA[category_key]
-        questions = category["questions"].copy()
-        random.shuffle(questions)
+        # Only the chosen shard is read; the category list comes from the manifest
+        self.wait_for(self.preload_category(category_key), "Loading quiz...")
+        self.session = self.engine.start_session(category=category_key, num_questions=num_questions)
         
-        if num_questions:
-            questions = questions[:num_questions]
+        console.print(f"\n[bold green]Starting {self.session.label} Quiz![/bold green]")
+        console.print(f"[dim]You'll answer {self.session.total} questions[/dim]\n")
         
-        self.current_score = 0
-        self.current_total = len(questions)
+        self.play_session()
         
-        console.print(f"\n[bold green]Starting {category['name']} Quiz![/bold green]")
-        console.print(f"[dim]You'll answer {len(questions)} questions[/dim]\n")
-        
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-            transient=True,
-        ) as progress:
-            task = progress.add_task("Loading quiz...", total=None)
-            time.sleep(1)
+        self.show_quiz_results(self.session.label)
+        self.stats_ready()
+        self.engine.finish(self.session)
+    
+    @traced("render_question")
+    def render_question(self, question: dict):
+        """Build the question panel and options table; safe to call off the main thread."""
+        from rich.panel import Panel
+        from rich.table import Table
         
-        for i, question in enumerate(questions, 1):
-            self.ask_question(question, i, len(questions))
+        if self.compact:
+            return question["question"], "\n".join(
+                f"[bold]{i}[/bold] {option}" for i, option in enumerate(question["options"], 1)
+            )
         
-        self.show_quiz_results(category['name'])
-        self.stats.add_session(category['name'], self.current_score, self.current_total)
-    
-    def ask_question(self, question: dict, current: int, total: int):
-        console.print(f"\n[bold blue]Question {current}/{total}[/bold blue]")
-        console.print(Panel(
+        panel = Panel(
             question["question"],
             title="[bold yellow]❓ Question[/bold yellow]",
             border_style="yellow"
-        ))
+        )
         
-        # Display options
         table = Table(show_header=False, box=None, style="white")
         for i, option in enumerate(question["options"], 1):
             table.add_row(f"[bold cyan]{i}.[/bold cyan]", option)
+        return panel, table
+    
+    @traced("ask_question")
+    def ask_question(self, question: dict, current: int, total: int, rendered=None):
+        from rich.prompt import Prompt
+        
+        panel, table = rendered or self.render_question(question)
+        console.print(f"\n[bold blue]Question {current}/{total}[/bold blue]")
+        console.print(panel)
         
+        # Display options
         console.print(table)
         
         # Get user answer
         choices = [str(i) for i in range(1, len(question["options"]) + 1)]
+        asked_at = time.perf_counter_ns()
         answer = Prompt.ask("\n[bold cyan]Your answer[/bold cyan]", choices=choices)
+        answered_at = time.perf_counter_ns()
+        tracer.add("think_time", asked_at, answered_at, question=current)
         user_choice = int(answer) - 1
         
         # Check answer
-        if user_choice == question["correct"]:
-            self.current_score += 1
-            console.print("[bold green]✅ Correct![/bold green]")
+        result = self.engine.submit_answer(self.session, user_choice, (answered_at - asked_at) // 1_000_000)
+        if self.compact:
+            console.print("[green]Correct![/green]" if result.correct else f"[red]Wrong! Answer: {result.correct_option}[/red]")
+            console.print(f"[dim]{result.explanation}[/dim]")
         else:
-            correct_option = question["options"][question["correct"]]
-            console.print(f"[bold red]❌ Wrong! The correct answer is: {correct_option}[/bold red]")
-        
-        # Show explanation
-        console.print(f"[dim italic]💡 {question['explanation']}[/dim italic]")
+            if result.correct:
+                console.print("[bold green]✅ Correct![/bold green]")
+            else:
+                console.print(f"[bold red]❌ Wrong! The correct answer is: {result.correct_option}[/bold red]")
+            
+            # Show explanation
+            console.print(f"[dim italic]💡 {result.explanation}[/dim italic]")
         
         if current < total:
             Prompt.ask("\n[dim]Press Enter to continue...[/dim]", default="")
+        return result.correct
     
+    @traced("show_quiz_results")
     def show_quiz_results(self, category_name: str):
+        from rich.panel import Panel
+        
         percentage = round((self.current_score / self.current_total) * 100, 1)
         
         if percentage >= 80:
@@ -348,12 +2968,21 @@ class QuizApp:
             color = "red"
             message = "Keep studying!"
         
+        latencies = [a["latency_ms"] for a in self.session.answers if a.get("latency_ms") is not None]
+        
+        if self.compact:
+            pace = f", {sum(latencies) / len(latencies) / 1000:.1f}s per answer" if latencies else ""
+            console.print(f"\n[bold {color}]{category_name}: {self.current_score}/{self.current_total} "
+                          f"({percentage}%){pace}. {message}[/bold {color}]")
+            return
+        
+        pace = f"\nAverage answer time: {sum(latencies) / len(latencies) / 1000:.1f}s" if latencies else ""
         result_text = f"""
 {emoji} Quiz Complete! {emoji}
 
 Category: {category_name}
 Score: {self.current_score}/{self.current_total}
-Percentage: {percentage}%
+Percentage: {percentage}%{pace}
 
 {message}
         """
@@ -364,7 +2993,15 @@ Percentage: {percentage}%
             border_style=color
         ))
     
+    @traced("show_statistics")
     def show_statistics(self):
+        from rich import box
+        from rich.table import Table
+        
+        # Compact displays draw only the header rule
+        table_box = box.SIMPLE if self.compact else box.ROUNDED
+        
+        self.stats_ready()
         if self.stats.data["total_questions"] == 0:
             console.print("[yellow]No quiz data yet! Take some quizzes first.[/yellow]")
             return
@@ -372,21 +3009,21 @@ Percentage: {percentage}%
         overall_percentage = round((self.stats.data["correct_answers"] / self.stats.data["total_questions"]) * 100, 1)
         
         # Overall stats
-        stats_table = Table(title="📊 Overall Statistics", box=box.ROUNDED)
+        stats_table = Table(title="📊 Overall Statistics", box=table_box)
         stats_table.add_column("Metric", style="cyan")
         stats_table.add_column("Value", style="white")
         
         stats_table.add_row("Total Questions", str(self.stats.data["total_questions"]))
         stats_table.add_row("Correct Answers", str(self.stats.data["correct_answers"]))
         stats_table.add_row("Overall Accuracy", f"{overall_percentage}%")
-        stats_table.add_row("Quiz Sessions", str(len(self.stats.data["sessions"])))
+        stats_table.add_row("Quiz Sessions", str(self.stats.data["session_count"]))
         
         console.print(stats_table)
         
         # Category breakdown
         if self.stats.data["category_stats"]:
             console.print("\n")
-            category_table = Table(title="📈 Category Performance", box=box.ROUNDED)
+            category_table = Table(title="📈 Category Performance", box=table_box)
             category_table.add_column("Category", style="magenta")
             category_table.add_column("Correct", style="green")
             category_table.add_column("Total", style="white")
@@ -403,26 +3040,72 @@ Percentage: {percentage}%
             
             console.print(category_table)
         
+        # Weekly trend, read straight from the rollups
+        weeks = self.stats.recent_weeks(4)
+        console.print("\n")
+        trend_table = Table(title="📅 Weekly Trend (Last 4 Weeks)", box=table_box)
+        trend_table.add_column("Category", style="magenta")
+        for week, _ in weeks:
+            trend_table.add_column(week, style="cyan")
+        
+        def week_cell(counts: Optional[Dict]) -> str:
+            if not counts or not counts["total"]:
+                return "-"
+            return f"{round(counts['correct'] / counts['total'] * 100, 1)}% ({counts['sessions']})"
+        
+        categories = sorted({category for _, bucket in weeks for category in bucket})
+        for category in categories:
+            trend_table.add_row(category, *[week_cell(bucket.get(category)) for _, bucket in weeks])
+        overall = []
+        for _, bucket in weeks:
+            overall.append(week_cell({
+                "correct": sum(c["correct"] for c in bucket.values()),
+                "total": sum(c["total"] for c in bucket.values()),
+                "sessions": sum(c["sessions"] for c in bucket.values())
+            }))
+        trend_table.add_row("[bold]All[/bold]", *overall)
+        console.print(trend_table)
+        
         # Recent sessions
-        if self.stats.data["sessions"]:
+        if self.stats.data["recent"]:
             console.print("\n")
-            recent_table = Table(title="🕒 Recent Sessions (Last 5)", box=box.ROUNDED)
+            recent_table = Table(title="🕒 Recent Sessions (Last 5)", box=table_box)
             recent_table.add_column("Date", style="dim white")
             recent_table.add_column("Category", style="magenta")
             recent_table.add_column("Score", style="cyan")
             recent_table.add_column("Accuracy", style="green")
             
-            recent_sessions = self.stats.data["sessions"][-5:]
+            recent_sessions = self.stats.data["recent"][-5:]
             for session in reversed(recent_sessions):
-                date = datetime.fromisoformat(session["date"]).strftime("%Y-%m-%d %H:%M")
                 recent_table.add_row(
-                    date,
+                    session["date"],
                     session["category"],
                     f"{session['score']}/{session['total']}",
                     f"{session['percentage']}%"
                 )
             
             console.print(recent_table)
+        
+        # Per-question history is only kept by the SQLite store
+        if isinstance(self.stats, SQLiteStudyStats):
+            weakest = self.stats.weakest_questions(limit=5)
+            if weakest:
+                console.print("\n")
+                last_30 = self.stats.accuracy_since(days=30)
+                weak_table = Table(
+                    title=f"🎯 Weakest Questions (last 30 days: {last_30 if last_30 is not None else '-'}% correct)",
+                    box=table_box
+                )
+                weak_table.add_column("Question", style="white")
+                weak_table.add_column("Attempts", style="dim white")
+                weak_table.add_column("Accuracy", style="red")
+                
+                for row in weakest:
+                    question = self.bank.find_question(row["category"], row["question_id"])
+                    text = question["question"] if question else row["question_id"]
+                    weak_table.add_row(text, str(row["attempts"]), f"{row['accuracy']}%")
+                
+                console.print(weak_table)
     
     def show_help(self):
         help_text = """
@@ -431,6 +3114,8 @@ Percentage: {percentage}%
 🎯 [bold]Quiz Modes:[/bold]
    • Category Quiz: Focus on specific topics
    • Mixed Quiz: Random questions from all categories
+   • Adaptive Quiz: Once the bank is calibrated, questions match your level and it stops early
+   • Spaced Review: Questions you missed come back sooner, ones you know wait longer
 
 📚 [bold]Categories Available:[/bold]
    • Data Structures: Arrays, stacks, queues, trees, etc.
@@ -450,40 +3135,152 @@ Percentage: {percentage}%
    • Use this tool as part of your interview preparation
         """
         
-        console.print(Panel(help_text.strip(), title="[bold blue]Help[/bold blue]", border_style="blue"))
+        def build():
+            from rich.panel import Panel
+            
+            if self.compact:
+                # Drop the heading emoji
+                return re.sub(r"^\S+ (?=\[bold\])", "", help_text.strip(), flags=re.MULTILINE)
+            return Panel(help_text.strip(), title="[bold blue]Help[/bold blue]", border_style="blue")
+        self.paint("help", build)
     
     def run_mixed_quiz(self):
+        from rich.prompt import Prompt
+        
+        choices = ["5", "10", "15", "20"]
+        # Draw the largest quiz on offer (loading its shards) while the learner
+        # picks a size; any prefix of a random sample is itself a random sample
+        drawn = self.preload(self.bank.sample, int(choices[-1]))
+        
+        num_questions = int(Prompt.ask(
+            "[bold cyan]How many questions?[/bold cyan]",
+            choices=choices,
+            default="10"
+        ))
+        
+        items = self.wait_for(drawn, "Loading quiz...")[:num_questions]
+        self.session = self.engine.start_session(label="Mixed Topics", items=items)
+        
+        console.print(f"\n[bold green]Starting Mixed Quiz![/bold green]")
+        console.print(f"[dim]{self.session.total} random questions from all categories[/dim]\n")
+        
+        self.play_session(show_category=True)
+        
+        self.show_quiz_results(self.session.label)
+        self.stats_ready()
+        self.engine.finish(self.session)
+    
+    def run_adaptive_quiz(self):
+        from rich.panel import Panel
+        
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            console.print(f"[yellow]{NUMPY_MISSING}[/yellow]")
+            return
+        
+        # Every question in the bank is a candidate
+        keys = self.bank.category_keys()
+        items = self.wait_for(
+            self.preload(lambda: [(key, question) for key in keys for question in self.bank.load_category(key)]),
+            "Loading quiz..."
+        )
+        params = self.bank.calibration()
+        test = AdaptiveTest(items, params)
+        self.session = self.engine.start_session(label="Adaptive", items=[])
+        
+        console.print(f"\n[bold green]Starting Adaptive Quiz![/bold green]")
+        if params:
+            console.print(f"[dim]Questions are picked for your level; the quiz ends once your score is reliable "
+                          f"(at most {test.max_questions} questions)[/dim]")
+        else:
+            # With every question at average difficulty the estimate never gets precise enough to stop early
+            console.print(f"[dim]This bank has not been calibrated yet (study-quiz calibrate, from SQLite stores), "
+                          f"so questions are not matched to your level and the quiz asks all "
+                          f"{test.max_questions}[/dim]")
+        console.print()
+        
+        while True:
+            item = test.next_question()
+            if item is None:
+                break
+            self.session.items.append(item)
+            category_key, question = item
+            self.show_category(category_key)
+            test.record(self.ask_question(question, self.session.total, test.max_questions))
+        
+        self.show_quiz_results(self.session.label)
+        console.print(Panel(
+            f"Estimated ability: {test.theta:+.2f} ± {test.se:.2f}\n"
+            f"Expected score on the whole bank: {test.expected_score()}%",
+            title="[bold cyan]Your Level[/bold cyan]",
+            border_style="cyan"
+        ))
+        self.stats_ready()
+        self.engine.finish(self.session)
+    
+    def run_review_quiz(self):
+        from rich.prompt import Prompt
+        
+        reviews = self.preload(ReviewScheduler) if self.reviews is None else None
+        
         num_questions = int(Prompt.ask(
             "[bold cyan]How many questions?[/bold cyan]",
             choices=["5", "10", "15", "20"],
             default="10"
         ))
+        if reviews is not None:
+            self.reviews = self.wait_for(reviews, "Loading your review schedule...")
         
-        all_questions = []
-        for category_key, category_data in QUIZ_DATA.items():
-            for question in category_data["questions"]:
-                question_copy = question.copy()
-                question_copy["category"] = category_data["name"]
-                all_questions.append(question_copy)
+        # Due reviews first, most overdue first
+        selected = []
+        while len(selected) < num_questions:
+            due = self.reviews.pop_due()
+            if due is None:
+                break
+            qid, category_key = due
+            question = self.bank.find_question(category_key, qid)
+            if question is None:
+                # The question was removed from the bank
+                self.reviews.forget(qid)
+                continue
+            selected.append((category_key, question))
+        due_count = len(selected)
+        
+        # Top up with questions that have never been reviewed
+        if len(selected) < num_questions:
+            chosen = {question_id(question) for _, question in selected}
+            for category_key, question in self.bank.sample(3 * num_questions):
+                qid = question_id(question)
+                if qid not in self.reviews.items and qid not in chosen:
+                    selected.append((category_key, question))
+                    chosen.add(qid)
+                    if len(selected) == num_questions:
+                        break
         
-        random.shuffle(all_questions)
-        selected_questions = all_questions[:num_questions]
+        if not selected:
+            console.print("[yellow]Nothing is due for review right now. Come back later![/yellow]")
+            return
         
-        self.current_score = 0
-        self.current_total = len(selected_questions)
+        self.session = self.engine.start_session(label="Spaced Review", items=selected)
         
-        console.print(f"\n[bold green]Starting Mixed Quiz![/bold green]")
-        console.print(f"[dim]{num_questions} random questions from all categories[/dim]\n")
+        console.print(f"\n[bold green]Starting Spaced Review![/bold green]")
+        console.print(f"[dim]{due_count} due for review, {len(selected) - due_count} new[/dim]\n")
         
-        for i, question in enumerate(selected_questions, 1):
-            console.print(f"[dim]Category: {question['category']}[/dim]")
-            self.ask_question(question, i, len(selected_questions))
+        results = self.play_session(show_category=True)
+        for (category_key, question), correct in zip(selected, results):
+            self.reviews.record(question_id(question), category_key, correct)
+        self.reviews.save()
         
-        self.show_quiz_results("Mixed Topics")
-        self.stats.add_session("Mixed Topics", self.current_score, self.current_total)
+        self.show_quiz_results(self.session.label)
+        self.stats_ready()
+        self.engine.finish(self.session)
     
     def run(self):
+        # Read the learner's history while the banner and menu are on screen
+        self._stats_ready = self.preload(lambda: self.stats.data)
         self.display_banner()
+        tracer.add("startup", STARTED_NS, time.perf_counter_ns())
         
         while True:
             try:
@@ -497,16 +3294,23 @@ Percentage: {percentage}%
                     self.run_mixed_quiz()
                     
                 elif choice == "3":
-                    self.show_statistics()
+                    self.run_adaptive_quiz()
                     
                 elif choice == "4":
-                    self.show_help()
+                    self.run_review_quiz()
                     
                 elif choice == "5":
-                    console.print("\n[bold green]Thanks for studying! Keep up the great work! 🎓[/bold green]")
+                    self.show_statistics()
+                    
+                elif choice == "6":
+                    self.show_help()
+                    
+                elif choice == "7":
+                    console.print("\n[bold green]Thanks for studying! Keep up the great work!"
+                                  f"{'' if self.compact else ' 🎓'}[/bold green]")
                     break
                 
-                console.print("\n" + "="*50 + "\n")
+                console.print("" if self.compact else "\n" + "="*50 + "\n")
                 
             except KeyboardInterrupt:
                 console.print("\n\n[bold yellow]Quiz interrupted. See you next time![/bold yellow]")
@@ -515,9 +3319,357 @@ Percentage: {percentage}%
                 console.print(f"\n[bold red]An error occurred: {e}[/bold red]")
                 console.print("[dim]Please try again or restart the application.[/dim]")
 
-def main():
-    app = QuizApp()
+def cmd_quiz(args):
+    try:
+        import rich  # noqa: F401
+    except ImportError:
+        print("The 'rich' package is required. Install it with: pip install -r requirements.txt")
+        sys.exit(1)
+    
+    display = args.display or os.environ.get("STUDY_QUIZ_DISPLAY") or "full"
+    if display not in DISPLAY_MODES:
+        print(f"Unknown display mode {display!r}; choose from {', '.join(DISPLAY_MODES)}")
+        sys.exit(1)
+    console.configure(**DISPLAY_CONSOLE[display])
+    app = QuizApp(bank=QuestionBank(args.bank), stats=open_stats(args.stats_backend, args.stats), display=display)
     app.run()
 
+def cmd_manifest(args):
+    bank = QuestionBank(args.bank)
+    entries = bank.build_manifest(write=True)
+    for entry in entries:
+        print(f"{entry['key']:<24} {entry['count']:>6} questions  ({entry['file']})")
+    print(f"Wrote {bank.bank_dir / QuestionBank.MANIFEST}")
+
+def cmd_compile(args):
+    bank = QuestionBank(args.bank)
+    bank.build_manifest(write=True)
+    
+    failed = False
+    total = 0
+    for key in bank.category_keys():
+        try:
+            total += len(bank.compile_category(key))
+        except QuestionBankError as e:
+            failed = True
+            print(e)
+    
+    if failed:
+        print("Question bank has errors; fix them and run compile again.")
+        sys.exit(1)
+    print(f"Compiled {total} questions in {len(bank.category_keys())} categories into {bank.cache_dir}")
+
+def cmd_search(args):
+    bank = QuestionBank(args.bank)
+    index = SearchIndex.for_bank(bank)
+    query = " ".join(args.query)
+    results = index.search(query, limit=args.limit)
+    if not results:
+        print(f"No questions match {query!r}")
+        return
+    for key, i, score in results:
+        question = bank.load_category(key)[i]
+        print(f"{score:>6.2f}  {key}/{question_id(question)}  {question['question']}")
+
+def cmd_dedupe(args):
+    bank = QuestionBank(args.bank)
+    items = [(key, question) for key in bank.category_keys() for question in bank.load_category(key)]
+    groups = find_near_duplicates(items, threshold=args.threshold)
+    
+    for n, group in enumerate(groups, 1):
+        members = sorted({i for pair in group for i in pair[:2]})
+        best = max(similarity for _, _, similarity in group)
+        print(f"Group {n} (similarity up to {best:.2f}):")
+        for i in members:
+            key, question = items[i]
+            print(f"  {key}/{question_id(question)}  {question['question']}")
+    print(f"{len(groups)} groups of near-duplicates among {len(items)} questions (threshold {args.threshold})")
+
+def cmd_calibrate(args):
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print(NUMPY_MISSING)
+        sys.exit(1)
+    
+    stores = []
+    for path in map(Path, args.stores or [args.stats or "study_stats.db"]):
+        if path.is_dir():
+            stores.extend(str(p) for p in sorted(path.rglob("*.db")))
+        elif path.exists():
+            stores.append(str(path))
+        else:
+            print(f"Skipping {path}: no such file")
+    
+    bank = QuestionBank(args.bank)
+    try:
+        summary = calibrate_bank(bank, stores)
+    except ValueError as e:
+        print(f"Nothing to calibrate: {e}. Per-answer history is kept by --stats-backend sqlite.")
+        sys.exit(1)
+    print(f"Fitted {summary['items']} questions from {summary['answers']} answers "
+          f"in {summary['sessions']} sessions across {len(stores)} stores")
+    print(f"Wrote {bank.bank_dir / bank.CALIBRATION}")
+
+def cmd_migrate(args):
+    db_file = args.stats or "study_stats.db"
+    try:
+        imported, archived = SQLiteStudyStats(db_file).migrate_from_json(args.json_file)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    print(f"Imported {imported} sessions from {args.json_file} into {db_file}")
+    if archived:
+        print(f"Imported {archived} archived daily summaries as aggregate rows")
+    print("Use --stats-backend sqlite (or STUDY_QUIZ_BACKEND=sqlite) to study with it.")
+
+def cmd_compact(args):
+    stats = open_stats(args.stats_backend, args.stats)
+    if isinstance(stats, SQLiteStudyStats):
+        stats.compact()
+        print(f"Vacuumed {stats.stats_file}")
+        return
+    
+    before = len(stats.data["sessions"])
+    stats.compact(retention_days=args.keep_days)
+    after = len(stats.data["sessions"])
+    print(f"Kept {after} raw sessions, folded {before - after} into {len(stats.data['archive'])} daily summaries")
+    print(f"Totals unchanged: {stats.data['correct_answers']}/{stats.data['total_questions']} correct "
+          f"across {stats.data['session_count']} sessions")
+
+def cmd_sync(args):
+    stats = open_stats(args.stats_backend, args.stats)
+    try:
+        sync = StatsSync(stats)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    
+    sync_dir = args.sync_dir or os.environ.get("STUDY_QUIZ_SYNC_DIR")
+    if not sync.enrolled:
+        if not sync_dir:
+            print("The first sync needs a shared directory: study-quiz sync DIR")
+            sys.exit(1)
+        queued = sync.enroll(sync_dir, args.device)
+        print(f"Syncing {stats.stats_file} as device '{sync.device}'; sending {queued} existing sessions once")
+    elif sync_dir and Path(sync_dir) != Path(sync.state["sync_dir"]):
+        sync.move(sync_dir)
+    
+    sent, received = sync.sync()
+    print(f"Sent {sent} sessions to {sync.state['sync_dir']}")
+    print(f"Received {sum(received.values())} sessions"
+          + (" (" + ", ".join(f"{n} from {device}" for device, n in sorted(received.items())) + ")" if received else ""))
+    print(f"Totals: {stats.data['correct_answers']}/{stats.data['total_questions']} correct "
+          f"across {stats.data['session_count']} sessions")
+
+def cmd_grade(args):
+    started = time.perf_counter()
+    summary = grade_directory(args.answer_dir, args.stats_dir, bank_dir=args.bank,
+                              backend=args.stats_backend, workers=args.workers)
+    elapsed = time.perf_counter() - started
+    
+    print(f"Graded {summary['sessions']} sheets ({summary['answers']} answers) for {summary['users']} users "
+          f"from {summary['files']} files in {elapsed:.1f}s")
+    if summary["unknown"]:
+        print(f"Skipped {summary['unknown']} answers whose question id is not in the bank")
+    if summary["problems"]:
+        print(f"Skipped {len(summary['problems'])} sheets or files that could not be graded:")
+        for problem in summary["problems"][:20]:
+            print(f"  {problem}")
+        if len(summary["problems"]) > 20:
+            print(f"  ... and {len(summary['problems']) - 20} more")
+    print(f"Results written under {args.stats_dir}/<user>/")
+
+def cmd_analytics(args):
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print(NUMPY_MISSING)
+        sys.exit(1)
+    
+    started = time.perf_counter()
+    report = cohort_analytics(args.stats_dir, workers=args.workers, trend_weeks=args.weeks)
+    elapsed = time.perf_counter() - started
+    if args.json:
+        atomic_write_json(Path(args.json), report, indent=2)
+    
+    print(f"{report['learners']} learners from {report['stores']} stores "
+          f"({report['reprocessed']} read, {report['stores'] - report['reprocessed']} from cache) in {elapsed:.1f}s")
+    if report["skipped"]:
+        print(f"Skipped {report['skipped']} files that are not stats stores")
+    
+    print(f"\n{'Category':<24} {'learners':>8} {'mean':>6} {'p10':>6} {'p25':>6} {'median':>6} {'p75':>6} {'p90':>6}"
+          f" {'trend':>7}")
+    for category, d in report["categories"].items():
+        slope = report["category_trends"][category]
+        print(f"{category:<24} {d['learners']:>8} {d['mean']:>6} {d['p10']:>6} {d['p25']:>6} {d['p50']:>6} "
+              f"{d['p75']:>6} {d['p90']:>6} {'' if slope is None else f'{slope:+.2f}':>7}")
+    
+    print("\nSessions per week")
+    widest = max([count for _, count in report["sessions_per_week"]] + [1])
+    for label, count in report["sessions_per_week"]:
+        print(f"  {label:>6}  {'#' * round(count / widest * 40):<40} {count}")
+    
+    print(f"\nWeekly accuracy (last {args.weeks} weeks)")
+    for week in report["weekly"][-args.weeks:]:
+        accuracy = "    -" if week["accuracy"] is None else f"{week['accuracy']:>5}%"
+        print(f"  {week['week']}  {accuracy:<6}  {week['sessions']:>6} sessions")
+    if report["trend"] is not None:
+        print(f"  Trend: {report['trend']:+.2f} points per week")
+    if args.json:
+        print(f"\nFull report written to {args.json}")
+
+def cmd_export(args):
+    fmt = args.format or (Path(args.output).suffix.lstrip(".") if args.output else "csv")
+    if fmt not in EXPORT_FORMATS:
+        print(f"Unknown export format {fmt!r}; choose one of {', '.join(EXPORT_FORMATS)}")
+        sys.exit(1)
+    if fmt in ("parquet", "arrow"):
+        if not args.output:
+            print(f"{fmt} export needs an output file: -o history.{fmt}")
+            sys.exit(1)
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print(f"{fmt} export needs pyarrow. Install it with: pip install pyarrow")
+            sys.exit(1)
+    
+    stats = open_stats(args.stats_backend, args.stats)
+    rows = stats.iter_sessions(since=args.since, until=args.until, categories=args.category)
+    if args.table == "categories":
+        rows, columns = iter(category_rows(rows)), CATEGORY_COLUMNS
+    else:
+        columns = SESSION_COLUMNS
+    
+    written = write_rows(rows, columns, fmt, args.output or sys.stdout)
+    if args.output:
+        print(f"Exported {written} {args.table} rows to {args.output}")
+
+def cmd_serve(args):
+    import asyncio
+    
+    bank = QuestionBank(args.bank)
+    # Load the whole bank up front; every session then shares it read-only
+    for key in bank.category_keys():
+        bank.load_category(key)
+    server = QuizServer(bank, args.stats_dir, backend=args.stats_backend, flush_interval=args.flush_interval,
+                        session_ttl=args.session_ttl)
+    
+    def ready(address):
+        print(f"Serving quizzes on http://{address[0]}:{address[1]} (stats in {args.stats_dir}/<user>/)", flush=True)
+    
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+    
+    import signal
+    
+    # Treat SIGTERM like Ctrl-C so queued sessions are flushed on the way out
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        asyncio.run(server.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        print(f"\nStopped after {server.finished_sessions} finished sessions.")
+
+def build_parser():
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog="study-quiz", description="Interactive programming quiz")
+    parser.add_argument("--bank", metavar="DIR",
+                        help="question bank directory (default: $STUDY_QUIZ_BANK or the bundled bank)")
+    parser.add_argument("--stats-backend", choices=["json", "sqlite"],
+                        help="where study history is kept (default: $STUDY_QUIZ_BACKEND or json)")
+    parser.add_argument("--stats", metavar="FILE",
+                        help="stats file (default: study_stats.json, or study_stats.db for sqlite)")
+    parser.add_argument("--trace", action="store_true",
+                        help="record timing spans as Chrome trace JSON in study_trace.json "
+                             "(or in $STUDY_QUIZ_TRACE, which also turns tracing on)")
+    parser.add_argument("--display", choices=DISPLAY_MODES,
+                        help="full (default), or compact/plain for slow connections: short lines, no box drawing "
+                             "or emoji, basic or no colour (default: $STUDY_QUIZ_DISPLAY or full)")
+    parser.set_defaults(func=cmd_quiz)
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    
+    manifest = commands.add_parser("manifest", help="rebuild the bank manifest after editing shards")
+    manifest.set_defaults(func=cmd_manifest)
+    
+    compile_ = commands.add_parser("compile", help="validate every question and rebuild the bank cache")
+    compile_.set_defaults(func=cmd_compile)
+    
+    search = commands.add_parser("search", help="find questions by words in their text, options or explanation")
+    search.add_argument("query", nargs="+")
+    search.add_argument("--limit", type=int, default=10, metavar="N")
+    search.set_defaults(func=cmd_search)
+    
+    dedupe = commands.add_parser("dedupe", help="report near-duplicate questions across the bank")
+    dedupe.add_argument("--threshold", type=float, default=0.6,
+                        help="minimum Jaccard similarity of word pairs (default: 0.6)")
+    dedupe.set_defaults(func=cmd_dedupe)
+    
+    calibrate = commands.add_parser("calibrate", help="fit per-question difficulty for the adaptive quiz (needs numpy)")
+    calibrate.add_argument("stores", nargs="*", metavar="STORE",
+                           help="SQLite stats files or directories of them (default: --stats or study_stats.db)")
+    calibrate.set_defaults(func=cmd_calibrate)
+    
+    compact = commands.add_parser("compact", help="fold the journal and old sessions into the snapshot")
+    compact.add_argument("--keep-days", type=int, metavar="N",
+                         help="keep raw sessions for N days (default: $STUDY_QUIZ_RETENTION_DAYS, or keep all)")
+    compact.set_defaults(func=cmd_compact)
+    
+    grade = commands.add_parser("grade", help="grade a directory of answer sheets in parallel")
+    grade.add_argument("answer_dir", help="directory of .json/.jsonl answer sheets")
+    grade.add_argument("--stats-dir", default="graded_stats", metavar="DIR",
+                       help="where per-user stats stores are written (default: graded_stats)")
+    grade.add_argument("--workers", type=int, metavar="N", help="worker processes (default: CPU count)")
+    grade.set_defaults(func=cmd_grade)
+    
+    analytics = commands.add_parser("analytics", help="cohort report over a directory of learners' stats files (needs numpy)")
+    analytics.add_argument("stats_dir", help="directory of study_stats.json files, searched recursively")
+    analytics.add_argument("--workers", type=int, metavar="N", help="worker processes (default: CPU count)")
+    analytics.add_argument("--weeks", type=int, default=12, metavar="N",
+                           help="weeks shown and used for trend lines (default: 12)")
+    analytics.add_argument("--json", metavar="FILE", help="also write the full report as JSON")
+    analytics.set_defaults(func=cmd_analytics)
+    
+    export = commands.add_parser("export", help="stream study history out as CSV, JSON Lines, Parquet or Arrow")
+    export.add_argument("table", nargs="?", choices=["sessions", "categories"], default="sessions")
+    export.add_argument("-o", "--output", metavar="FILE", help="output file (default: stdout)")
+    export.add_argument("--format", choices=EXPORT_FORMATS,
+                        help="default: from the output file's extension, else csv (parquet/arrow need pyarrow)")
+    export.add_argument("--since", metavar="YYYY-MM-DD", help="only sessions on or after this day")
+    export.add_argument("--until", metavar="YYYY-MM-DD", help="only sessions on or before this day")
+    export.add_argument("--category", action="append", metavar="NAME",
+                        help="only this category (repeat for several)")
+    export.set_defaults(func=cmd_export)
+    
+    serve = commands.add_parser("serve", help="serve many quiz sessions over HTTP+JSON on localhost")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--stats-dir", default="server_stats", metavar="DIR",
+                       help="where per-user stats stores are written (default: server_stats)")
+    serve.add_argument("--flush-interval", type=float, default=1.0, metavar="SECONDS",
+                       help="how often finished sessions are written back (default: 1.0)")
+    serve.add_argument("--session-ttl", type=float, default=3600.0, metavar="SECONDS",
+                       help="drop sessions left idle this long, unrecorded (default: 3600)")
+    serve.set_defaults(func=cmd_serve)
+    
+    sync = commands.add_parser("sync", help="exchange new sessions with your other devices through a shared directory")
+    sync.add_argument("sync_dir", nargs="?", metavar="DIR",
+                      help="shared directory (default: $STUDY_QUIZ_SYNC_DIR, else the one from the last sync)")
+    sync.add_argument("--device", metavar="NAME",
+                      help="this device's name on its first sync (default: host name plus a random suffix)")
+    sync.set_defaults(func=cmd_sync)
+    
+    migrate = commands.add_parser("migrate", help="copy study_stats.json history into a SQLite store")
+    migrate.add_argument("json_file", nargs="?", default="study_stats.json")
+    migrate.set_defaults(func=cmd_migrate)
+    return parser
+
+def main(argv: Optional[List[str]] = None):
+    args = build_parser().parse_args(argv)
+    trace_file = os.environ.get("STUDY_QUIZ_TRACE") or ("study_trace.json" if args.trace else None)
+    if trace_file:
+        tracer.enable(trace_file)
+    args.func(args)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
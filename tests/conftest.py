@@ -0,0 +1,36 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from quiz_app import QuestionBank  # noqa: E402
+
+
+@pytest.fixture
+def bank(tmp_path) -> QuestionBank:
+    """The shipped question bank, with its shard cache kept out of the repo."""
+    return QuestionBank(str(REPO_ROOT / "question_bank"), cache_dir=str(tmp_path / "bankcache"))
+
+
+@pytest.fixture
+def legacy_stats(tmp_path) -> Path:
+    """A study_stats.json as the original version wrote it: no rollups or archive."""
+    path = tmp_path / "study_stats.json"
+    path.write_text(json.dumps({
+        "total_questions": 15,
+        "correct_answers": 7,
+        "sessions": [
+            {"date": "2024-03-01T10:00:00", "category": "Algorithms", "score": 3, "total": 5, "percentage": 60.0},
+            {"date": "2024-03-02T10:00:00", "category": "Algorithms", "score": 0, "total": 5, "percentage": 0.0},
+            {"date": "2024-03-09T10:00:00", "category": "Big O Notation", "score": 4, "total": 5, "percentage": 80.0},
+        ],
+        "category_stats": {
+            "Algorithms": {"correct": 3, "total": 10},
+            "Big O Notation": {"correct": 4, "total": 5},
+        },
+    }, indent=2))
+    return path
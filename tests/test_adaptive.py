@@ -0,0 +1,57 @@
+import random
+import warnings
+
+import pytest
+
+from quiz_app import AdaptiveTest, fit_2pl, question_id
+
+np = pytest.importorskip("numpy")
+
+ITEMS = [("algorithms", {"question": f"Question {n}?", "options": ["yes", "no"], "correct": 0, "explanation": ""})
+         for n in range(200)]
+
+
+def run(params, seed=1):
+    rng = random.Random(seed)
+    test = AdaptiveTest(ITEMS, params)
+    while test.next_question() is not None:
+        test.record(rng.random() < 0.5)
+    return test.answered
+
+
+def test_uncalibrated_quiz_asks_every_question():
+    assert {run({}, seed) for seed in range(10)} == {20}
+
+
+def test_calibrated_quiz_stops_once_the_estimate_is_precise():
+    rng = random.Random(0)
+    params = {question_id(q): (2.0, rng.uniform(-2, 2)) for _, q in ITEMS}
+    lengths = [run(params, seed) for seed in range(10)]
+    assert all(5 <= n < 20 for n in lengths)
+
+
+def test_fit_2pl_recovers_known_parameters():
+    rng = np.random.default_rng(0)
+    n_persons, n_items, per_person = 2000, 50, 20
+    a = rng.uniform(0.5, 2, n_items)
+    b = rng.normal(0, 1, n_items)
+    theta = rng.normal(0, 1, n_persons)
+    persons = np.repeat(np.arange(n_persons), per_person)
+    items = np.concatenate([rng.choice(n_items, per_person, replace=False) for _ in range(n_persons)])
+    p = 1 / (1 + np.exp(-a[items] * (theta[persons] - b[items])))
+
+    fitted_theta, fitted_a, fitted_b = fit_2pl(persons, items, rng.random(p.size) < p)
+    assert np.corrcoef(a, fitted_a)[0, 1] > 0.85
+    assert np.corrcoef(b, fitted_b)[0, 1] > 0.98
+    assert np.abs(fitted_b).max() < 4
+    assert np.corrcoef(theta, fitted_theta)[0, 1] > 0.85
+
+
+def test_confident_answers_do_not_warn():
+    params = {question_id(q): (8.0, -3.9) for _, q in ITEMS}
+    test = AdaptiveTest(ITEMS, params)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        while test.next_question() is not None:
+            test.record(False)
+    assert np.isfinite(test.theta)
@@ -0,0 +1,63 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from quiz_app import StudyStats, cohort_analytics, summarize_stats_file
+
+np = pytest.importorskip("numpy")
+
+MONDAY = datetime(2024, 1, 1, 9)  # 2024-W01
+
+
+def record(stats, week, category, score, total=10):
+    session = StudyStats.new_session(category, score, total)
+    session["date"] = (MONDAY + timedelta(weeks=week)).isoformat()
+    stats.add_sessions([session])
+
+
+def test_trend_keeps_empty_weeks_as_gaps(tmp_path):
+    (tmp_path / "ada").mkdir()
+    stats = StudyStats(str(tmp_path / "ada" / "study_stats.json"))
+    for week, score in [(0, 5), (1, 6), (10, 7)]:
+        record(stats, week, "Algorithms", score)
+
+    report = cohort_analytics(str(tmp_path), workers=1)
+    assert [w["week"] for w in report["weekly"]][:3] == ["2024-W01", "2024-W02", "2024-W03"]
+    assert len(report["weekly"]) == 11
+    assert [w["accuracy"] for w in report["weekly"]].count(None) == 8
+    expected = round(float(np.polyfit([0, 1, 10], [50, 60, 70], 1)[0]), 2)
+    assert report["trend"] == expected
+    assert report["category_trends"]["Algorithms"] == expected
+
+
+def test_summary_reads_journal_without_locking(tmp_path):
+    path = tmp_path / "study_stats.json"
+    stats = StudyStats(str(path))
+    stats.add_sessions([StudyStats.new_session("Algorithms", 3, 5)])
+    stats.save_stats()
+    stats.add_session("Algorithms", 4, 5)
+    os.unlink(tmp_path / "study_stats.lock")
+    before = sorted(os.listdir(tmp_path))
+
+    summary = summarize_stats_file(str(path))
+    assert summary["categories"] == {"Algorithms": [7, 10]}
+    assert sorted(os.listdir(tmp_path)) == before
+
+
+def test_summary_of_a_legacy_store(legacy_stats):
+    summary = summarize_stats_file(str(legacy_stats))
+    assert summary["categories"] == {"Algorithms": [3, 10], "Big O Notation": [4, 5]}
+    assert summary["weekly"]["2024-W09"]["Algorithms"] == [3, 10, 2]
+
+
+def test_summary_skips_a_journal_the_snapshot_already_holds(tmp_path):
+    path = tmp_path / "study_stats.json"
+    for score in (1, 2, 3):
+        StudyStats(str(path)).add_session("Algorithms", score, 5)
+    journal = (tmp_path / "study_stats.journal").read_bytes()
+    StudyStats(str(path)).save_stats()
+    # A reader that opens the new snapshot before the old journal is unlinked sees both
+    (tmp_path / "study_stats.journal").write_bytes(journal)
+
+    assert summarize_stats_file(str(path))["categories"] == {"Algorithms": [6, 15]}
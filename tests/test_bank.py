@@ -0,0 +1,33 @@
+import os
+import shutil
+
+import pytest
+
+import quiz_app
+from conftest import REPO_ROOT
+from quiz_app import QuestionBank
+
+
+@pytest.fixture
+def bank_dir(tmp_path):
+    path = tmp_path / "bank"
+    shutil.copytree(REPO_ROOT / "question_bank", path, ignore=shutil.ignore_patterns("__bankcache__"))
+    return path
+
+
+def test_cache_hit_by_hash_refreshes_the_stale_header(bank_dir, monkeypatch):
+    key = QuestionBank(str(bank_dir)).category_keys()[0]
+    expected = [q.fields() for q in QuestionBank(str(bank_dir)).load_category(key)]
+    shard = bank_dir / QuestionBank(str(bank_dir)).manifest[key]["file"]
+    # Same content, new mtime, as after a fresh checkout
+    os.utime(shard, ns=(shard.stat().st_atime_ns, shard.stat().st_mtime_ns + 10**9))
+
+    hashed = []
+    real_sha256 = quiz_app.file_sha256
+    monkeypatch.setattr(quiz_app, "file_sha256", lambda path: hashed.append(path) or real_sha256(path))
+    assert [q.fields() for q in QuestionBank(str(bank_dir)).load_category(key)] == expected
+    assert hashed == [shard]
+
+    hashed.clear()
+    assert [q.fields() for q in QuestionBank(str(bank_dir)).load_category(key)] == expected
+    assert hashed == []
@@ -0,0 +1,68 @@
+import argparse
+
+import pytest
+
+from quiz_app import SQLiteStudyStats, StudyStats, cmd_compact
+
+
+def aggregates(data):
+    return (data["total_questions"], data["correct_answers"], data["category_stats"],
+            data["session_count"], data["rollups"]["weekly"])
+
+
+def test_compaction_keeps_aggregates_unchanged(legacy_stats):
+    before = aggregates(StudyStats(str(legacy_stats)).data)
+
+    stats = StudyStats(str(legacy_stats))
+    stats.compact(retention_days=30)
+    assert stats.data["sessions"] == []
+    assert [r["sessions"] for r in stats.data["archive"]] == [1, 1, 1]
+
+    assert aggregates(StudyStats(str(legacy_stats)).data) == before
+
+
+def test_sessions_after_compaction_add_to_folded_totals(legacy_stats):
+    StudyStats(str(legacy_stats)).compact(retention_days=30)
+    StudyStats(str(legacy_stats)).add_session("Algorithms", 2, 5)
+
+    data = StudyStats(str(legacy_stats)).data
+    assert (data["total_questions"], data["correct_answers"], data["session_count"]) == (20, 9, 4)
+    assert data["category_stats"]["Algorithms"] == {"correct": 5, "total": 15}
+
+
+def test_compact_command_on_legacy_store(legacy_stats, capsys):
+    cmd_compact(argparse.Namespace(stats_backend="json", stats=str(legacy_stats), keep_days=None))
+
+    out = capsys.readouterr().out
+    assert "Kept 3 raw sessions, folded 0 into 0 daily summaries" in out
+    assert "7/15 correct across 3 sessions" in out
+
+
+def test_iter_sessions_counts_archived_days(legacy_stats):
+    StudyStats(str(legacy_stats)).compact(retention_days=30)
+
+    rows = list(StudyStats(str(legacy_stats)).iter_sessions(categories=["Algorithms"]))
+    assert sum(r["sessions"] for r in rows) == 2
+    assert sum(r["score"] for r in rows) == 3
+
+
+def test_migrating_a_compacted_store_keeps_its_archive(legacy_stats, tmp_path):
+    stats = StudyStats(str(legacy_stats))
+    stats.compact(retention_days=30)
+    stats.add_session("Algorithms", 2, 5)
+    expected = aggregates(StudyStats(str(legacy_stats)).data)
+
+    db = SQLiteStudyStats(str(tmp_path / "study_stats.db"))
+    assert db.migrate_from_json(str(legacy_stats)) == (1, 3)
+    assert aggregates(db.data) == expected
+    assert aggregates(SQLiteStudyStats(str(tmp_path / "study_stats.db")).data) == expected
+    assert sum(r["sessions"] for r in db.iter_sessions(since="2024-03-01", until="2024-03-02")) == 2
+
+
+def test_migration_refuses_to_run_twice(legacy_stats, tmp_path):
+    StudyStats(str(legacy_stats)).compact(retention_days=30)
+    db = SQLiteStudyStats(str(tmp_path / "study_stats.db"))
+    db.migrate_from_json(str(legacy_stats))
+
+    with pytest.raises(ValueError, match="refusing to migrate twice"):
+        db.migrate_from_json(str(legacy_stats))
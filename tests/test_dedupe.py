@@ -0,0 +1,54 @@
+import itertools
+
+import pytest
+
+from quiz_app import find_near_duplicates, informative_shingles, lsh_parameters
+
+
+@pytest.fixture
+def items(bank):
+    return [(key, question) for key in bank.category_keys() for question in bank.load_category(key)]
+
+
+def exact_pairs(items, threshold):
+    sets = informative_shingles([question for _, question in items])
+    return {(a, b) for a, b in itertools.combinations(range(len(sets)), 2)
+            if sets[a] and sets[b] and len(sets[a] & sets[b]) / len(sets[a] | sets[b]) >= threshold}
+
+
+@pytest.mark.parametrize("threshold", [0.3, 0.4, 0.6, 0.8])
+def test_finds_every_pair_above_threshold_in_the_shipped_bank(items, threshold):
+    found = {(a, b) for group in find_near_duplicates(items, threshold=threshold) for a, b, _ in group}
+    assert found == exact_pairs(items, threshold)
+
+
+def test_low_threshold_catches_a_loosely_similar_pair(items):
+    assert any(0.3 <= similarity < 0.4
+               for group in find_near_duplicates(items, threshold=0.3) for _, _, similarity in group)
+
+
+def templated(n):
+    return [("big_o", {"question": f"What is the time complexity of the q{i}a q{i}b q{i}c operation?",
+                       "options": ["O(1)", "O(n)"], "correct": 1, "explanation": ""}) for i in range(n)]
+
+
+def test_template_wording_does_not_make_questions_duplicates():
+    items = templated(2000)
+    copy = dict(items[7][1], question=items[7][1]["question"].replace("q7c", "q7d"))
+    items.append(("python", copy))
+
+    groups = find_near_duplicates(items, threshold=0.3)
+    assert [[pair[:2] for pair in group] for group in groups] == [[(7, 2000)]]
+
+
+def test_a_bank_of_one_question_copied_is_still_all_duplicates():
+    items = templated(1) * 50
+    groups = find_near_duplicates(items, threshold=0.9)
+    assert len(groups) == 1 and len(groups[0]) == 50 * 49 // 2
+
+
+@pytest.mark.parametrize("threshold", [0.2, 0.3, 0.5, 0.6, 0.8, 0.9])
+def test_lsh_parameters_reach_the_recall_target(threshold):
+    bands, rows = lsh_parameters(threshold)
+    assert bands * rows <= 64
+    assert 1 - (1 - threshold ** rows) ** bands >= 0.99
@@ -0,0 +1,92 @@
+import argparse
+import csv
+import json
+
+import pytest
+
+from quiz_app import SQLiteStudyStats, StatsSync, StudyStats, cmd_export
+
+
+def export(stats_file, output, table="sessions", backend="json", **filters):
+    args = dict(table=table, output=str(output), format=None, since=None, until=None, category=None,
+                stats_backend=backend, stats=str(stats_file))
+    cmd_export(argparse.Namespace(**dict(args, **filters)))
+
+
+@pytest.fixture
+def history(legacy_stats):
+    """Two archived days, one raw session in the snapshot and one in the journal."""
+    stats = StudyStats(str(legacy_stats))
+    stats.fold_sessions_before("2024-03-03")
+    stats.save_stats()
+    StudyStats(str(legacy_stats)).add_session("Algorithms", 5, 5)
+    return legacy_stats
+
+
+def test_csv_rows_add_up_to_the_store_totals(history, tmp_path):
+    export(history, tmp_path / "out.csv")
+    with open(tmp_path / "out.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    data = StudyStats(str(history)).data
+    assert len(rows) == 4
+    assert sum(int(r["sessions"]) for r in rows) == data["session_count"]
+    assert sum(int(r["score"]) for r in rows) == data["correct_answers"]
+    assert sum(int(r["total"]) for r in rows) == data["total_questions"]
+
+
+def test_filters_apply_to_archived_and_raw_rows(history, tmp_path):
+    export(history, tmp_path / "out.jsonl", since="2024-03-02", until="2024-03-09", category=["Algorithms"])
+    rows = [json.loads(line) for line in open(tmp_path / "out.jsonl")]
+    assert [(r["date"][:10], r["score"], r["sessions"]) for r in rows] == [("2024-03-02", 0, 1)]
+
+
+def test_category_table_matches_category_stats(history, tmp_path):
+    export(history, tmp_path / "categories.jsonl", table="categories")
+    rows = {r["category"]: r for r in map(json.loads, open(tmp_path / "categories.jsonl"))}
+    for category, counts in StudyStats(str(history)).data["category_stats"].items():
+        assert (rows[category]["correct"], rows[category]["total"]) == (counts["correct"], counts["total"])
+
+
+def test_sqlite_store_exports_the_same_rows(history, tmp_path):
+    db = tmp_path / "study_stats.db"
+    SQLiteStudyStats(str(db)).migrate_from_json(str(history))
+    export(history, tmp_path / "json.jsonl")
+    export(db, tmp_path / "sqlite.jsonl", backend="sqlite")
+    # Row order follows each store's layout; the rows themselves must match
+    assert sorted(open(tmp_path / "json.jsonl")) == sorted(open(tmp_path / "sqlite.jsonl"))
+
+
+def test_synced_records_export_like_the_store_counts_them(history, tmp_path):
+    share, lab = tmp_path / "share", tmp_path / "lab" / "study_stats.json"
+    lab.parent.mkdir()
+    StatsSync(StudyStats(str(history))).enroll(str(share), "laptop")
+    StatsSync(StudyStats(str(lab))).enroll(str(share), "lab")
+    StatsSync(StudyStats(str(history))).push()
+    cursor = (lab.parent / "study_stats.sync.json").read_bytes()
+    StatsSync(StudyStats(str(lab))).pull()
+    # As if the pull crashed before saving how far it had read: the delta is pulled again
+    (lab.parent / "study_stats.sync.json").write_bytes(cursor)
+    StatsSync(StudyStats(str(lab))).pull()
+
+    export(lab, tmp_path / "out.jsonl")
+    rows = [json.loads(line) for line in open(tmp_path / "out.jsonl")]
+    data = StudyStats(str(lab)).data
+    assert sum(r["sessions"] for r in rows) == data["session_count"] == 4
+    assert sum(r["total"] for r in rows) == data["total_questions"] == 20
+    archived = [r for r in rows if r["date"] < "2024-03-03"]
+    assert [(r["sessions"], r["percentage"]) for r in archived] == [(1, 60.0), (1, 0.0)]
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_columnar_export_round_trips(history, tmp_path, fmt):
+    pa = pytest.importorskip("pyarrow")
+    export(history, tmp_path / f"out.{fmt}")
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(str(tmp_path / "out.parquet"))
+    else:
+        table = pa.ipc.open_file(str(tmp_path / "out.arrow")).read_all()
+    export(history, tmp_path / "out.jsonl")
+    assert table.to_pylist() == [json.loads(line) for line in open(tmp_path / "out.jsonl")]
@@ -0,0 +1,71 @@
+import json
+import shutil
+
+import pytest
+
+from conftest import REPO_ROOT
+from quiz_app import QuestionBank, StudyStats, grade_directory, question_id
+
+
+@pytest.fixture
+def bank_dir(tmp_path):
+    path = tmp_path / "bank"
+    shutil.copytree(REPO_ROOT / "question_bank", path, ignore=shutil.ignore_patterns("__bankcache__"))
+    return path
+
+
+@pytest.fixture
+def questions(bank_dir):
+    bank = QuestionBank(str(bank_dir))
+    return [question for key in bank.category_keys() for question in bank.load_category(key)][:3]
+
+
+def sheet(user, questions, choices):
+    return {"user": user, "label": "Week 1", "date": "2024-03-04T09:00:00",
+            "answers": [{"question_id": question_id(q), "choice": c} for q, c in zip(questions, choices)]}
+
+
+def right(question):
+    return question["correct"] + 1
+
+
+def wrong(question):
+    return (question["correct"] + 1) % len(question["options"]) + 1
+
+
+def test_sheets_are_graded_into_each_users_store(bank_dir, questions, tmp_path):
+    answers = tmp_path / "answers"
+    answers.mkdir()
+    (answers / "ada.json").write_text(json.dumps(sheet("ada", questions, [right(q) for q in questions])))
+    (answers / "bob.jsonl").write_text(
+        json.dumps(sheet("bob", questions, [right(questions[0]), wrong(questions[1]), wrong(questions[2])])) + "\n"
+        + json.dumps(sheet("bob", questions[:1], [right(questions[0])])) + "\n")
+
+    summary = grade_directory(str(answers), str(tmp_path / "stats"), bank_dir=str(bank_dir), workers=2)
+    assert (summary["files"], summary["sessions"], summary["users"], summary["answers"]) == (2, 3, 2, 7)
+    assert summary["problems"] == []
+
+    ada = StudyStats(str(tmp_path / "stats" / "ada" / "study_stats.json")).data
+    bob = StudyStats(str(tmp_path / "stats" / "bob" / "study_stats.json")).data
+    assert (ada["correct_answers"], ada["total_questions"]) == (3, 3)
+    assert (bob["correct_answers"], bob["total_questions"], bob["session_count"]) == (2, 4, 2)
+
+
+def test_bad_sheets_are_skipped_and_reported(bank_dir, questions, tmp_path):
+    answers = tmp_path / "answers"
+    answers.mkdir()
+    good = sheet("ada", questions, [right(q) for q in questions])
+    unknown = dict(good, answers=good["answers"] + [{"question_id": "no-such-question", "choice": 1}])
+    (answers / "mixed.jsonl").write_text("\n".join(json.dumps(s) for s in [
+        {"label": "no user", "answers": good["answers"]},
+        dict(good, answers=[{"question_id": question_id(questions[0]), "choice": "two"}]),
+        ["not", "a", "sheet"],
+        unknown,
+    ]) + "\n")
+    (answers / "broken.json").write_text('{"user": "bob", "answers": [')
+
+    summary = grade_directory(str(answers), str(tmp_path / "stats"), bank_dir=str(bank_dir), workers=2)
+    assert (summary["sessions"], summary["users"], summary["unknown"]) == (1, 1, 1)
+    assert len(summary["problems"]) == 4
+    assert any("broken.json" in problem for problem in summary["problems"])
+    assert any("mixed.jsonl: sheet 1: KeyError" in problem for problem in summary["problems"])
@@ -0,0 +1,46 @@
+from quiz_app import ReviewScheduler
+
+
+def test_forget_is_saved(tmp_path):
+    path = str(tmp_path / "study_review.json")
+    reviews = ReviewScheduler(path)
+    reviews.record("q1", "algorithms", True, now=100.0)
+    reviews.record("q2", "algorithms", False, now=100.0)
+    reviews.save()
+
+    reviews = ReviewScheduler(path)
+    reviews.forget("q1", now=200.0)
+    reviews.save()
+    assert set(ReviewScheduler(path).items) == {"q2"}
+
+
+def test_stale_copy_does_not_bring_a_forgotten_question_back(tmp_path):
+    path = str(tmp_path / "study_review.json")
+    reviews = ReviewScheduler(path)
+    reviews.record("q1", "algorithms", True, now=100.0)
+    reviews.save()
+
+    stale = ReviewScheduler(path)
+    forgetting = ReviewScheduler(path)
+    forgetting.forget("q1", now=200.0)
+    forgetting.save()
+    stale.record("q2", "algorithms", True, now=300.0)
+    stale.save()
+
+    assert set(ReviewScheduler(path).items) == {"q2"}
+
+
+def test_reviewing_again_after_forget_schedules_it_again(tmp_path):
+    path = str(tmp_path / "study_review.json")
+    reviews = ReviewScheduler(path)
+    reviews.record("q1", "algorithms", True, now=100.0)
+    reviews.forget("q1", now=200.0)
+    reviews.save()
+
+    reviews = ReviewScheduler(path)
+    reviews.record("q1", "algorithms", False, now=300.0)
+    reviews.save()
+    saved = ReviewScheduler(path)
+    assert saved.items["q1"]["reviewed"] == 300.0
+    assert saved.forgotten == {}
+    assert saved.pop_due(now=300.0 + ReviewScheduler.LAPSE_DELAY) == ("q1", "algorithms")
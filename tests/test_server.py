@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+from quiz_app import QuizServer
+
+
+@pytest.fixture
+def server(bank, tmp_path):
+    return QuizServer(bank, str(tmp_path / "server_stats"))
+
+
+def post(server, path, body):
+    return server.dispatch("POST", path, json.dumps(body).encode())
+
+
+@pytest.mark.parametrize("body", [
+    {"user": "ada", "num_questions": "5"},
+    {"user": "ada", "num_questions": -3},
+    {"user": "ada", "num_questions": 0},
+    {"user": "ada", "num_questions": 2.5},
+    {"user": "ada", "num_questions": True},
+    {"user": "ada", "category": ["python"]},
+    {"user": ["ada"]},
+    {"user": "a" * 300},
+    {},
+])
+def test_bad_session_requests_are_rejected(server, body):
+    status, payload = post(server, "/sessions", body)
+    assert status == 400
+    assert "error" in payload
+    assert server.sessions == {}
+
+
+def test_session_runs_to_a_recorded_result(server, bank):
+    category = bank.category_keys()[0]
+    status, payload = post(server, "/sessions", {"user": "ada", "category": category, "num_questions": 2})
+    assert status == 201 and payload["total"] == 2
+    session_id = payload["session_id"]
+
+    for _ in range(2):
+        assert post(server, f"/sessions/{session_id}/answer", {"choice": 1})[0] == 200
+    status, summary = post(server, f"/sessions/{session_id}/finish", {})
+    assert status == 200
+    assert server.flush() == 1
+
+
+@pytest.mark.parametrize("choice", [True, 1.0, "1"])
+def test_choice_must_be_an_integer(server, choice):
+    session_id = post(server, "/sessions", {"user": "ada"})[1]["session_id"]
+    assert post(server, f"/sessions/{session_id}/answer", {"choice": choice})[0] == 400
+
+
+def finish_one(server, user):
+    session_id = post(server, "/sessions", {"user": user, "num_questions": 1})[1]["session_id"]
+    post(server, f"/sessions/{session_id}/answer", {"choice": 1})
+    post(server, f"/sessions/{session_id}/finish", {})
+
+
+def test_a_failing_store_does_not_lose_other_users_sessions(server, monkeypatch):
+    import quiz_app
+
+    real_open = quiz_app.open_user_stats
+    broken = {"bob"}
+
+    def open_user_stats(stats_dir, user, backend=None):
+        if user in broken:
+            raise OSError("disk says no")
+        return real_open(stats_dir, user, backend)
+
+    monkeypatch.setattr(quiz_app, "open_user_stats", open_user_stats)
+    for user in ("ada", "bob", "cy"):
+        finish_one(server, user)
+
+    assert server.flush() == 2
+    assert list(server.pending) == ["bob"]
+    finish_one(server, "bob")
+    broken.clear()
+    assert server.flush() == 2
+    assert server.pending == {}
+    assert server.stores["bob"].data["session_count"] == 2
+
+
+def test_idle_sessions_expire(server):
+    first = post(server, "/sessions", {"user": "ada"})[1]["session_id"]
+    second = post(server, "/sessions", {"user": "bob"})[1]["session_id"]
+    _, _, last_used = server.sessions[second]
+
+    assert server.expire_sessions(now=last_used + server.session_ttl + 1) == 2
+    assert server.dispatch("GET", f"/sessions/{first}", b"")[0] == 404
+
+
+def test_using_a_session_keeps_it_alive(server, monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr("quiz_app.time.monotonic", lambda: clock[0])
+    first = post(server, "/sessions", {"user": "ada"})[1]["session_id"]
+    clock[0] = 10.0
+    post(server, "/sessions", {"user": "bob"})
+    clock[0] = 20.0
+    server.dispatch("GET", f"/sessions/{first}", b"")
+
+    assert server.expire_sessions(now=server.session_ttl + 15.0) == 1
+    assert list(server.sessions) == [first]
+
+
+def test_open_sessions_are_capped(server, monkeypatch):
+    monkeypatch.setattr(QuizServer, "MAX_SESSIONS", 2)
+    assert post(server, "/sessions", {"user": "ada"})[0] == 201
+    assert post(server, "/sessions", {"user": "ada"})[0] == 201
+    assert post(server, "/sessions", {"user": "ada"})[0] == 503
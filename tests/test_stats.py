@@ -0,0 +1,26 @@
+import json
+
+from quiz_app import StudyStats
+
+
+def totals(data):
+    return data["total_questions"], data["correct_answers"], data["category_stats"]
+
+
+def test_legacy_snapshot_loads_with_totals_unchanged(legacy_stats):
+    before = json.loads(legacy_stats.read_text())
+    stats = StudyStats(str(legacy_stats))
+    assert totals(stats.data) == totals(before)
+    assert stats.data["session_count"] == 3
+    assert [entry["score"] for entry in stats.data["recent"]] == [3, 0, 4]
+    assert stats.data["rollups"]["weekly"]["2024-W09"]["Algorithms"] == {"correct": 3, "total": 10, "sessions": 2}
+
+
+def test_legacy_snapshot_totals_survive_a_new_session(legacy_stats):
+    stats = StudyStats(str(legacy_stats))
+    stats.add_session("Algorithms", 2, 5)
+    stats.save_stats()
+    data = StudyStats(str(legacy_stats)).data
+    assert data["total_questions"] == 20
+    assert data["correct_answers"] == 9
+    assert data["category_stats"]["Algorithms"] == {"correct": 5, "total": 15}
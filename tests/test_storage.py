@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+import stat
+
+import pytest
+
+from quiz_app import StudyStats, atomic_write_bytes
+
+WRITERS = 4
+SESSIONS = 30
+
+
+def writer(stats_file: str, writer_id: int, journaled: bool):
+    stats = StudyStats(stats_file, journaled=journaled)
+    stats.COMPACT_EVERY = 7  # compact often so snapshot swaps race with appends
+    for i in range(SESSIONS):
+        stats.add_session(f"writer-{writer_id}", i % 5, 5)
+
+
+@pytest.mark.parametrize("journaled", [True, False], ids=["journaled", "snapshot"])
+def test_concurrent_writers_lose_nothing(tmp_path, journaled):
+    stats_file = str(tmp_path / "study_stats.json")
+    procs = [multiprocessing.Process(target=writer, args=(stats_file, w, journaled)) for w in range(WRITERS)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    assert [p.exitcode for p in procs] == [0] * WRITERS
+
+    data = StudyStats(stats_file).data
+    assert len(data["sessions"]) == data["session_count"] == WRITERS * SESSIONS
+    assert data["total_questions"] == WRITERS * SESSIONS * 5
+    assert data["correct_answers"] == WRITERS * sum(i % 5 for i in range(SESSIONS))
+    assert all(data["category_stats"][f"writer-{w}"]["total"] == SESSIONS * 5 for w in range(WRITERS))
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permission bits")
+def test_atomic_write_keeps_file_mode(tmp_path):
+    path = tmp_path / "study_stats.json"
+    path.write_bytes(b"{}")
+    os.chmod(path, 0o644)
+    atomic_write_bytes(path, b"{}")
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+    umask = os.umask(0o022)
+    try:
+        fresh = tmp_path / "fresh.json"
+        atomic_write_bytes(fresh, b"{}")
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(fresh.stat().st_mode) == 0o644
+
+
+def test_crash_before_the_journal_is_removed_does_not_replay_it(tmp_path):
+    path = tmp_path / "study_stats.json"
+    journal = tmp_path / "study_stats.journal"
+    for score in (1, 2, 3):
+        StudyStats(str(path)).add_session("Algorithms", score, 5)
+    left_behind = journal.read_bytes()
+
+    StudyStats(str(path)).save_stats()
+    # As if the process died between replacing the snapshot and unlinking the journal
+    journal.write_bytes(left_behind)
+
+    data = StudyStats(str(path)).data
+    assert (data["total_questions"], data["correct_answers"], data["session_count"]) == (15, 6, 3)
+    assert sum(row["sessions"] for row in StudyStats(str(path)).iter_sessions()) == 3
+
+    # Sessions appended to the leftover journal are still picked up, once
+    StudyStats(str(path)).add_session("Algorithms", 4, 5)
+    data = StudyStats(str(path)).data
+    assert (data["total_questions"], data["session_count"]) == (20, 4)
+    StudyStats(str(path)).save_stats()
+    assert not journal.exists()
+    assert StudyStats(str(path)).data["total_questions"] == 20
@@ -0,0 +1,72 @@
+import shutil
+
+from quiz_app import StatsSync, StudyStats
+
+
+def counters(path):
+    data = StudyStats(str(path)).data
+    return (data["total_questions"], data["correct_answers"], data["category_stats"], data["session_count"],
+            data["rollups"]["weekly"])
+
+
+def device(tmp_path, name):
+    (tmp_path / name).mkdir()
+    return tmp_path / name / "study_stats.json"
+
+
+def test_devices_converge_whatever_order_they_sync_in(tmp_path):
+    share = tmp_path / "share"
+    paths = [device(tmp_path, name) for name in ("laptop", "lab", "phone")]
+    for n, path in enumerate(paths):
+        StudyStats(str(path)).add_session("Algorithms", n, 5)
+        StatsSync(StudyStats(str(path))).enroll(str(share), path.parent.name)
+
+    for n, path in enumerate(paths):
+        StudyStats(str(path)).add_session(f"Category {n}", 2, 4)
+        StatsSync(StudyStats(str(path))).sync()
+    for path in reversed(paths):
+        StatsSync(StudyStats(str(path))).sync()
+    # Syncing again with nothing new changes nothing
+    for path in paths:
+        StatsSync(StudyStats(str(path))).sync()
+
+    assert counters(paths[0]) == counters(paths[1]) == counters(paths[2])
+    total, correct, categories, sessions, _ = counters(paths[0])
+    assert (total, correct, sessions) == (27, 9, 6)
+    assert categories["Algorithms"] == {"correct": 3, "total": 15}
+
+
+def test_archived_days_and_legacy_history_travel_once(legacy_stats, tmp_path):
+    share = tmp_path / "share"
+    StudyStats(str(legacy_stats)).compact(retention_days=30)
+    StudyStats(str(legacy_stats)).add_session("Algorithms", 1, 5)
+    other = device(tmp_path, "lab")
+
+    StatsSync(StudyStats(str(legacy_stats))).enroll(str(share), "laptop")
+    StatsSync(StudyStats(str(other))).enroll(str(share), "lab")
+    for _ in range(2):
+        for path in (legacy_stats, other):
+            StatsSync(StudyStats(str(path))).sync()
+
+    assert counters(other) == counters(legacy_stats)
+    assert counters(other)[:2] == (20, 8)
+
+
+def test_pull_waits_for_a_delta_that_has_not_arrived(tmp_path):
+    share = tmp_path / "share"
+    laptop, lab = device(tmp_path, "laptop"), device(tmp_path, "lab")
+    StatsSync(StudyStats(str(laptop))).enroll(str(share), "laptop")
+    StatsSync(StudyStats(str(lab))).enroll(str(share), "lab")
+    for score in (1, 2):
+        StudyStats(str(laptop)).add_session("Algorithms", score, 5)
+        StatsSync(StudyStats(str(laptop))).push()
+
+    first, second = sorted((share / "laptop").iterdir())
+    held = tmp_path / second.name
+    shutil.move(str(first), str(held))
+    assert StatsSync(StudyStats(str(lab))).pull() == {}
+    assert StudyStats(str(lab)).data["session_count"] == 0
+
+    shutil.move(str(held), str(first))
+    assert StatsSync(StudyStats(str(lab))).pull() == {"laptop": 2}
+    assert counters(lab) == counters(laptop)